@@ -0,0 +1 @@
+"""Performance benchmarks for The Gym Group integration."""
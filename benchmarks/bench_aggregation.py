@@ -0,0 +1,150 @@
+"""Compare the single-pass check-in aggregation with the old multi-pass code.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_aggregation [YEARS ...]
+
+For each history length this prints the best wall time over several runs,
+the peak memory allocated while aggregating, and the bytes the archive
+keeps per visit as loaded JSON dicts versus as columns (via ``tracemalloc``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from custom_components.the_gym_group.aggregation import (
+    CheckinColumns,
+    aggregate_checkins,
+)
+
+from .synthetic import generate_checkins
+
+_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+_RUNS = 7
+
+
+def _legacy_parse_checkin_dt(raw: dict[str, Any] | None) -> datetime | None:
+    """Parse a check-in date the way the coordinator used to."""
+    if not raw:
+        return None
+    date_str: str = raw.get("checkInDate", "")
+    tz_name: str = raw.get("timezone", "UTC")
+    if not date_str:
+        return None
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, KeyError):
+        tz = timezone.utc
+    try:
+        return datetime.fromisoformat(date_str).replace(tzinfo=tz)
+    except ValueError:
+        return None
+
+
+def legacy_aggregate(check_ins: list[dict[str, Any]], now: datetime) -> dict[str, Any]:
+    """Reference copy of the multi-pass aggregation this module replaced."""
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    latest_raw = (
+        max(check_ins, key=lambda ci: ci.get("checkInDate", "")) if check_ins else None
+    )
+    month_start_str = month_start.strftime(_DATE_FORMAT)
+    monthly = [ci for ci in check_ins if ci.get("checkInDate", "") >= month_start_str]
+    total_ms = sum(ci.get("duration", 0) for ci in monthly)
+    recent_cutoff = (now - timedelta(days=35)).strftime(_DATE_FORMAT)
+    recent_checkins = [
+        {
+            "datetime": ci["checkInDate"],
+            "duration_minutes": (
+                round(ci["duration"] / 60_000) if ci.get("duration") else None
+            ),
+        }
+        for ci in check_ins
+        if ci.get("checkInDate", "") >= recent_cutoff
+    ]
+    calendar_checkins: list[dict[str, Any]] = []
+    for ci in check_ins:
+        start_dt = _legacy_parse_checkin_dt(ci)
+        if start_dt is None:
+            continue
+        dur_ms: int = ci.get("duration", 0)
+        calendar_checkins.append(
+            {
+                "start": start_dt,
+                "end": start_dt + timedelta(milliseconds=dur_ms) if dur_ms else None,
+                "gym_name": ci.get("gymLocationName") or "The Gym Group",
+            }
+        )
+    return {
+        "latest_checkin": _legacy_parse_checkin_dt(latest_raw),
+        "checkin_history": recent_checkins,
+        "calendar_checkins": calendar_checkins,
+        "monthly_visits": len(monthly),
+        "monthly_hours": round(total_ms / 3_600_000, 1),
+    }
+
+
+def measure(
+    func: Callable[[Any, datetime], Any],
+    check_ins: Any,
+    now: datetime,
+) -> tuple[float, int]:
+    """Return (best wall time in ms, peak traced allocation in bytes)."""
+    best = float("inf")
+    for _ in range(_RUNS):
+        started = time.perf_counter()
+        func(check_ins, now)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = func(check_ins, now)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best * 1000, peak
+
+
+def retained(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Return what ``build`` returns and the bytes still allocated for it."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main(argv: list[str]) -> None:
+    """Run the comparison for each requested history length in years."""
+    now = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+    print(
+        f"{'years':>5} {'visits':>7} {'legacy ms':>10} {'new ms':>8} "
+        f"{'legacy KiB':>11} {'new KiB':>8} {'dict B/visit':>13} "
+        f"{'column B/visit':>15}"
+    )
+    for years in [float(arg) for arg in argv] or [1.0, 3.0, 5.0, 10.0]:
+        stored = json.dumps(
+            generate_checkins(years, end=now.replace(tzinfo=None))
+        )
+        check_ins, dict_bytes = retained(lambda: json.loads(stored))
+        checkins, column_bytes = retained(
+            lambda: CheckinColumns.from_check_ins(check_ins)
+        )
+        legacy_ms, legacy_peak = measure(legacy_aggregate, check_ins, now)
+        new_ms, new_peak = measure(aggregate_checkins, checkins, now)
+        visits = len(check_ins)
+        print(
+            f"{years:>5g} {visits:>7} {legacy_ms:>10.2f} {new_ms:>8.2f} "
+            f"{legacy_peak / 1024:>11.1f} {new_peak / 1024:>8.1f} "
+            f"{dict_bytes / visits:>13.0f} {column_bytes / visits:>15.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,249 @@
+"""A local stand-in for the Netpulse API, with latency and fault injection.
+
+The server implements the four endpoints the integration uses (login,
+busyness, check-in history and schedule) on aiohttp's test server, with
+cookie sessions and gzip responses like the real API. Payload sizes,
+latency, session expiry, 5xx bursts and hanging requests are configurable,
+so the real ``TheGymGroupApiClient`` can be exercised end to end::
+
+    async with FakeNetpulse(FakeNetpulseConfig(years=5)) as server:
+        client = server.create_client(session, "someone@example.com")
+        await client.async_get_busyness()
+
+See ``benchmarks/load_netpulse.py`` for a load-test harness built on it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+import random
+import secrets
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.the_gym_group.api import TheGymGroupApiClient
+from custom_components.the_gym_group.const import (
+    BUSYNESS_PATH_TEMPLATE,
+    CHECKIN_HISTORY_PATH_TEMPLATE,
+    LOGIN_PATH,
+    SCHEDULE_PATH_TEMPLATE,
+)
+
+from .synthetic import generate_busyness, generate_checkins, generate_schedule
+
+SESSION_COOKIE = "JSESSIONID"
+
+_Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+@dataclass
+class FakeNetpulseConfig:
+    """Payload sizes and faults for a ``FakeNetpulse`` server."""
+
+    # Check-in history served to every account, and booked classes.
+    years: float = 3.0
+    visits_per_week: int = 4
+    classes: int = 20
+    # Accounts are spread over this many gyms.
+    gyms: int = 10
+    # Seconds added to every response, plus up to ``latency_jitter`` more.
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Authenticated requests a session serves before it expires with a 401.
+    session_ttl: int | None = None
+    # Chance that a request starts a burst of ``error_burst`` 503 responses.
+    error_rate: float = 0.0
+    error_burst: int = 3
+    # Chance that a request hangs for ``hang`` seconds before responding.
+    timeout_rate: float = 0.0
+    hang: float = 35.0
+    # If set, logins with any other password are rejected with a 401.
+    password: str | None = None
+    # "Now" for the generated payloads, and the random seed.
+    now: datetime = datetime(2026, 10, 1, 12, 0)
+    seed: int = 0
+
+
+class FakeNetpulse:
+    """A local Netpulse stand-in; use as an async context manager."""
+
+    def __init__(self, config: FakeNetpulseConfig | None = None) -> None:
+        """Generate the payloads the server will serve."""
+        self.config = config = config or FakeNetpulseConfig()
+        self._rng = random.Random(config.seed)
+        self._check_ins = generate_checkins(
+            config.years,
+            visits_per_week=config.visits_per_week,
+            end=config.now,
+            seed=config.seed,
+        )
+        self._check_in_dates = [ci["checkInDate"] for ci in self._check_ins]
+        self._schedule = generate_schedule(
+            config.classes, start=config.now, seed=config.seed
+        )
+        self._busyness: dict[str, dict[str, Any]] = {}
+        # Session ID -> (user ID, authenticated requests left).
+        self._sessions: dict[str, tuple[str, int | None]] = {}
+        self._errors_left = 0
+        self._server: TestServer | None = None
+        # Requests per endpoint, responses per status, and faults injected.
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self.faults: Counter[str] = Counter()
+
+    async def __aenter__(self) -> FakeNetpulse:
+        """Start the server on a free local port."""
+        app = web.Application(middlewares=[self._faults_middleware])
+        app.router.add_post(LOGIN_PATH, self._login)
+        app.router.add_get(BUSYNESS_PATH_TEMPLATE, self._get_busyness)
+        app.router.add_get(CHECKIN_HISTORY_PATH_TEMPLATE, self._get_history)
+        app.router.add_get(SCHEDULE_PATH_TEMPLATE, self._get_schedule)
+        self._server = TestServer(app, host="127.0.0.1")
+        await self._server.start_server()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            await self._server.close()
+
+    @property
+    def host(self) -> str:
+        """Return the ``host:port`` the server listens on."""
+        assert self._server is not None
+        return f"{self._server.host}:{self._server.port}"
+
+    def create_client(
+        self,
+        session: aiohttp.ClientSession,
+        username: str,
+        password: str = "password",
+        **kwargs: Any,
+    ) -> TheGymGroupApiClient:
+        """Return an API client pointed at this server.
+
+        The session's cookie jar must accept cookies from IP addresses, i.e.
+        be created with ``aiohttp.CookieJar(unsafe=True)``.
+        """
+        return TheGymGroupApiClient(
+            username, password, session, host=self.host, scheme="http", **kwargs
+        )
+
+    def expire_sessions(self) -> None:
+        """Expire every session, as after a server-side logout."""
+        self._sessions.clear()
+
+    @property
+    def check_in_count(self) -> int:
+        """Return how many check-ins each account's full history holds."""
+        return len(self._check_ins)
+
+    @web.middleware
+    async def _faults_middleware(
+        self, request: web.Request, handler: _Handler
+    ) -> web.StreamResponse:
+        """Count the request and inject the configured latency and faults."""
+        config = self.config
+        resource = request.match_info.route.resource
+        self.requests[resource.canonical if resource else request.path] += 1
+        delay = config.latency + self._rng.uniform(0, config.latency_jitter)
+        if self._rng.random() < config.timeout_rate:
+            self.faults["timeout"] += 1
+            delay += config.hang
+        if delay:
+            await asyncio.sleep(delay)
+        if self._errors_left == 0 and self._rng.random() < config.error_rate:
+            self._errors_left = config.error_burst
+        if self._errors_left:
+            self._errors_left -= 1
+            self.faults["5xx"] += 1
+            response: web.StreamResponse = web.json_response(
+                {"error": "Service Unavailable"}, status=503
+            )
+        else:
+            response = await handler(request)
+        self.statuses[response.status] += 1
+        return response
+
+    def _json(self, payload: Any) -> web.Response:
+        """Return a JSON response, gzipped if the client accepts it."""
+        response = web.json_response(payload)
+        response.enable_compression()
+        return response
+
+    def _authenticate(self, request: web.Request) -> bool:
+        """Return True if the request's session is valid for its user."""
+        session_id = request.cookies.get(SESSION_COOKIE)
+        if session_id is None or (session := self._sessions.get(session_id)) is None:
+            return False
+        user_id, requests_left = session
+        if user_id != request.match_info["user_id"]:
+            return False
+        if requests_left is not None:
+            if requests_left <= 0:
+                del self._sessions[session_id]
+                self.faults["session_expired"] += 1
+                return False
+            self._sessions[session_id] = (user_id, requests_left - 1)
+        return True
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Start a session for any account (or only the configured password)."""
+        form = await request.post()
+        username = str(form.get("username", ""))
+        if not username or (
+            self.config.password is not None
+            and form.get("password") != self.config.password
+        ):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+        user_id = hashlib.sha1(username.casefold().encode()).hexdigest()[:24]
+        session_id = secrets.token_hex(16)
+        self._sessions[session_id] = (user_id, self.config.session_ttl)
+        response = self._json({"uuid": user_id, "username": username})
+        response.set_cookie(SESSION_COOKIE, session_id)
+        return response
+
+    async def _get_busyness(self, request: web.Request) -> web.Response:
+        """Return busyness for the account's gym."""
+        if not self._authenticate(request):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+        user_id = request.match_info["user_id"]
+        gym_id = f"gym-{int(user_id, 16) % self.config.gyms:03d}"
+        if (payload := self._busyness.get(gym_id)) is None:
+            payload = self._busyness[gym_id] = generate_busyness(
+                gym_id, now=self.config.now, seed=len(self._busyness)
+            )
+        return self._json(payload)
+
+    async def _get_history(self, request: web.Request) -> web.Response:
+        """Return the check-ins between ``startDate`` and ``endDate``."""
+        if not self._authenticate(request):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+        start = request.query.get("startDate", "")
+        end = request.query.get("endDate", "￿")
+        lo = bisect_left(self._check_in_dates, start)
+        hi = bisect_right(self._check_in_dates, end)
+        return self._json({"checkIns": self._check_ins[lo:hi]})
+
+    async def _get_schedule(self, request: web.Request) -> web.Response:
+        """Return the booked classes between the requested epoch-ms times."""
+        if not self._authenticate(request):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+        start_ms = int(request.query.get("startDateTime", 0))
+        end_ms = int(request.query.get("endDateTime", 2**62))
+        return self._json(
+            [
+                item
+                for item in self._schedule
+                if start_ms <= item["brief"]["startDateTime"] < end_ms
+            ]
+        )
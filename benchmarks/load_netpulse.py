@@ -0,0 +1,169 @@
+"""Drive many API clients against the local Netpulse stand-in.
+
+Run from the repository root::
+
+    python -m benchmarks.load_netpulse [--clients 200] [--rounds 5] \
+        [--years 5] [--latency 0.05] [--session-ttl 20] [--error-rate 0.01]
+
+Each client logs in as its own account and, every round, fetches busyness,
+its check-in history and its schedule concurrently, the way the
+coordinators do. All clients share one circuit breaker (as clients of one
+host do in Home Assistant) and one set of request metrics. The report shows
+throughput, per-endpoint latency percentiles, the errors clients raised,
+re-logins, and what the server saw and injected.
+
+Hanging requests (``--timeout-rate``) are cut off by the client's own 30
+second timeout, so they make a run correspondingly slow.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+import sys
+import time
+
+import aiohttp
+
+from custom_components.the_gym_group.api import (
+    CannotConnect,
+    TheGymGroupApiClient,
+    TheGymGroupCircuitBreaker,
+)
+from custom_components.the_gym_group.aggregation import CHECKIN_DATE_FORMAT
+from custom_components.the_gym_group.metrics import (
+    ENDPOINTS,
+    TheGymGroupRequestMetrics,
+)
+
+from .fake_netpulse import FakeNetpulse, FakeNetpulseConfig
+
+
+async def _run_round(
+    client: TheGymGroupApiClient,
+    config: FakeNetpulseConfig,
+    errors: Counter[str],
+) -> None:
+    """Fetch everything one client's coordinators would, concurrently."""
+    history_start = config.now - timedelta(days=round(365 * config.years))
+    now_ms = int(config.now.timestamp() * 1000)
+    results = await asyncio.gather(
+        client.async_get_busyness(),
+        client.async_get_checkin_history(
+            history_start.strftime(CHECKIN_DATE_FORMAT),
+            config.now.strftime(CHECKIN_DATE_FORMAT),
+        ),
+        client.async_get_schedule(now_ms, now_ms + 14 * 86_400_000),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, CannotConnect):
+            errors[type(result).__name__] += 1
+        elif isinstance(result, BaseException):
+            raise result
+
+
+async def run(
+    config: FakeNetpulseConfig, clients: int, rounds: int, pause: float
+) -> None:
+    """Run the load test and print its report."""
+    metrics = TheGymGroupRequestMetrics()
+    breaker = TheGymGroupCircuitBreaker()
+    errors: Counter[str] = Counter()
+    async with FakeNetpulse(config) as server:
+        connector = aiohttp.TCPConnector(limit=100)
+        sessions = [
+            aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=False,
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                trace_configs=[metrics.trace_config],
+            )
+            for _ in range(clients)
+        ]
+        api_clients = [
+            server.create_client(
+                session,
+                f"member{index:05d}@example.com",
+                circuit_breaker=breaker,
+                metrics=metrics,
+            )
+            for index, session in enumerate(sessions)
+        ]
+        started = time.perf_counter()
+        try:
+            for round_index in range(rounds):
+                if round_index:
+                    await asyncio.sleep(pause)
+                await asyncio.gather(
+                    *(_run_round(client, config, errors) for client in api_clients)
+                )
+        finally:
+            elapsed = time.perf_counter() - started
+            for session in sessions:
+                await session.close()
+            await connector.close()
+
+    total = sum(server.requests.values())
+    print(
+        f"{clients} clients x {rounds} rounds, {server.check_in_count} check-ins "
+        f"per history: {total} requests in {elapsed:.2f}s "
+        f"({total / elapsed:.0f} req/s)"
+    )
+    print(
+        f"\n{'endpoint':<10} {'responses':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p95 KiB':>8} {'relogins':>8}  statuses"
+    )
+    summary = metrics.as_dict()["endpoints"]
+    for name in ENDPOINTS:
+        if (endpoint := summary.get(name)) is None:
+            continue
+        latency = endpoint["latency_ms"]
+        size = endpoint["response_bytes"]
+        p95_kib = "-" if size["p95"] is None else f"{size['p95'] / 1024:.1f}"
+        print(
+            f"{name:<10} {latency['count']:>9} {latency['p50'] or 0:>8.1f} "
+            f"{latency['p95'] or 0:>8.1f} {p95_kib:>8} {endpoint['relogins']:>8}"
+            f"  {endpoint['statuses']}"
+        )
+    print(f"\nclient errors: {dict(errors) or 'none'}")
+    print(f"circuit breaker: {breaker.as_dict()}")
+    print(f"server statuses: {dict(server.statuses)}")
+    print(f"server faults injected: {dict(server.faults) or 'none'}")
+
+
+def main(argv: list[str]) -> None:
+    """Parse the command line and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds")
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--session-ttl", type=int, default=None, help="requests")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-burst", type=int, default=3)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    config = FakeNetpulseConfig(
+        years=args.years,
+        classes=args.classes,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        session_ttl=args.session_ttl,
+        error_rate=args.error_rate,
+        error_burst=args.error_burst,
+        timeout_rate=args.timeout_rate,
+        now=datetime(2026, 10, 1, 12, 0),
+        seed=args.seed,
+    )
+    asyncio.run(run(config, args.clients, args.rounds, args.pause))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,347 @@
+"""Benchmarks for the integration's hot paths, with budgets and a baseline.
+
+Run from the repository root::
+
+    python -m benchmarks.suite                  # check budgets, compare to baseline
+    python -m benchmarks.suite --save-baseline  # record a new baseline
+    python -m benchmarks.suite --years 10 --classes 500
+
+Each benchmark reports the best wall time over several runs and the peak
+memory allocated by one run (via ``tracemalloc``). The command exits with
+status 1 if any benchmark exceeds its time or memory budget. Budgets are
+set for the default data sizes (5 years of check-ins, 200 booked classes)
+with plenty of headroom, so they catch regressions of an order of
+magnitude rather than noise. Timings from ``benchmarks/baseline.json`` are
+shown alongside, to compare before and after a change on one machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import json
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any
+
+from custom_components.the_gym_group.aggregation import (
+    CheckinColumns,
+    parse_checkin_dt,
+)
+from custom_components.the_gym_group.calendar import TheGymGroupCalendarEntity
+from custom_components.the_gym_group.coordinator import (
+    TheGymGroupHistoryCoordinator,
+    _build_schedule_data,
+    _find_next_class,
+)
+from custom_components.the_gym_group.metrics import (
+    ENDPOINTS,
+    TheGymGroupRequestMetrics,
+)
+from custom_components.the_gym_group.profile import TheGymGroupOccupancyProfile
+from custom_components.the_gym_group.sensor import (
+    TheGymGroupApiLatencySensor,
+    TheGymGroupBusynessForecastSensor,
+    TheGymGroupBusynessSensor,
+    TheGymGroupLastCheckinSensor,
+    TheGymGroupMonthlyTimeSensor,
+    TheGymGroupMonthlyVisitsSensor,
+    TheGymGroupNextClassSensor,
+    TheGymGroupQuietestTimeSensor,
+    TheGymGroupStatusSensor,
+)
+
+from .synthetic import generate_busyness, generate_checkins, generate_schedule
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+NOW = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+_RUNS = 7
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A prepared benchmark: the work to time and its budgets."""
+
+    name: str
+    func: Callable[[], Any]
+    budget_ms: float
+    budget_kib: float
+
+
+@dataclass(frozen=True)
+class Result:
+    """How one benchmark did."""
+
+    name: str
+    ms: float
+    kib: float
+    budget_ms: float
+    budget_kib: float
+
+    @property
+    def over_budget(self) -> bool:
+        """Return True if the benchmark exceeded either budget."""
+        return self.ms > self.budget_ms or self.kib > self.budget_kib
+
+
+def measure(func: Callable[[], Any], runs: int = _RUNS) -> tuple[float, float]:
+    """Return (best wall time in ms, peak traced allocation in KiB)."""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best * 1000, peak / 1024
+
+
+def _occupancy_profile(busyness: dict[str, Any]) -> TheGymGroupOccupancyProfile:
+    """Return an occupancy profile holding four weeks of 15-minute samples.
+
+    The profile's store is only used to persist it, so it is skipped.
+    """
+    profile = TheGymGroupOccupancyProfile.__new__(TheGymGroupOccupancyProfile)
+    profile.gym_id = busyness["gymLocationId"]
+    profile._reset()  # noqa: SLF001
+    for slot in range(4 * 7 * 96):
+        when = NOW - timedelta(minutes=15 * slot)
+        profile.add(when, (slot * 37) % 120)
+    return profile
+
+
+def _run_to_completion[_T](coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run a coroutine that never suspends, without an event loop's overhead."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Benchmarked coroutine suspended")
+
+
+def _month_windows(months: int) -> list[tuple[datetime, datetime]]:
+    """Return month-long [start, end) windows going back from ``NOW``."""
+    windows = []
+    end = NOW.replace(day=1, hour=0, minute=0) + timedelta(days=32)
+    end = end.replace(day=1)
+    for _ in range(months):
+        start = (end - timedelta(days=1)).replace(day=1)
+        windows.append((start, end))
+        end = start
+    return windows
+
+
+def build_benchmarks(years: float, classes: int) -> list[Benchmark]:
+    """Generate the data and prepare every benchmark for it."""
+    naive_now = NOW.replace(tzinfo=None)
+    check_ins = generate_checkins(years, end=naive_now)
+    schedule = generate_schedule(classes, start=naive_now)
+    busyness = generate_busyness("gym-001", now=naive_now)
+
+    history = SimpleNamespace(
+        archive=SimpleNamespace(checkins=CheckinColumns.from_check_ins(check_ins))
+    )
+
+    def _build_activity_data() -> tuple[dict[str, Any], dict[str, Any]]:
+        history_data = TheGymGroupHistoryCoordinator._build_data(  # noqa: SLF001
+            history,  # type: ignore[arg-type]
+            NOW,
+        )
+        return history_data, _build_schedule_data(schedule)
+
+    history_data, schedule_data = _build_activity_data()
+    metrics = TheGymGroupRequestMetrics()
+    for index in range(1000):
+        for endpoint in ENDPOINTS:
+            metrics.record_response(endpoint, 200, (index % 97) / 100, 4096)
+    busyness_coordinator = SimpleNamespace(
+        data=busyness,
+        profile=_occupancy_profile(busyness),
+        api_client=SimpleNamespace(metrics=metrics),
+        stale_since=None,
+    )
+    history_coordinator = SimpleNamespace(data=history_data, stale_since=None)
+    schedule_coordinator = SimpleNamespace(data=schedule_data, stale_since=None)
+    entry: Any = SimpleNamespace(entry_id="benchmark")
+
+    def _sensor(cls: type, coordinator: Any, *args: Any) -> Any:
+        return cls(coordinator, entry, "gym-001", "Benchmark Gym", *args)
+
+    sensors = [
+        _sensor(TheGymGroupBusynessSensor, busyness_coordinator),
+        _sensor(TheGymGroupStatusSensor, busyness_coordinator),
+        _sensor(TheGymGroupBusynessForecastSensor, busyness_coordinator),
+        _sensor(TheGymGroupQuietestTimeSensor, busyness_coordinator),
+        _sensor(TheGymGroupLastCheckinSensor, history_coordinator),
+        _sensor(TheGymGroupMonthlyVisitsSensor, history_coordinator),
+        _sensor(TheGymGroupMonthlyTimeSensor, history_coordinator),
+        _sensor(TheGymGroupNextClassSensor, schedule_coordinator),
+        *(
+            _sensor(TheGymGroupApiLatencySensor, busyness_coordinator, endpoint, q)
+            for endpoint in ENDPOINTS
+            for q in (0.5, 0.95)
+        ),
+    ]
+
+    calendar = TheGymGroupCalendarEntity(
+        history_coordinator,  # type: ignore[arg-type]
+        schedule_coordinator,  # type: ignore[arg-type]
+        entry,
+        "gym-001",
+        "Benchmark Gym",
+    )
+    windows = _month_windows(max(1, round(years * 12)))
+
+    def _calendar_months() -> list[Any]:
+        return [
+            _run_to_completion(calendar.async_get_events(None, start, end))
+            for start, end in windows
+        ]
+
+    def _sensor_attributes() -> list[Any]:
+        # Drop the per-update caches so the attributes are computed afresh.
+        for sensor in sensors:
+            sensor._attributes_cache = None  # noqa: SLF001
+        return [sensor.extra_state_attributes for sensor in sensors]
+
+    def _calendar_rebuild() -> Any:
+        # New data objects make the calendar rebuild its event indexes.
+        history_coordinator.data = dict(history_data)
+        schedule_coordinator.data = dict(schedule_data)
+        return calendar.event
+
+    benchmarks = [
+        Benchmark(
+            "activity_aggregation",
+            _build_activity_data,
+            budget_ms=20,
+            budget_kib=1024,
+        ),
+        Benchmark(
+            "find_next_class",
+            lambda: _find_next_class(schedule),
+            budget_ms=5,
+            budget_kib=256,
+        ),
+        Benchmark(
+            "parse_checkin_dt",
+            lambda: [parse_checkin_dt(ci) for ci in check_ins],
+            budget_ms=10,
+            budget_kib=512,
+        ),
+        Benchmark(
+            "archive_load_columns",
+            lambda: CheckinColumns.from_check_ins(check_ins),
+            budget_ms=15,
+            budget_kib=128,
+        ),
+        Benchmark(
+            "calendar_index_rebuild",
+            _calendar_rebuild,
+            budget_ms=250,
+            budget_kib=2048,
+        ),
+        Benchmark(
+            "calendar_month_queries",
+            _calendar_months,
+            budget_ms=15,
+            budget_kib=128,
+        ),
+        Benchmark(
+            "sensor_attributes",
+            _sensor_attributes,
+            budget_ms=5,
+            budget_kib=64,
+        ),
+    ]
+    # Build the calendar's index before its queries are timed.
+    _calendar_months()
+    return benchmarks
+
+
+def run_suite(
+    years: float = 5.0, classes: int = 200, runs: int = _RUNS
+) -> list[Result]:
+    """Run every benchmark and return the results."""
+    results = []
+    for benchmark in build_benchmarks(years, classes):
+        ms, kib = measure(benchmark.func, runs)
+        results.append(
+            Result(benchmark.name, ms, kib, benchmark.budget_ms, benchmark.budget_kib)
+        )
+    return results
+
+
+def _format_change(value: float, baseline: float | None) -> str:
+    """Return the change from the baseline as a percentage."""
+    if not baseline:
+        return "-"
+    return f"{(value - baseline) / baseline:+.0%}"
+
+
+def main(argv: list[str]) -> int:
+    """Run the suite, report against budgets and the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=float, default=5.0)
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=_RUNS)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.years, args.classes, args.runs)
+    scale = {"years": args.years, "classes": args.classes}
+    baseline: dict[str, Any] = {}
+    if args.baseline.is_file():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("scale") != scale:
+            print(f"Baseline was recorded at {baseline.get('scale')}; not comparing")
+            baseline = {}
+
+    print(
+        f"{'benchmark':<24} {'ms':>8} {'budget':>7} {'vs base':>8} "
+        f"{'KiB':>8} {'budget':>7} {'vs base':>8}"
+    )
+    for result in results:
+        base = baseline.get("results", {}).get(result.name, {})
+        flag = "  OVER BUDGET" if result.over_budget else ""
+        print(
+            f"{result.name:<24} {result.ms:>8.2f} {result.budget_ms:>7g} "
+            f"{_format_change(result.ms, base.get('ms')):>8} "
+            f"{result.kib:>8.1f} {result.budget_kib:>7g} "
+            f"{_format_change(result.kib, base.get('kib')):>8}{flag}"
+        )
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "scale": scale,
+                    "results": {
+                        result.name: {
+                            "ms": round(result.ms, 3),
+                            "kib": round(result.kib, 1),
+                        }
+                        for result in results
+                    },
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Baseline written to {args.baseline}")
+    return 1 if any(result.over_budget for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,105 @@
+"""Synthetic Netpulse payloads for benchmarks."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import random
+from typing import Any
+
+GYM_NAMES = ("London Waterloo", "Manchester Piccadilly", "Bury St Edmunds")
+
+
+def generate_checkins(
+    years: float,
+    *,
+    visits_per_week: int = 4,
+    end: datetime | None = None,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Return raw check-in records covering ``years`` up to ``end``, oldest first.
+
+    The records mirror the check-in history endpoint: a naive local
+    ``checkInDate`` with a separate ``timezone`` name, a duration in
+    milliseconds (missing for the newest visit, as for one in progress) and
+    the gym's name.
+    """
+    rng = random.Random(seed)
+    end = end or datetime(2026, 10, 1, 12, 0)
+    day = end - timedelta(days=round(365 * years))
+    check_ins: list[dict[str, Any]] = []
+    while day < end:
+        if rng.random() < visits_per_week / 7:
+            start = day.replace(hour=rng.randint(6, 21), minute=rng.randint(0, 59))
+            check_ins.append(
+                {
+                    "checkInDate": start.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "timezone": "Europe/London",
+                    "gymLocationName": rng.choice(GYM_NAMES),
+                    "duration": rng.randint(30, 120) * 60_000,
+                }
+            )
+        day += timedelta(days=1)
+    if check_ins:
+        del check_ins[-1]["duration"]
+    return check_ins
+
+
+CLASS_NAMES = ("SGT-Functional Conditioning", "Spin", "Yoga", "Boxfit", "HIIT")
+
+
+def generate_schedule(
+    classes: int, *, start: datetime | None = None, seed: int = 0
+) -> list[dict[str, Any]]:
+    """Return ``classes`` booked classes, one every few hours from ``start``.
+
+    The records mirror the schedule endpoint: epoch-millisecond start and end
+    times inside a ``brief`` object.
+    """
+    rng = random.Random(seed)
+    start = start or datetime(2026, 10, 1, 12, 0)
+    start_ms = int(start.timestamp() * 1000)
+    schedule: list[dict[str, Any]] = []
+    for index in range(classes):
+        begins = start_ms + index * rng.randint(2, 8) * 3_600_000
+        max_capacity = rng.choice((12, 16, 20, 30))
+        schedule.append(
+            {
+                "brief": {
+                    "id": f"class-{index:05d}",
+                    "name": rng.choice(CLASS_NAMES),
+                    "startDateTime": begins,
+                    "endDateTime": begins + rng.choice((30, 45, 60)) * 60_000,
+                    "instructor": {"fullName": f"Instructor {rng.randint(1, 40)}"},
+                    "maxCapacity": max_capacity,
+                    "totalBooked": rng.randint(0, max_capacity),
+                    "cancelled": rng.random() < 0.05,
+                    "booked": True,
+                },
+                "attendeeDetails": {"booked": True},
+            }
+        )
+    return schedule
+
+
+def generate_busyness(
+    gym_id: str, *, now: datetime | None = None, seed: int = 0
+) -> dict[str, Any]:
+    """Return a busyness payload with a day of 15-minute historical samples."""
+    rng = random.Random(seed)
+    now = now or datetime(2026, 10, 1, 12, 0)
+    now_ms = int(now.timestamp() * 1000)
+    capacity = rng.randint(5, 120)
+    return {
+        "gymLocationId": gym_id,
+        "gymLocationName": rng.choice(GYM_NAMES),
+        "currentCapacity": capacity,
+        "currentPercentage": round(capacity / 2),
+        "historical": [
+            {
+                "timestamp": now_ms - slot * 900_000,
+                "currentCapacity": rng.randint(0, 150),
+            }
+            for slot in range(96, 0, -1)
+        ],
+        "status": "open",
+    }
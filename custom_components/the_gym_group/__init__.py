@@ -2,17 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+from functools import partial
 import logging
+from typing import Any
+
+import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.hass_dict import HassKey
 
 _LOGGER = logging.getLogger(__name__)
 
-from .api import TheGymGroupApiClient
+from .api import (
+    TheGymGroupApiClient,
+    TheGymGroupCircuitBreaker,
+    TheGymGroupLoginGate,
+)
+from .archive import TheGymGroupCheckinArchive
 from .const import (
     CONF_APPLICATION_NAME,
     CONF_APPLICATION_VERSION,
@@ -26,8 +40,25 @@ from .const import (
     DEFAULT_USER_AGENT,
     DOMAIN,
     PLATFORMS,
+    SESSION_SAVE_DELAY,
+    SESSION_STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .coordinator import (
+    TheGymGroupClassWatchCoordinator,
+    TheGymGroupDataUpdateCoordinator,
+    TheGymGroupHistoryCoordinator,
+    TheGymGroupScheduleCoordinator,
 )
-from .coordinator import TheGymGroupActivityCoordinator, TheGymGroupDataUpdateCoordinator
+from .fleet import async_get_fleet_scheduler
+from .metrics import TheGymGroupRequestMetrics
+from .profile import TheGymGroupOccupancyProfile
+from .profiling import async_remove_profiler
+from .services import async_setup_services
+from .snapshot import TheGymGroupSnapshot
+from .timeseries import TheGymGroupBusynessSeries
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 @dataclass
@@ -35,11 +66,68 @@ class TheGymGroupRuntimeData:
     """Data stored on the config entry at runtime."""
 
     busyness: TheGymGroupDataUpdateCoordinator
-    activity: TheGymGroupActivityCoordinator
+    history: TheGymGroupHistoryCoordinator
+    schedule: TheGymGroupScheduleCoordinator
+    class_watch: TheGymGroupClassWatchCoordinator
 
 
 type TheGymGroupConfigEntry = ConfigEntry[TheGymGroupRuntimeData]
 
+# Login gates shared by every entry (and coordinator) using the same account,
+# keyed by (host, lower-cased username). They outlive entry reloads so that a
+# reload triggered mid-login still joins the in-flight attempt.
+DATA_LOGIN_GATES: HassKey[dict[tuple[str, str], TheGymGroupLoginGate]] = HassKey(
+    f"{DOMAIN}_login_gates"
+)
+
+
+def _async_get_login_gate(
+    hass: HomeAssistant, host: str, username: str
+) -> TheGymGroupLoginGate:
+    """Return the login gate shared by all clients of an account."""
+    gates = hass.data.setdefault(DATA_LOGIN_GATES, {})
+    key = (host, username.casefold())
+    if (gate := gates.get(key)) is None:
+        gate = gates[key] = TheGymGroupLoginGate()
+    return gate
+
+
+# Circuit breakers shared by every client of a host, so that an outage pauses
+# requests from all entries rather than each one discovering it separately.
+DATA_CIRCUIT_BREAKERS: HassKey[dict[str, TheGymGroupCircuitBreaker]] = HassKey(
+    f"{DOMAIN}_circuit_breakers"
+)
+
+
+def _async_get_circuit_breaker(
+    hass: HomeAssistant, host: str
+) -> TheGymGroupCircuitBreaker:
+    """Return the circuit breaker shared by all clients of a host."""
+    breakers = hass.data.setdefault(DATA_CIRCUIT_BREAKERS, {})
+    if (breaker := breakers.get(host)) is None:
+        breaker = breakers[host] = TheGymGroupCircuitBreaker()
+    return breaker
+
+
+def _session_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding an entry's API session.
+
+    The session cookies grant access to the account, so the file is written
+    with owner-only permissions.
+    """
+    return Store(
+        hass,
+        STORAGE_VERSION,
+        SESSION_STORAGE_KEY.format(entry_id=entry_id),
+        private=True,
+    )
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration's services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate config entries to the current schema version.
@@ -76,7 +164,20 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
 async def async_setup_entry(hass: HomeAssistant, entry: TheGymGroupConfigEntry) -> bool:
     """Set up The Gym Group from a config entry."""
-    session = async_get_clientsession(hass)
+    # Each entry gets its own cookie jar so that accounts never overwrite each
+    # other's Netpulse session and the jar can be persisted across restarts.
+    # The session is closed automatically when the entry unloads. Its trace
+    # hooks time the DNS and connection phases of each request.
+    metrics = TheGymGroupRequestMetrics()
+    session = async_create_clientsession(
+        hass, cookie_jar=aiohttp.CookieJar(), trace_configs=[metrics.trace_config]
+    )
+    host = entry.data.get(CONF_HOST, DEFAULT_HOST)
+    session_store = _session_store(hass, entry.entry_id)
+
+    @callback
+    def _async_save_session() -> None:
+        session_store.async_delay_save(api_client.export_session, SESSION_SAVE_DELAY)
 
     # Pull the configurable transport / app-identity values from the entry,
     # falling back to defaults so entries created before these fields existed
@@ -86,7 +187,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: TheGymGroupConfigEntry)
         entry.data[CONF_PASSWORD],
         session,
         user_id=entry.unique_id or "",
-        host=entry.data.get(CONF_HOST, DEFAULT_HOST),
+        host=host,
         user_agent=entry.data.get(CONF_USER_AGENT, DEFAULT_USER_AGENT),
         application_name=entry.data.get(
             CONF_APPLICATION_NAME, DEFAULT_APPLICATION_NAME
@@ -97,20 +198,85 @@ async def async_setup_entry(hass: HomeAssistant, entry: TheGymGroupConfigEntry)
         application_version_code=entry.data.get(
             CONF_APPLICATION_VERSION_CODE, DEFAULT_APPLICATION_VERSION_CODE
         ),
+        login_gate=_async_get_login_gate(hass, host, entry.data[CONF_USERNAME]),
+        on_session_update=_async_save_session,
+        # Requests from every entry share the fleet's per-host slots and rate
+        # limit, so a restart with many accounts doesn't burst the API.
+        request_slot=partial(async_get_fleet_scheduler(hass).async_request_slot, host),
+        circuit_breaker=_async_get_circuit_breaker(hass, host),
+        metrics=metrics,
     )
+    if stored_session := await session_store.async_load():
+        api_client.restore_session(stored_session)
 
     coordinator = TheGymGroupDataUpdateCoordinator(
         hass, config_entry=entry, api_client=api_client
     )
-    await coordinator.async_config_entry_first_refresh()
-
-    activity_coordinator = TheGymGroupActivityCoordinator(
+    history_coordinator = TheGymGroupHistoryCoordinator(
+        hass, config_entry=entry, api_client=api_client
+    )
+    schedule_coordinator = TheGymGroupScheduleCoordinator(
         hass, config_entry=entry, api_client=api_client
     )
-    await activity_coordinator.async_config_entry_first_refresh()
+
+    # Stale-while-revalidate: a coordinator with a recent snapshot on disk
+    # publishes it straight away and refreshes in the background, so setup
+    # doesn't wait on the API. Without one, setup blocks on a live refresh.
+    async def _async_start(
+        update_coordinator: (
+            TheGymGroupDataUpdateCoordinator
+            | TheGymGroupHistoryCoordinator
+            | TheGymGroupScheduleCoordinator
+        ),
+    ) -> None:
+        if await update_coordinator.async_restore_snapshot():
+            entry.async_create_background_task(
+                hass,
+                update_coordinator.async_refresh(),
+                f"{update_coordinator.name} refresh after restoring snapshot",
+            )
+        else:
+            await update_coordinator.async_config_entry_first_refresh()
+
+    # The coordinators' endpoints are independent, so they start concurrently.
+    # Every start finishes before a failure is raised, so that no first
+    # refresh outlives a failed setup.
+    results = await asyncio.gather(
+        *(
+            _async_start(update_coordinator)
+            for update_coordinator in (
+                coordinator,
+                history_coordinator,
+                schedule_coordinator,
+            )
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+    # The class watch only starts from the schedule coordinator's classes,
+    # so it never holds up setup.
+    class_watch = TheGymGroupClassWatchCoordinator(
+        hass, config_entry=entry, api_client=api_client, schedule=schedule_coordinator
+    )
+    entry.async_create_background_task(
+        hass, class_watch.async_refresh(), f"{class_watch.name} first refresh"
+    )
 
     entry.runtime_data = TheGymGroupRuntimeData(
-        busyness=coordinator, activity=activity_coordinator
+        busyness=coordinator,
+        history=history_coordinator,
+        schedule=schedule_coordinator,
+        class_watch=class_watch,
+    )
+    # Occupancy rising at the member's usual visit times makes the history
+    # coordinator watch for their check-in.
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            partial(history_coordinator.async_handle_busyness, coordinator)
+        )
     )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -128,3 +294,16 @@ async def update_listener(hass: HomeAssistant, entry: TheGymGroupConfigEntry) ->
 async def async_unload_entry(hass: HomeAssistant, entry: TheGymGroupConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the entry's stored session, history and snapshots."""
+    await _session_store(hass, entry.entry_id).async_remove()
+    await TheGymGroupCheckinArchive(hass, entry.entry_id).async_remove()
+    # "activity" is the snapshot of the coordinator the schedule and history
+    # coordinators replaced.
+    for name in ("busyness", "schedule", "activity"):
+        await TheGymGroupSnapshot(hass, entry.entry_id, name).async_remove()
+    await TheGymGroupBusynessSeries(hass, entry.entry_id).async_remove()
+    await TheGymGroupOccupancyProfile(hass, entry.entry_id).async_remove()
+    async_remove_profiler(hass, entry.entry_id)
@@ -0,0 +1,329 @@
+"""Single-pass aggregation of check-in history into the history payload."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+import logging
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Format of ``checkInDate`` values and of the date range sent to the API.
+# Values in this format sort lexicographically in chronological order.
+CHECKIN_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# Check-ins newer than this are exposed in the ``checkin_history`` attribute.
+RECENT_CHECKINS_WINDOW = timedelta(days=35)
+
+DEFAULT_GYM_NAME = "The Gym Group"
+
+
+@dataclass(slots=True)
+class CheckinRecord:
+    """A parsed check-in, as shown on the calendar.
+
+    The end time is derived on access rather than stored, which keeps each
+    record down to one ``datetime``.
+    """
+
+    start: datetime
+    duration_ms: int
+    gym_name: str
+
+    @property
+    def end(self) -> datetime | None:
+        """Return when the visit ended, or None if its duration is unknown."""
+        if not self.duration_ms:
+            return None
+        return self.start + timedelta(milliseconds=self.duration_ms)
+
+
+class CheckinColumns:
+    """Parsed check-ins stored as parallel arrays, oldest first.
+
+    Each visit costs a start time in epoch seconds, a duration in seconds
+    (0 if unknown) and indexes into the interned gym names and timezones,
+    instead of a record holding a ``datetime`` and a string. ``CheckinRecord``
+    objects are only built for the visits that are actually read.
+
+    Columns are not changed once published: the archive replaces them with
+    ``merged`` copies, so readers never see a half-applied sync.
+    """
+
+    __slots__ = (
+        "_gym_ids",
+        "_gym_names",
+        "_gyms",
+        "_zone_ids",
+        "_zones",
+        "durations",
+        "max_duration",
+        "starts",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty columns."""
+        self.starts = array("q")
+        self.durations = array("i")
+        self._gym_ids = array("H")
+        self._zone_ids = array("B")
+        self._gym_names: list[str] = []
+        self._gyms: dict[str, int] = {}
+        self._zones: list[tzinfo] = []
+        # Longest known duration, bounding how far back an overlap can start.
+        self.max_duration = 0
+
+    def __len__(self) -> int:
+        """Return the number of check-ins."""
+        return len(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if both hold the same check-ins."""
+        if not isinstance(other, CheckinColumns):
+            return NotImplemented
+        return (
+            self.starts == other.starts
+            and self.durations == other.durations
+            and self._gym_ids == other._gym_ids
+            and self._zone_ids == other._zone_ids
+            and self._gym_names == other._gym_names
+            and self._zones == other._zones
+        )
+
+    def __getitem__(self, index: int) -> CheckinRecord:
+        """Build the record for one check-in."""
+        return CheckinRecord(
+            self.start(index),
+            self.durations[index] * 1000,
+            self._gym_names[self._gym_ids[index]],
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the columns for diagnostics."""
+        return {
+            "count": len(self.starts),
+            "gyms": list(self._gym_names),
+            "timezones": [str(zone) for zone in self._zones],
+            "column_bytes": sum(
+                column.itemsize * len(column)
+                for column in (
+                    self.starts,
+                    self.durations,
+                    self._gym_ids,
+                    self._zone_ids,
+                )
+            ),
+        }
+
+    @classmethod
+    def from_check_ins(cls, check_ins: Iterable[dict[str, Any]]) -> CheckinColumns:
+        """Parse raw check-in records, skipping any without a valid date."""
+        checkins = cls()
+        add = checkins._add  # noqa: SLF001
+        fromisoformat = datetime.fromisoformat
+        for ci in check_ins:
+            # Same parsing as parse_checkin_dt, inlined for the hot loop.
+            date_str: str = ci.get("checkInDate") or ""
+            if not date_str:
+                continue
+            try:
+                naive = fromisoformat(date_str)
+            except ValueError:
+                _LOGGER.warning("Could not parse check-in date %r", date_str)
+                continue
+            zone = get_checkin_timezone(ci.get("timezone", "UTC"))
+            add(
+                int(naive.replace(tzinfo=zone).timestamp()),
+                (ci.get("duration") or 0) // 1000,
+                ci.get("gymLocationName") or DEFAULT_GYM_NAME,
+                zone,
+            )
+        checkins.sort()
+        return checkins
+
+    def start(self, index: int) -> datetime:
+        """Return when a check-in started, in its own timezone."""
+        return datetime.fromtimestamp(
+            self.starts[index], self._zones[self._zone_ids[index]]
+        )
+
+    def gym_name(self, index: int) -> str:
+        """Return the gym a check-in was at."""
+        return self._gym_names[self._gym_ids[index]]
+
+    def check_in_date(self, index: int) -> str:
+        """Return a check-in's ``checkInDate``: its local start time."""
+        return self.start(index).strftime(CHECKIN_DATE_FORMAT)
+
+    def find(self, start: datetime) -> int | None:
+        """Return the index of the check-in starting at ``start``, if any."""
+        start_ts = int(start.timestamp())
+        index = bisect_left(self.starts, start_ts)
+        if index < len(self.starts) and self.starts[index] == start_ts:
+            return index
+        return None
+
+    def raw(self, index: int) -> dict[str, Any]:
+        """Return a check-in as a raw record, in the API's format."""
+        record: dict[str, Any] = {
+            "checkInDate": self.check_in_date(index),
+            "timezone": str(self._zones[self._zone_ids[index]]),
+            "gymLocationName": self.gym_name(index),
+        }
+        if self.durations[index]:
+            record["duration"] = self.durations[index] * 1000
+        return record
+
+    def append(self, start: datetime, duration_ms: int, gym_name: str) -> None:
+        """Add a check-in; ``start`` must carry a timezone from the cache."""
+        self._add(
+            int(start.timestamp()),
+            duration_ms // 1000,
+            gym_name,
+            start.tzinfo,  # type: ignore[arg-type]
+        )
+
+    def _add(self, start_ts: int, duration: int, gym_name: str, zone: tzinfo) -> None:
+        """Add a check-in from its column values."""
+        if (gym_id := self._gyms.get(gym_name)) is None:
+            gym_id = self._gyms[gym_name] = len(self._gym_names)
+            self._gym_names.append(gym_name)
+        try:
+            zone_id = self._zones.index(zone)
+        except ValueError:
+            zone_id = len(self._zones)
+            self._zones.append(zone)
+        self.starts.append(start_ts)
+        self.durations.append(duration)
+        self._gym_ids.append(gym_id)
+        self._zone_ids.append(zone_id)
+        self.max_duration = max(self.max_duration, duration)
+
+    def merged(self, newer: CheckinColumns, keep_from: float) -> CheckinColumns:
+        """Return a copy updated with ``newer`` check-ins.
+
+        A check-in in ``newer`` replaces the one starting at the same time,
+        and check-ins starting before ``keep_from`` (epoch seconds) are
+        dropped.
+        """
+        replaced = set(newer.starts)
+        result = CheckinColumns()
+        for columns in (self, newer):
+            for index, start_ts in enumerate(columns.starts):
+                if start_ts < keep_from or (
+                    columns is self and start_ts in replaced
+                ):
+                    continue
+                result._add(  # noqa: SLF001
+                    start_ts,
+                    columns.durations[index],
+                    columns.gym_name(index),
+                    columns._zones[columns._zone_ids[index]],  # noqa: SLF001
+                )
+        result.sort()
+        return result
+
+    def sort(self) -> None:
+        """Put the check-ins in chronological order if they are not already.
+
+        Histories arrive sorted by local time, which only disagrees with the
+        epoch order around a timezone change.
+        """
+        starts = self.starts
+        if all(starts[i] <= starts[i + 1] for i in range(len(starts) - 1)):
+            return
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        for name in ("starts", "durations", "_gym_ids", "_zone_ids"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[i] for i in order]))
+
+    def span(self, start: datetime, end: datetime) -> tuple[int, int]:
+        """Return the index range of check-ins starting in [start, end)."""
+        return (
+            bisect_left(self.starts, start.timestamp()),
+            bisect_left(self.starts, end.timestamp()),
+        )
+
+    def history(self, first: int, last: int | None = None) -> list[dict[str, Any]]:
+        """Return check-ins from ``first`` up to ``last`` as history entries."""
+        return [
+            {
+                "datetime": self.start(index).strftime(CHECKIN_DATE_FORMAT),
+                "duration_minutes": (
+                    round(self.durations[index] / 60) if self.durations[index] else None
+                ),
+            }
+            for index in range(first, len(self.starts) if last is None else last)
+        ]
+
+
+@lru_cache(maxsize=32)
+def get_checkin_timezone(name: str) -> tzinfo:
+    """Return the tzinfo for a check-in's ``timezone`` field (UTC if unknown).
+
+    Every check-in carries its own timezone name, but in practice a history
+    only ever holds one or two distinct values, so the lookup is cached.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, KeyError, ValueError):
+        return timezone.utc
+
+
+def parse_checkin_dt(raw: dict[str, Any] | None) -> datetime | None:
+    """Convert a raw check-in object to a timezone-aware datetime, or None."""
+    if not raw:
+        return None
+    date_str: str = raw.get("checkInDate", "")
+    if not date_str:
+        return None
+    try:
+        naive = datetime.fromisoformat(date_str)
+    except ValueError:
+        _LOGGER.warning("Could not parse check-in date %r", date_str)
+        return None
+    return naive.replace(tzinfo=get_checkin_timezone(raw.get("timezone", "UTC")))
+
+
+def aggregate_checkins(checkins: CheckinColumns, now: datetime) -> dict[str, Any]:
+    """Build every check-in derived view from the archived columns.
+
+    Returns the latest visit and the current month's count and hours next
+    to the columns themselves. Only this month's visits are read, walking
+    back from the newest. The recent ``checkin_history`` attribute is
+    rendered from the columns on demand, starting at index
+    ``recent_checkins_from``.
+    """
+    month_start = now.replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+    )
+    monthly_visits = 0
+    monthly_seconds = 0
+    # Visits are compared by their local start time, as the app shows them.
+    for index in range(len(checkins) - 1, -1, -1):
+        if checkins.start(index).replace(tzinfo=None) < month_start:
+            break
+        monthly_visits += 1
+        monthly_seconds += checkins.durations[index]
+
+    latest = len(checkins) - 1
+    latest_duration = checkins.durations[latest] if latest >= 0 else 0
+    return {
+        "latest_checkin": checkins.start(latest) if latest >= 0 else None,
+        "latest_checkin_gym": checkins.gym_name(latest) if latest >= 0 else None,
+        "latest_checkin_duration_minutes": (
+            round(latest_duration / 60) if latest_duration else None
+        ),
+        "checkins": checkins,
+        "recent_checkins_from": bisect_left(
+            checkins.starts, (now - RECENT_CHECKINS_WINDOW).timestamp()
+        ),
+        "monthly_visits": monthly_visits,
+        "monthly_hours": round(monthly_seconds / 3600, 1),
+    }
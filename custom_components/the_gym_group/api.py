@@ -3,12 +3,22 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, nullcontext
 import logging
+import random
+import time
 from typing import Any, cast
 
 import aiohttp
+from yarl import URL
+
+from homeassistant.util.json import json_loads
 
 from .const import (
+    CIRCUIT_BASE_BACKOFF,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_BACKOFF,
     DEFAULT_APPLICATION_NAME,
     DEFAULT_APPLICATION_VERSION,
     DEFAULT_APPLICATION_VERSION_CODE,
@@ -20,6 +30,13 @@ from .const import (
     build_login_url,
     build_schedule_url,
 )
+from .metrics import (
+    ENDPOINT_BUSYNESS,
+    ENDPOINT_HISTORY,
+    ENDPOINT_LOGIN,
+    ENDPOINT_SCHEDULE,
+    TheGymGroupRequestMetrics,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,6 +56,205 @@ class CannotConnect(TheGymGroupApiClientError):
     """Exception raised when the API is unreachable or returns an unexpected error."""
 
 
+class CircuitOpen(CannotConnect):
+    """Exception raised when requests are paused because the host is failing."""
+
+
+def _failure_log_level(status: int) -> int:
+    """Return the level to log an unexpected HTTP status at.
+
+    Outage statuses are reported by the circuit breaker and the coordinator,
+    so only unexpected client errors are logged as errors.
+    """
+    return logging.DEBUG if status == 429 or status >= 500 else logging.ERROR
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class TheGymGroupCircuitBreaker:
+    """Circuit breaker shared by every client talking to one host.
+
+    After ``CIRCUIT_FAILURE_THRESHOLD`` consecutive failures the circuit opens
+    and requests raise ``CircuitOpen`` without touching the network. Once the
+    backoff has passed the circuit goes half-open and lets a single probe
+    through: if it succeeds the circuit closes, otherwise it opens again with
+    the backoff doubled. Backoffs are jittered between half and all of their
+    nominal value, so clients sharing an outage don't probe in lockstep.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        base_backoff: float = CIRCUIT_BASE_BACKOFF.total_seconds(),
+        max_backoff: float = CIRCUIT_MAX_BACKOFF.total_seconds(),
+    ) -> None:
+        """Initialize a closed circuit."""
+        self._failure_threshold = failure_threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.requests_rejected = 0
+        # Times the circuit has opened since it last closed; drives the backoff.
+        self._opens = 0
+        self._retry_at = 0.0
+        self._probe_started: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are being paused or probed."""
+        return self.state != CIRCUIT_CLOSED
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next probe is allowed."""
+        if self.state == CIRCUIT_CLOSED:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "requests_rejected": self.requests_rejected,
+            "retry_in_seconds": round(self.retry_in),
+        }
+
+    def before_request(self) -> None:
+        """Allow a request through, or raise if the circuit is open.
+
+        Raises:
+            CircuitOpen: the host is failing and no probe is due yet.
+        """
+        if self.state == CIRCUIT_CLOSED:
+            return
+        now = time.monotonic()
+        if self.state == CIRCUIT_OPEN and now >= self._retry_at:
+            self.state = CIRCUIT_HALF_OPEN
+            self._probe_started = None
+        if self.state == CIRCUIT_HALF_OPEN and (
+            # A probe that never reported back (e.g. it was cancelled) is
+            # given up on after the request timeout.
+            self._probe_started is None
+            or now - self._probe_started > _REQUEST_TIMEOUT.total
+        ):
+            self._probe_started = now
+            return
+        self.requests_rejected += 1
+        raise CircuitOpen(f"Requests paused for {self.retry_in:.0f}s after failures")
+
+    def record_response(self, status: int) -> None:
+        """Record an HTTP response: 429s and 5xx count as failures."""
+        if status == 429 or status >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self) -> None:
+        """Close the circuit after a request reached a working server."""
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.info("The Gym Group API is reachable again; resuming requests")
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self._opens = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit if it was the last straw."""
+        self.failures += 1
+        if self.state == CIRCUIT_CLOSED and self.failures < self._failure_threshold:
+            return
+        backoff = min(self._max_backoff, self._base_backoff * 2**self._opens)
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        if self.state == CIRCUIT_CLOSED:
+            _LOGGER.warning(
+                "The Gym Group API failed %s times in a row; pausing requests "
+                "for %.0f seconds",
+                self.failures,
+                delay,
+            )
+        else:
+            _LOGGER.debug("Probe request failed; pausing for %.0f seconds", delay)
+        self._opens += 1
+        self._retry_at = time.monotonic() + delay
+        self._probe_started = None
+        self.state = CIRCUIT_OPEN
+
+
+class TheGymGroupLoginGate:
+    """Single-flight login shared by every client of one account.
+
+    When a session expires, every coordinator (and every config entry) using
+    the account sees an auth failure at roughly the same time. Each of them
+    notes the gate's ``generation`` before sending its request and hands it
+    back when asking for a re-login: if a login has completed since then the
+    request simply failed on the old session and no new login is needed,
+    and callers queued behind an in-flight login share its outcome instead of
+    starting their own.
+
+    The outcome shared is the exported session (user ID plus cookies), so a
+    client with its own cookie jar can adopt a login performed by another.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the gate."""
+        self._lock = asyncio.Lock()
+        self._generation = 0
+        self._completed = 0
+        self._last_error: TheGymGroupApiClientError | None = None
+        self.session: dict[str, Any] | None = None
+        self.logins_performed = 0
+        self.logins_avoided = 0
+
+    @property
+    def generation(self) -> int:
+        """Return a counter that increments on every successful login."""
+        return self._generation
+
+    async def async_login(
+        self,
+        login: Callable[[], Awaitable[dict[str, Any]]],
+        seen_generation: int,
+    ) -> dict[str, Any]:
+        """Log in unless a login has already succeeded since ``seen_generation``.
+
+        Returns the session exported by the most recent successful login.
+
+        Raises:
+            InvalidAuth: the login (or the one this caller waited on) was
+                rejected.
+            CannotConnect: the login (or the one this caller waited on) failed.
+        """
+        completed = self._completed
+        async with self._lock:
+            if self._generation != seen_generation and self.session is not None:
+                self.logins_avoided += 1
+                return self.session
+            if self._completed != completed and self._last_error is not None:
+                # A login finished while we were queued and failed; sharing
+                # its outcome avoids hammering the server with a doomed retry.
+                self.logins_avoided += 1
+                raise type(self._last_error)(str(self._last_error))
+
+            try:
+                session = await login()
+            except TheGymGroupApiClientError as err:
+                self._last_error = err
+                raise
+            finally:
+                self._completed += 1
+            self._last_error = None
+            self.session = session
+            self._generation += 1
+            self.logins_performed += 1
+            return session
+
+
 class TheGymGroupApiClient:
     """A class for interacting with The Gym Group API."""
 
@@ -54,6 +270,12 @@ class TheGymGroupApiClient:
         application_name: str = DEFAULT_APPLICATION_NAME,
         application_version: str = DEFAULT_APPLICATION_VERSION,
         application_version_code: str = DEFAULT_APPLICATION_VERSION_CODE,
+        login_gate: TheGymGroupLoginGate | None = None,
+        on_session_update: Callable[[], None] | None = None,
+        request_slot: Callable[[], AbstractAsyncContextManager[Any]] | None = None,
+        circuit_breaker: TheGymGroupCircuitBreaker | None = None,
+        metrics: TheGymGroupRequestMetrics | None = None,
+        scheme: str = "https",
     ) -> None:
         """Initialize the API client.
 
@@ -69,6 +291,18 @@ class TheGymGroupApiClient:
                 ``x-np-app-version`` and ``x-np-user-agent``.
             application_version_code: The numeric app build code advertised in
                 ``x-np-user-agent``.
+            login_gate: Gate shared with other clients of the same account so
+                that re-logins after a session expiry are coalesced.
+            on_session_update: Called whenever the client adopts a new
+                session, so the caller can persist ``export_session()``.
+            request_slot: Returns a context manager held around every HTTP
+                request, so requests can be throttled across clients.
+            circuit_breaker: Breaker shared with other clients of the same
+                host, so an outage pauses requests from all of them.
+            metrics: Where to record per-endpoint request metrics. Its
+                ``trace_config`` should be installed on ``session``.
+            scheme: URL scheme for every request; only a local stand-in
+                server (see ``benchmarks/fake_netpulse.py``) uses ``http``.
         """
         self._username = username
         self._password = password
@@ -82,52 +316,127 @@ class TheGymGroupApiClient:
             application_version=application_version,
             application_version_code=application_version_code,
         )
-        self._login_url = build_login_url(host)
+        self._scheme = scheme
+        self._login_url = build_login_url(host, scheme=scheme)
+        self._base_url = URL(f"{scheme}://{host}")
+        self._login_gate = login_gate or TheGymGroupLoginGate()
+        self._on_session_update = on_session_update
+        self._request_slot = request_slot or nullcontext
+        self._circuit_breaker = circuit_breaker or TheGymGroupCircuitBreaker()
+        self._metrics = metrics or TheGymGroupRequestMetrics()
 
     @property
     def user_id(self) -> str:
         """Return the user ID (empty string if not logged in)."""
         return self._user_id
 
-    async def async_login(self) -> None:
+    @property
+    def login_gate(self) -> TheGymGroupLoginGate:
+        """Return the login gate this client coordinates re-logins through."""
+        return self._login_gate
+
+    @property
+    def circuit_breaker(self) -> TheGymGroupCircuitBreaker:
+        """Return the circuit breaker guarding this client's host."""
+        return self._circuit_breaker
+
+    @property
+    def metrics(self) -> TheGymGroupRequestMetrics:
+        """Return the client's per-endpoint request metrics."""
+        return self._metrics
+
+    def export_session(self) -> dict[str, Any]:
+        """Return the user ID and API host cookies in a JSON-serialisable form."""
+        cookies = self._session.cookie_jar.filter_cookies(self._base_url)
+        return {
+            "user_id": self._user_id,
+            "cookies": {name: morsel.value for name, morsel in cookies.items()},
+        }
+
+    def restore_session(self, session: dict[str, Any]) -> None:
+        """Adopt a session previously returned by ``export_session``.
+
+        Restored cookies let the next request go straight to the data
+        endpoint; if they have expired the usual 401 path logs in again.
+        """
+        if user_id := session.get("user_id"):
+            self._user_id = user_id
+        if cookies := session.get("cookies"):
+            self._session.cookie_jar.update_cookies(cookies, self._base_url)
+
+    async def async_login(self) -> str:
         """Perform login to populate the session's cookie jar and get the user ID.
 
+        Returns the user ID reported by the server.
+
         Raises:
             InvalidAuth: The server rejected the credentials (401/403).
+            CircuitOpen: Requests are paused after repeated failures.
             CannotConnect: The login failed for transport or other reasons.
         """
+        self._circuit_breaker.before_request()
         login_headers: dict[str, str] = self._headers.copy()
         login_headers["content-type"] = _FORM_CONTENT_TYPE
         creds: dict[str, str] = {"username": self._username, "password": self._password}
 
         try:
-            async with self._session.post(
-                self._login_url,
-                data=creds,
-                headers=login_headers,
-                timeout=_REQUEST_TIMEOUT,
-            ) as response:
-                if response.status in (401, 403):
-                    _LOGGER.warning(
-                        "Login rejected by server with status %s", response.status
+            async with self._request_slot():
+                started = time.monotonic()
+                async with self._session.post(
+                    self._login_url,
+                    data=creds,
+                    headers=login_headers,
+                    timeout=_REQUEST_TIMEOUT,
+                    trace_request_ctx=self._metrics.trace_context(ENDPOINT_LOGIN),
+                ) as response:
+                    data = await self._async_read_response(
+                        response, ENDPOINT_LOGIN, started
                     )
-                    raise InvalidAuth(f"Login rejected: {response.status}")
-                if response.status != 200:
-                    _LOGGER.error("Login failed with status code: %s", response.status)
-                    raise CannotConnect(f"Unexpected login status: {response.status}")
-
-                data: dict[str, Any] = await response.json()
-                user_id = str(data.get("uuid") or "")
-                if not user_id:
-                    _LOGGER.error("Login response missing user ID")
-                    raise CannotConnect("Login response missing user ID")
-
-                self._user_id = user_id
-                _LOGGER.debug("Login successful, session cookie stored")
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-            _LOGGER.error("Error during login request: %s", err)
+            self._circuit_breaker.record_failure()
+            self._metrics.record_error(ENDPOINT_LOGIN)
+            _LOGGER.debug("Error during login request: %s", err)
             raise CannotConnect(f"Login transport error: {err}") from err
 
+        if response.status in (401, 403):
+            _LOGGER.warning("Login rejected by server with status %s", response.status)
+            raise InvalidAuth(f"Login rejected: {response.status}")
+        if response.status != 200:
+            _LOGGER.log(
+                _failure_log_level(response.status),
+                "Login failed with status code: %s",
+                response.status,
+            )
+            raise CannotConnect(f"Unexpected login status: {response.status}")
+
+        user_id = str(data.get("uuid") or "")
+        if not user_id:
+            _LOGGER.error("Login response missing user ID")
+            raise CannotConnect("Login response missing user ID")
+
+        self._user_id = user_id
+        _LOGGER.debug("Login successful, session cookie stored")
+        return user_id
+
+    async def _async_login_and_export(self) -> dict[str, Any]:
+        """Log in and return the resulting session for the gate to share."""
+        await self.async_login()
+        return self.export_session()
+
+    async def _async_gated_login(self, seen_generation: int) -> None:
+        """Log in through the shared gate and adopt the resulting session.
+
+        Raises:
+            InvalidAuth: credentials are no longer valid.
+            CannotConnect: transport or server error.
+        """
+        session = await self._login_gate.async_login(
+            self._async_login_and_export, seen_generation
+        )
+        self.restore_session(session)
+        if self._on_session_update is not None:
+            self._on_session_update()
+
     async def _ensure_logged_in(self) -> None:
         """Ensure the client has a user ID, logging in if necessary.
 
@@ -137,30 +446,52 @@ class TheGymGroupApiClient:
         """
         if self._user_id:
             return
+        if self._login_gate.session is not None:
+            self.restore_session(self._login_gate.session)
+            return
         _LOGGER.debug("No user ID; performing initial login")
-        await self.async_login()
+        await self._async_gated_login(self._login_gate.generation)
 
-    async def async_get_busyness(self) -> dict[str, Any]:
-        """Fetch the gym busyness data.
+    async def _async_get_authenticated(
+        self, build_url: Callable[[str], str], endpoint: str, description: str
+    ) -> Any:
+        """GET a per-user endpoint, re-logging in once if the session expired.
 
         Raises:
             InvalidAuth: authentication failed.
             CannotConnect: API returned a non-auth error.
         """
         await self._ensure_logged_in()
-        url: str = build_busyness_url(self._user_id, self._host)
+        generation = self._login_gate.generation
 
-        data = await self._do_get(url, "gym busyness")
+        data = await self._do_get(build_url(self._user_id), endpoint, description)
         if data is not None:
-            return cast(dict[str, Any], data)
-
-        _LOGGER.debug("Busyness fetch returned auth error; re-logging in")
-        await self.async_login()
-
-        url = build_busyness_url(self._user_id, self._host)
-        data = await self._do_get(url, "gym busyness")
+            return data
+        _LOGGER.debug("Fetch of %s returned auth error; re-logging in", description)
+        metrics = self._metrics.endpoint(endpoint)
+        metrics.relogins += 1
+        await self._async_gated_login(generation)
+
+        metrics.retries += 1
+        data = await self._do_get(build_url(self._user_id), endpoint, description)
         if data is None:
             raise InvalidAuth("Authentication still failing after re-login")
+        return data
+
+    async def async_get_busyness(self) -> dict[str, Any]:
+        """Fetch the gym busyness data.
+
+        Raises:
+            InvalidAuth: authentication failed.
+            CannotConnect: API returned a non-auth error.
+        """
+        data = await self._async_get_authenticated(
+            lambda user_id: build_busyness_url(
+                user_id, self._host, scheme=self._scheme
+            ),
+            ENDPOINT_BUSYNESS,
+            "gym busyness",
+        )
         return cast(dict[str, Any], data)
 
     async def async_get_checkin_history(
@@ -172,19 +503,13 @@ class TheGymGroupApiClient:
             InvalidAuth: authentication failed.
             CannotConnect: API returned a non-auth error.
         """
-        await self._ensure_logged_in()
-        url = build_checkin_history_url(self._user_id, start_date, end_date, self._host)
-
-        data = await self._do_get(url, "check-in history")
-        if data is not None:
-            return cast(dict[str, Any], data)
-        _LOGGER.debug("Check-in history fetch returned auth error; re-logging in")
-        await self.async_login()
-
-        url = build_checkin_history_url(self._user_id, start_date, end_date, self._host)
-        data = await self._do_get(url, "check-in history")
-        if data is None:
-            raise InvalidAuth("Authentication still failing after re-login")
+        data = await self._async_get_authenticated(
+            lambda user_id: build_checkin_history_url(
+                user_id, start_date, end_date, self._host, scheme=self._scheme
+            ),
+            ENDPOINT_HISTORY,
+            "check-in history",
+        )
         return cast(dict[str, Any], data)
 
     async def async_get_schedule(
@@ -196,39 +521,80 @@ class TheGymGroupApiClient:
             InvalidAuth: authentication failed.
             CannotConnect: API returned a non-auth error.
         """
-        await self._ensure_logged_in()
-        url = build_schedule_url(self._user_id, start_ms, end_ms, self._host)
-
-        data = await self._do_get(url, "schedule")
-        if data is not None:
-            return cast(list[dict[str, Any]], data)
-        _LOGGER.debug("Schedule fetch returned auth error; re-logging in")
-        await self.async_login()
-
-        url = build_schedule_url(self._user_id, start_ms, end_ms, self._host)
-        data = await self._do_get(url, "schedule")
-        if data is None:
-            raise InvalidAuth("Authentication still failing after re-login")
+        data = await self._async_get_authenticated(
+            lambda user_id: build_schedule_url(
+                user_id, start_ms, end_ms, self._host, scheme=self._scheme
+            ),
+            ENDPOINT_SCHEDULE,
+            "schedule",
+        )
         return cast(list[dict[str, Any]], data)
 
-    async def _do_get(self, url: str, description: str = "data") -> Any | None:
+    async def _do_get(
+        self, url: str, endpoint: str, description: str = "data"
+    ) -> Any | None:
         """Perform a GET and return JSON, or None if auth was rejected.
 
         Raises:
+            CircuitOpen: requests are paused after repeated failures.
             CannotConnect: non-auth HTTP or transport errors.
         """
+        self._circuit_breaker.before_request()
         try:
-            async with self._session.get(
-                url, headers=self._headers, timeout=_REQUEST_TIMEOUT
-            ) as response:
-                if response.status in (401, 403):
-                    return None
-                if response.status != 200:
-                    _LOGGER.error(
-                        "Failed to fetch %s: HTTP %s", description, response.status
-                    )
-                    raise CannotConnect(f"HTTP {response.status}")
-                return await response.json()
+            async with self._request_slot():
+                started = time.monotonic()
+                async with self._session.get(
+                    url,
+                    headers=self._headers,
+                    timeout=_REQUEST_TIMEOUT,
+                    trace_request_ctx=self._metrics.trace_context(endpoint),
+                ) as response:
+                    data = await self._async_read_response(response, endpoint, started)
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-            _LOGGER.error("Error fetching %s: %s", description, err)
+            self._circuit_breaker.record_failure()
+            self._metrics.record_error(endpoint)
+            _LOGGER.debug("Error fetching %s: %s", description, err)
             raise CannotConnect(f"Transport error: {err}") from err
+
+        if response.status in (401, 403):
+            return None
+        if response.status != 200:
+            _LOGGER.log(
+                _failure_log_level(response.status),
+                "Failed to fetch %s: HTTP %s",
+                description,
+                response.status,
+            )
+            raise CannotConnect(f"HTTP {response.status}")
+        return data
+
+    async def _async_read_response(
+        self, response: aiohttp.ClientResponse, endpoint: str, started: float
+    ) -> Any:
+        """Record a response's outcome and metrics and return its JSON body.
+
+        Only 200 responses are read; None is returned for any other status.
+
+        Raises:
+            CannotConnect: the body is not valid JSON.
+        """
+        self._circuit_breaker.record_response(response.status)
+        if response.status != 200:
+            self._metrics.record_response(
+                endpoint, response.status, time.monotonic() - started
+            )
+            return None
+        body = await response.read()
+        read_at = time.monotonic()
+        try:
+            return json_loads(body)
+        except ValueError as err:
+            raise CannotConnect(f"Invalid JSON in {endpoint} response") from err
+        finally:
+            self._metrics.record_response(
+                endpoint,
+                response.status,
+                read_at - started,
+                len(body),
+                time.monotonic() - read_at,
+            )
@@ -0,0 +1,130 @@
+"""Persistent local archive of the user's check-in history."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .aggregation import CheckinColumns, CheckinRecord, parse_checkin_dt
+from .const import (
+    CHECKIN_ARCHIVE_STORAGE_KEY,
+    CHECKIN_HISTORY_WINDOW,
+    CHECKIN_SYNC_OVERLAP,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_naive(date_str: str) -> datetime | None:
+    """Parse a ``checkInDate`` string, returning None if it is malformed."""
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        return None
+
+
+class TheGymGroupCheckinArchive:
+    """Check-in records kept in HA storage and synced incrementally.
+
+    In memory the archive is held as ``CheckinColumns`` only, which the
+    history coordinator publishes as they are; raw records are only built
+    while saving. Visits are keyed by their start time, so re-fetching an
+    overlapping window simply replaces the archived copy of each visit (for
+    example once the server has filled in its ``duration``).
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the archive for a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION,
+            CHECKIN_ARCHIVE_STORAGE_KEY.format(entry_id=entry_id),
+        )
+        self.checkins = CheckinColumns()
+
+    @property
+    def newest_checkin_date(self) -> str | None:
+        """Return the ``checkInDate`` of the newest archived visit, if any."""
+        if not self.checkins:
+            return None
+        return self.checkins.check_in_date(len(self.checkins) - 1)
+
+    def get(self, raw: dict[str, Any]) -> CheckinRecord | None:
+        """Return the archived copy of a raw check-in, if any."""
+        if (start := parse_checkin_dt(raw)) is None:
+            return None
+        index = self.checkins.find(start)
+        return self.checkins[index] if index is not None else None
+
+    async def async_load(self) -> None:
+        """Load previously archived check-ins from storage."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.checkins = CheckinColumns.from_check_ins(stored.get("check_ins", []))
+        _LOGGER.debug("Loaded %d archived check-ins", len(self.checkins))
+
+    async def async_save(self) -> None:
+        """Write the archive to storage."""
+        checkins = self.checkins
+        await self._store.async_save(
+            {"check_ins": [checkins.raw(index) for index in range(len(checkins))]}
+        )
+
+    async def async_remove(self) -> None:
+        """Delete the archive from storage."""
+        await self._store.async_remove()
+
+    def sync_start(self, now: datetime) -> datetime:
+        """Return the start of the window the next sync should request.
+
+        An empty archive needs the full history window; otherwise only the
+        period since the newest archived visit (minus the overlap) is needed.
+        """
+        window_start = now - CHECKIN_HISTORY_WINDOW
+        newest = self.newest_checkin_date
+        newest_dt = _parse_naive(newest) if newest else None
+        if newest_dt is None:
+            return window_start
+        return max(
+            window_start, newest_dt.replace(tzinfo=now.tzinfo) - CHECKIN_SYNC_OVERLAP
+        )
+
+    def merge(self, check_ins: list[dict[str, Any]]) -> bool:
+        """Merge freshly fetched check-ins and drop ones outside the window.
+
+        The window is measured back from the newest archived visit rather than
+        from today, so a member who stops going keeps their last year of
+        visits instead of watching the archive drain away.
+
+        Returns True if the archive changed and should be saved.
+        """
+        fetched = CheckinColumns.from_check_ins(check_ins)
+        archived = self.checkins
+        changed = False
+        for index in range(len(fetched)):
+            match = archived.find(fetched.start(index))
+            if match is None or (
+                archived.durations[match] != fetched.durations[index]
+                or archived.gym_name(match) != fetched.gym_name(index)
+            ):
+                changed = True
+                break
+
+        newest = max(
+            (columns.starts[-1] for columns in (archived, fetched) if columns),
+            default=None,
+        )
+        if newest is None:
+            return False
+        keep_from = newest - CHECKIN_HISTORY_WINDOW.total_seconds()
+        expired = bool(archived) and archived.starts[0] < keep_from
+        if not (changed or expired):
+            return False
+        self.checkins = archived.merged(fetched, keep_from)
+        return True
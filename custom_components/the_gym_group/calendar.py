@@ -2,18 +2,25 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta, timezone
+from heapq import merge
 from typing import Any
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import TheGymGroupConfigEntry
 from .const import DOMAIN
-from .coordinator import TheGymGroupActivityCoordinator
+from .aggregation import CheckinColumns, CheckinRecord
+from .coordinator import (
+    SECTION_CALENDAR,
+    TheGymGroupHistoryCoordinator,
+    TheGymGroupScheduleCoordinator,
+)
 
 
 async def async_setup_entry(
@@ -23,25 +30,36 @@ async def async_setup_entry(
 ) -> None:
     """Set up the calendar platform."""
     runtime_data = entry.runtime_data
-    activity_coordinator = runtime_data.activity
     busyness_data = runtime_data.busyness.data or {}
     device_id = str(busyness_data.get("gymLocationId") or entry.entry_id)
     gym_name = busyness_data.get("gymLocationName", "The Gym Group")
 
     async_add_entities(
-        [TheGymGroupCalendarEntity(activity_coordinator, entry, device_id, gym_name)]
+        [
+            TheGymGroupCalendarEntity(
+                runtime_data.history,
+                runtime_data.schedule,
+                entry,
+                device_id,
+                gym_name,
+            )
+        ]
     )
 
 
-def _make_visit_event(checkin: dict[str, Any]) -> CalendarEvent:
-    """Build a CalendarEvent from a parsed check-in dict."""
-    start: datetime = checkin["start"]
-    end: datetime = checkin["end"] or start + timedelta(hours=1)
+# Length shown for visits and classes whose end time is unknown.
+_DEFAULT_EVENT_LENGTH = timedelta(hours=1)
+
+
+def _make_visit_event(checkin: CheckinRecord) -> CalendarEvent:
+    """Build a CalendarEvent from a parsed check-in record."""
+    start = checkin.start
+    end = checkin.end or start + _DEFAULT_EVENT_LENGTH
     return CalendarEvent(
         start=start,
         end=end,
         summary="Gym Visit",
-        location=checkin.get("gym_name"),
+        location=checkin.gym_name,
         uid=f"visit_{start.isoformat()}",
     )
 
@@ -49,7 +67,7 @@ def _make_visit_event(checkin: dict[str, Any]) -> CalendarEvent:
 def _make_class_event(cls: dict[str, Any], gym_name: str) -> CalendarEvent:
     """Build a CalendarEvent from a parsed booked-class dict."""
     start: datetime = cls["start"]
-    end: datetime = cls["end"] or start + timedelta(hours=1)
+    end: datetime = cls["end"] or start + _DEFAULT_EVENT_LENGTH
     instructor: str = cls.get("instructor", "")
     return CalendarEvent(
         start=start,
@@ -61,10 +79,101 @@ def _make_class_event(cls: dict[str, Any], gym_name: str) -> CalendarEvent:
     )
 
 
+class _EventIndex:
+    """Calendar events sorted by start time, queryable by binary search.
+
+    Events are sorted once per coordinator update instead of on every read.
+    No event lasts longer than the longest one seen, so any event overlapping
+    a point or range starts at most that long before it, which bounds the
+    slice each lookup has to scan.
+    """
+
+    def __init__(self, events: list[CalendarEvent]) -> None:
+        """Build the index from an unsorted list of events."""
+        events.sort(key=lambda e: e.start)
+        self.events = events
+        self._starts = [ev.start for ev in events]
+        self._max_duration = max(
+            (ev.end - ev.start for ev in events), default=timedelta(0)
+        )
+
+    def current_or_next(self, now: datetime) -> CalendarEvent | None:
+        """Return the first event in progress at ``now``, else the next one."""
+        lo = bisect_left(self._starts, now - self._max_duration)
+        hi = bisect_right(self._starts, now)
+        for ev in self.events[lo:hi]:
+            if ev.end >= now:
+                return ev
+        return self.events[hi] if hi < len(self.events) else None
+
+    def overlapping(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Return events overlapping [start, end), in chronological order."""
+        lo = bisect_left(self._starts, start - self._max_duration)
+        hi = bisect_left(self._starts, end)
+        return [ev for ev in self.events[lo:hi] if ev.end > start]
+
+
+class _VisitIndex:
+    """Queries over check-in columns, with the same semantics as _EventIndex.
+
+    The columns are already in chronological order, so lookups bisect their
+    epoch-second start times directly. A ``CalendarEvent`` is only built for
+    a visit the first time a lookup returns it, then reused until the index
+    is rebuilt, so paging back and forth through months costs no new events.
+    """
+
+    def __init__(self, checkins: CheckinColumns) -> None:
+        """Index the check-ins."""
+        self._checkins = checkins
+        self._events: dict[int, CalendarEvent] = {}
+        self._default_length = int(_DEFAULT_EVENT_LENGTH.total_seconds())
+        self._max_length = max(checkins.max_duration, self._default_length)
+
+    def _event(self, index: int) -> CalendarEvent:
+        """Return the calendar event for a visit, building it on first use."""
+        if (event := self._events.get(index)) is None:
+            event = self._events[index] = _make_visit_event(self._checkins[index])
+        return event
+
+    def _end(self, index: int) -> int:
+        """Return when a visit ended (or is assumed to), in epoch seconds."""
+        checkins = self._checkins
+        return checkins.starts[index] + (
+            checkins.durations[index] or self._default_length
+        )
+
+    def current_or_next(self, now: datetime) -> CalendarEvent | None:
+        """Return the first visit in progress at ``now``, else the next one."""
+        starts = self._checkins.starts
+        timestamp = now.timestamp()
+        lo = bisect_left(starts, timestamp - self._max_length)
+        hi = bisect_right(starts, timestamp)
+        for index in range(lo, hi):
+            if self._end(index) >= timestamp:
+                return self._event(index)
+        return self._event(hi) if hi < len(starts) else None
+
+    def overlapping(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Return visits overlapping [start, end), in chronological order."""
+        starts = self._checkins.starts
+        start_ts = start.timestamp()
+        lo = bisect_left(starts, start_ts - self._max_length)
+        hi = bisect_left(starts, end.timestamp())
+        return [
+            self._event(index)
+            for index in range(lo, hi)
+            if self._end(index) > start_ts
+        ]
+
+
 class TheGymGroupCalendarEntity(
-    CoordinatorEntity[TheGymGroupActivityCoordinator], CalendarEntity
+    CoordinatorEntity[TheGymGroupHistoryCoordinator], CalendarEntity
 ):
-    """Calendar entity exposing gym visits and booked classes."""
+    """Calendar entity exposing gym visits and booked classes.
+
+    Visits come from the history coordinator and classes from the schedule
+    coordinator; the entity is written when either one's events change.
+    """
 
     _attr_has_entity_name = True
     _attr_name = "Gym Calendar"
@@ -72,16 +181,22 @@ class TheGymGroupCalendarEntity(
 
     def __init__(
         self,
-        coordinator: TheGymGroupActivityCoordinator,
+        coordinator: TheGymGroupHistoryCoordinator,
+        schedule: TheGymGroupScheduleCoordinator,
         config_entry: TheGymGroupConfigEntry,
         device_id: str,
         gym_name: str,
     ) -> None:
         """Initialise the calendar entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, SECTION_CALENDAR)
+        self.schedule = schedule
         self._device_id = device_id
         self._gym_name = gym_name
         self._attr_unique_id = f"{device_id}_calendar"
+        self._visits = _VisitIndex(CheckinColumns())
+        self._classes = _EventIndex([])
+        self._visits_data: dict[str, Any] | None = None
+        self._classes_data: dict[str, Any] | None = None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -93,29 +208,53 @@ class TheGymGroupCalendarEntity(
             model="Unofficial integration",
         )
 
-    def _all_events(self) -> list[CalendarEvent]:
-        """Return all known events sorted chronologically."""
-        data = self.coordinator.data or {}
-        events: list[CalendarEvent] = [
-            _make_visit_event(ci) for ci in data.get("calendar_checkins", [])
-        ] + [
-            _make_class_event(cls, self._gym_name)
-            for cls in data.get("calendar_classes", [])
-        ]
-        events.sort(key=lambda e: e.start)
-        return events
+    async def async_added_to_hass(self) -> None:
+        """Also listen for changes to the booked classes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.schedule.async_add_listener(
+                self._handle_coordinator_update, SECTION_CALENDAR
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state, under the profiler if a capture is running."""
+        self.coordinator.profiler.profile_state_write(
+            super()._handle_coordinator_update
+        )
+
+    def _event_indexes(self) -> tuple[_VisitIndex, _EventIndex]:
+        """Return the visit and class indexes, each rebuilt when its data changes."""
+        visits_data = self.coordinator.data
+        if visits_data is not self._visits_data:
+            checkins = (visits_data or {}).get("checkins")
+            self._visits = _VisitIndex(checkins or CheckinColumns())
+            self._visits_data = visits_data
+        classes_data = self.schedule.data
+        if classes_data is not self._classes_data:
+            self._classes = _EventIndex(
+                [
+                    _make_class_event(cls, self._gym_name)
+                    for cls in (classes_data or {}).get("calendar_classes", [])
+                ]
+            )
+            self._classes_data = classes_data
+        return self._visits, self._classes
 
     @property
     def event(self) -> CalendarEvent | None:
         """Return the currently active event, or the next upcoming one."""
         now = datetime.now(timezone.utc)
-        next_upcoming: CalendarEvent | None = None
-        for ev in self._all_events():
-            if ev.start <= now <= ev.end:
-                return ev
-            if ev.start > now and next_upcoming is None:
-                next_upcoming = ev
-        return next_upcoming
+        candidates = [
+            ev
+            for index in self._event_indexes()
+            if (ev := index.current_or_next(now)) is not None
+        ]
+        # An event in progress wins over an upcoming one, then the earliest.
+        return min(
+            candidates, key=lambda ev: (ev.start > now, ev.start), default=None
+        )
 
     async def async_get_events(
         self,
@@ -124,8 +263,11 @@ class TheGymGroupCalendarEntity(
         end_date: datetime,
     ) -> list[CalendarEvent]:
         """Return events overlapping the requested date range."""
-        return [
-            ev
-            for ev in self._all_events()
-            if ev.start < end_date and ev.end > start_date
-        ]
+        visits, classes = self._event_indexes()
+        return list(
+            merge(
+                visits.overlapping(start_date, end_date),
+                classes.overlapping(start_date, end_date),
+                key=lambda ev: ev.start,
+            )
+        )
@@ -12,6 +12,14 @@ DOMAIN = "the_gym_group"
 # The platform we are integrating with (sensor).
 PLATFORMS: list[Platform] = [Platform.CALENDAR, Platform.SENSOR]
 
+# Events fired on the bus when a refresh finds new or changed activity. The
+# device triggers in device_trigger.py listen for these.
+EVENT_CHECKED_IN = f"{DOMAIN}_checked_in"
+EVENT_VISIT_FINISHED = f"{DOMAIN}_visit_finished"
+EVENT_CLASS_BOOKED = f"{DOMAIN}_class_booked"
+EVENT_CLASS_CANCELLED = f"{DOMAIN}_class_cancelled"
+EVENT_CLASS_SPOTS_CHANGED = f"{DOMAIN}_class_spots_changed"
+
 # --- Config entry keys for the configurable transport / app-identity values.
 #
 # These are exposed in the config flow (with sensible defaults) and stored in
@@ -55,12 +63,158 @@ LAST_CHECKIN_TRANSLATION_KEY = "last_checkin"
 MONTHLY_VISITS_TRANSLATION_KEY = "monthly_visits"
 MONTHLY_TIME_TRANSLATION_KEY = "monthly_time"
 NEXT_CLASS_TRANSLATION_KEY = "next_class"
+BUSYNESS_FORECAST_TRANSLATION_KEY = "busyness_forecast"
+QUIETEST_TIME_TRANSLATION_KEY = "quietest_time"
+API_LATENCY_TRANSLATION_KEY = "api_latency"
+CLASS_SPOTS_TRANSLATION_KEY = "class_spots"
 
-# Poll interval for the busyness DataUpdateCoordinator.
+# Default poll interval for the busyness DataUpdateCoordinator.
 SCAN_INTERVAL = timedelta(minutes=5)
 
-# Poll interval for the activity DataUpdateCoordinator (check-ins, schedule).
-ACTIVITY_SCAN_INTERVAL = timedelta(minutes=30)
+# --- Adaptive busyness polling (see polling.py). The interval always stays
+# within [BUSYNESS_MIN_INTERVAL, BUSYNESS_MAX_INTERVAL].
+BUSYNESS_MIN_INTERVAL = timedelta(minutes=2)
+BUSYNESS_MAX_INTERVAL = timedelta(minutes=30)
+# Interval once occupancy has stayed flat for BUSYNESS_STABLE_SAMPLES polls,
+# where "flat" means it moved by at most BUSYNESS_STABLE_DELTA people.
+BUSYNESS_STABLE_INTERVAL = timedelta(minutes=15)
+BUSYNESS_STABLE_SAMPLES = 3
+BUSYNESS_STABLE_DELTA = 2
+# Occupancy change (people per minute) that switches to the minimum interval.
+BUSYNESS_CHANGING_RATE = 1.0
+# How long before (and after) the learned opening time to poll at the
+# minimum interval while the gym still reports closed.
+BUSYNESS_OPENING_LEAD = timedelta(minutes=30)
+
+# Entries whose accounts share a home gym share one busyness fetch (see
+# hub.py). A fetch younger than this is reused instead of fetching again, so
+# entries whose timers fire together only cause one upstream request.
+BUSYNESS_HUB_MAX_AGE = timedelta(seconds=60)
+
+# --- Fleet scheduling shared by every entry (see fleet.py). Each entry's polls
+# are phase-shifted so entries spread evenly across their interval instead of
+# firing together, every request to a host waits for one of
+# FLEET_MAX_IN_FLIGHT_PER_HOST slots, and all requests share a token bucket
+# refilled at FLEET_REQUESTS_PER_SECOND that holds up to FLEET_BURST tokens.
+FLEET_MAX_IN_FLIGHT_PER_HOST = 4
+FLEET_REQUESTS_PER_SECOND = 2.0
+FLEET_BURST = 10
+
+# --- Per-host circuit breaker (see api.py). After CIRCUIT_FAILURE_THRESHOLD
+# consecutive failed requests (transport errors, 429s and 5xx responses) the
+# circuit opens and requests fail fast. One probe request is let through once
+# the backoff has passed; the backoff starts at CIRCUIT_BASE_BACKOFF, doubles
+# each time a probe fails, is capped at CIRCUIT_MAX_BACKOFF and is jittered so
+# clients don't probe in lockstep.
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_BASE_BACKOFF = timedelta(minutes=1)
+CIRCUIT_MAX_BACKOFF = timedelta(minutes=30)
+
+# The check-in history and the booked schedule have coordinators of their
+# own. The history is large and changes rarely, so it is polled every
+# HISTORY_SCAN_INTERVAL; the schedule is small and changes often, so it is
+# polled every SCHEDULE_SCAN_INTERVAL. While a fetch fails but there is
+# earlier data to publish, each retries after its *_RETRY_INTERVAL instead.
+HISTORY_SCAN_INTERVAL = timedelta(minutes=30)
+HISTORY_RETRY_INTERVAL = timedelta(minutes=5)
+SCHEDULE_SCAN_INTERVAL = timedelta(minutes=10)
+SCHEDULE_RETRY_INTERVAL = timedelta(minutes=2)
+
+# How far ahead the schedule coordinator fetches booked classes.
+SCHEDULE_WINDOW = timedelta(days=7)
+
+# --- Visit tracking (see polling.py). While a visit is in progress (the
+# newest check-in has no duration yet and started less than
+# VISIT_TRACKING_MAX ago), or for VISIT_WATCH_PERIOD after the gym's
+# occupancy rises at a time the member usually visits, the history
+# coordinator polls every HISTORY_VISIT_INTERVAL and only requests today's
+# check-ins. A usual time is a weekday and hour with at least
+# VISIT_USUAL_MIN_VISITS archived visits.
+HISTORY_VISIT_INTERVAL = timedelta(minutes=5)
+VISIT_TRACKING_MAX = timedelta(hours=4)
+VISIT_WATCH_PERIOD = timedelta(minutes=30)
+VISIT_USUAL_MIN_VISITS = 3
+
+# --- Class watch (see coordinator.py). Booked classes starting within
+# CLASS_WATCH_HORIZON get their own spots sensor, kept up to date by polling
+# only the schedule endpoint, and only up to the last watched class. Polls
+# speed up as the nearest class approaches: each (lead, interval) pair
+# applies once the class starts within ``lead``. With nothing to watch, the
+# known schedule is checked again after CLASS_WATCH_IDLE_INTERVAL.
+CLASS_WATCH_HORIZON = timedelta(hours=24)
+CLASS_WATCH_INTERVALS: tuple[tuple[timedelta, timedelta], ...] = (
+    (timedelta(minutes=15), timedelta(minutes=1)),
+    (timedelta(hours=1), timedelta(minutes=2)),
+    (timedelta(hours=3), timedelta(minutes=5)),
+    (CLASS_WATCH_HORIZON, timedelta(minutes=15)),
+)
+CLASS_WATCH_IDLE_INTERVAL = timedelta(minutes=15)
+
+# How far back the check-in history (and therefore the calendar) reaches.
+CHECKIN_HISTORY_WINDOW = timedelta(days=365)
+
+# Once the local archive holds data, each history refresh only requests the
+# window since the newest archived check-in, widened by this overlap so visits
+# whose duration is filled in after the fact are picked up on a later sync.
+CHECKIN_SYNC_OVERLAP = timedelta(days=2)
+
+# Version and key template for the per-entry check-in archive kept in HA's
+# ``.storage`` directory.
+STORAGE_VERSION = 1
+CHECKIN_ARCHIVE_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.checkins"
+
+# Key template for the per-entry API session (user ID + Netpulse cookies),
+# restored at startup so the first request doesn't need a login. Saves are
+# delayed slightly so a burst of re-logins only writes the file once.
+SESSION_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.session"
+SESSION_SAVE_DELAY = 10
+
+# Key template for each coordinator's last good payload, restored at startup
+# so entities come up immediately while a live refresh runs in the background.
+# ``name`` is the coordinator ("busyness" or "schedule"). Saves are delayed so
+# frequent polls don't rewrite the file every time, and snapshots older than
+# SNAPSHOT_MAX_AGE are ignored in favour of a blocking first refresh.
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.{{name}}_snapshot"
+SNAPSHOT_SAVE_DELAY = 60
+SNAPSHOT_MAX_AGE = timedelta(days=7)
+
+# --- Local busyness time series (see timeseries.py). Samples are averaged into
+# 5-minute buckets, which roll up into hourly and then daily buckets. Each
+# tier keeps its buckets for the given retention, in a binary file named
+# after BUSYNESS_SERIES_FILE in HA's ``.storage`` directory.
+BUSYNESS_SERIES_FILE = f"{DOMAIN}.{{entry_id}}.busyness_{{tier}}.bin"
+BUSYNESS_SERIES_TIERS: dict[str, tuple[timedelta, timedelta]] = {
+    # tier: (bucket width, retention)
+    "5min": (timedelta(minutes=5), timedelta(days=35)),
+    "hourly": (timedelta(hours=1), timedelta(days=400)),
+    "daily": (timedelta(days=1), timedelta(days=5 * 365)),
+}
+
+# --- Occupancy profile (see profile.py): an exponentially decayed average
+# population for each weekday and PROFILE_SLOT of local time. A sample's
+# influence halves every PROFILE_HALF_LIFE, so recent weeks count more. A slot
+# needs PROFILE_MIN_WEIGHT worth of samples before it is used in forecasts.
+PROFILE_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.profile"
+PROFILE_SLOT = timedelta(minutes=15)
+PROFILE_HALF_LIFE = timedelta(weeks=4)
+PROFILE_MIN_WEIGHT = 1.0
+PROFILE_SAVE_DELAY = 300
+# How far ahead the forecast sensors look.
+FORECAST_HORIZON = timedelta(hours=6)
+
+# --- Long-term statistics (see statistics.py). After a restart, the daily
+# visit statistics are recomputed from this many days before the last
+# imported day, so visits whose duration was filled in late are corrected.
+VISIT_STATISTICS_RESYNC_DAYS = CHECKIN_SYNC_OVERLAP.days + 1
+
+# --- On-demand profiling (see profiling.py). Captures are written to this
+# directory under the config directory, and diagnostics list the functions
+# with the most own time.
+PROFILING_DIR = f"{DOMAIN}_profiles"
+PROFILING_TOP_FUNCTIONS = 15
+# Bounds for the number of coordinator updates a capture covers.
+PROFILING_DEFAULT_UPDATES = 5
+PROFILING_MAX_UPDATES = 50
 
 # Max number of historical datapoints to expose as a state attribute.
 # Full history is available via diagnostics; keeping attributes small avoids
@@ -96,27 +250,39 @@ def build_headers(
     }
 
 
-def build_login_url(host: str = DEFAULT_HOST) -> str:
+def build_login_url(host: str = DEFAULT_HOST, *, scheme: str = "https") -> str:
     """Return the full login URL for the given host."""
-    return f"https://{host}{LOGIN_PATH}"
+    return f"{scheme}://{host}{LOGIN_PATH}"
 
 
-def build_busyness_url(user_id: str, host: str = DEFAULT_HOST) -> str:
+def build_busyness_url(
+    user_id: str, host: str = DEFAULT_HOST, *, scheme: str = "https"
+) -> str:
     """Return the busyness URL for the given user on the given host."""
-    return f"https://{host}{BUSYNESS_PATH_TEMPLATE.format(user_id=user_id)}"
+    return f"{scheme}://{host}{BUSYNESS_PATH_TEMPLATE.format(user_id=user_id)}"
 
 
 def build_checkin_history_url(
-    user_id: str, start_date: str, end_date: str, host: str = DEFAULT_HOST
+    user_id: str,
+    start_date: str,
+    end_date: str,
+    host: str = DEFAULT_HOST,
+    *,
+    scheme: str = "https",
 ) -> str:
     """Return the check-in history URL for the given user and date range."""
     path = CHECKIN_HISTORY_PATH_TEMPLATE.format(user_id=user_id)
-    return f"https://{host}{path}?startDate={start_date}&endDate={end_date}"
+    return f"{scheme}://{host}{path}?startDate={start_date}&endDate={end_date}"
 
 
 def build_schedule_url(
-    user_id: str, start_ms: int, end_ms: int, host: str = DEFAULT_HOST
+    user_id: str,
+    start_ms: int,
+    end_ms: int,
+    host: str = DEFAULT_HOST,
+    *,
+    scheme: str = "https",
 ) -> str:
     """Return the user schedule URL for the given epoch-millisecond range."""
     path = SCHEDULE_PATH_TEMPLATE.format(user_id=user_id)
-    return f"https://{host}{path}?startDateTime={start_ms}&endDateTime={end_ms}"
+    return f"{scheme}://{host}{path}?startDateTime={start_ms}&endDateTime={end_ms}"
@@ -2,21 +2,220 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import partial
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import CannotConnect, InvalidAuth, TheGymGroupApiClient
-from .const import ACTIVITY_SCAN_INTERVAL, DOMAIN, SCAN_INTERVAL
+from .api import (
+    CannotConnect,
+    InvalidAuth,
+    TheGymGroupApiClient,
+    TheGymGroupApiClientError,
+)
+from .aggregation import CHECKIN_DATE_FORMAT, aggregate_checkins
+from .archive import TheGymGroupCheckinArchive
+from .const import (
+    CIRCUIT_BASE_BACKOFF,
+    CLASS_WATCH_HORIZON,
+    DOMAIN,
+    HISTORY_RETRY_INTERVAL,
+    HISTORY_SCAN_INTERVAL,
+    SCAN_INTERVAL,
+    SCHEDULE_RETRY_INTERVAL,
+    SCHEDULE_SCAN_INTERVAL,
+    SCHEDULE_WINDOW,
+)
+from .deltas import Delta, checkin_deltas, class_deltas
+from .fleet import async_get_fleet_scheduler
+from .hub import async_get_busyness_hub
+from .polling import AdaptivePollScheduler, VisitPollScheduler, class_watch_interval
+from .profile import TheGymGroupOccupancyProfile
+from .profiling import async_get_profiler
+from .snapshot import TheGymGroupSnapshot
+from .statistics import TheGymGroupOccupancyStatistics, TheGymGroupVisitStatistics
+from .timeseries import TheGymGroupBusynessSeries
 
 _LOGGER = logging.getLogger(__name__)
 
+# Sections of the published data, each with the payload keys behind it.
+# Entities pass their section as the coordinator context and are only
+# notified when one of its values changes; entities without one (whose state
+# also depends on the time or on metrics) are notified on every update.
+SECTION_CAPACITY = "capacity"
+SECTION_STATUS = "status"
+SECTION_LATEST_CHECKIN = "latest_checkin"
+SECTION_MONTHLY = "monthly"
+SECTION_NEXT_CLASS = "next_class"
+SECTION_CALENDAR = "calendar"
+
+BUSYNESS_SECTIONS: dict[str, tuple[str, ...]] = {
+    SECTION_CAPACITY: (
+        "gymLocationId",
+        "gymLocationName",
+        "currentCapacity",
+        "currentPercentage",
+        "historical",
+    ),
+    SECTION_STATUS: ("status",),
+}
+HISTORY_SECTIONS: dict[str, tuple[str, ...]] = {
+    SECTION_LATEST_CHECKIN: (
+        "latest_checkin",
+        "latest_checkin_gym",
+        "latest_checkin_duration_minutes",
+        "checkins",
+        "recent_checkins_from",
+    ),
+    SECTION_MONTHLY: ("monthly_visits", "monthly_hours"),
+    SECTION_CALENDAR: ("checkins",),
+}
+SCHEDULE_SECTIONS: dict[str, tuple[str, ...]] = {
+    SECTION_NEXT_CLASS: ("next_class",),
+    SECTION_CALENDAR: ("calendar_classes",),
+}
+
+
+class _SectionNotifier:
+    """Notify only the listeners whose section of the data changed.
+
+    Without a section map, each top-level key of the data is a section.
+    Coordinators register their listeners here as well as with
+    DataUpdateCoordinator (which uses them to decide whether to keep
+    polling), so the listeners of a section can be looked up directly.
+    """
+
+    def __init__(self, sections: dict[str, tuple[str, ...]] | None = None) -> None:
+        """Initialize with nothing notified yet."""
+        self._sections = sections
+        self._notified: tuple[tuple[Any, ...], dict[str, Any]] | None = None
+        # Listener callbacks by section (None for every update).
+        self._listeners: dict[Any, list[CALLBACK_TYPE]] = {}
+
+    @callback
+    def async_add_listener(
+        self,
+        update_callback: CALLBACK_TYPE,
+        context: Any,
+        remove_from_coordinator: Callable[[], None],
+    ) -> Callable[[], None]:
+        """Register a listener for a section; return a function removing it."""
+        callbacks = self._listeners.setdefault(context, [])
+        callbacks.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in callbacks:
+                callbacks.remove(update_callback)
+            remove_from_coordinator()
+
+        return remove_listener
+
+    def _changed(
+        self, coordinator: DataUpdateCoordinator[dict[str, Any]]
+    ) -> set[str] | None:
+        """Return the sections that changed, or None if all listeners must run."""
+        data = coordinator.data or {}
+        values: dict[str, Any] = (
+            dict(data)
+            if self._sections is None
+            else {
+                section: tuple(data.get(key) for key in keys)
+                for section, keys in self._sections.items()
+            }
+        )
+        # Availability and staleness show on every entity.
+        state = (
+            coordinator.last_update_success,
+            getattr(coordinator, "stale_since", None),
+        )
+        previous, self._notified = self._notified, (state, values)
+        if previous is None or previous[0] != state:
+            return None
+        previous_values = previous[1]
+        return {
+            section
+            for section in values.keys() | previous_values.keys()
+            if values.get(section) != previous_values.get(section)
+        }
+
+    @callback
+    def async_update_listeners(
+        self, coordinator: DataUpdateCoordinator[dict[str, Any]]
+    ) -> None:
+        """Call the listeners of changed sections and those without one."""
+        changed = self._changed(coordinator)
+        for context, callbacks in list(self._listeners.items()):
+            if changed is None or context is None or context in changed:
+                for update_callback in list(callbacks):
+                    update_callback()
+
+
+@callback
+def _async_fire_events(
+    coordinator: DataUpdateCoordinator[Any], events: list[Delta]
+) -> None:
+    """Fire change events on the bus, tagged with the entry and its device."""
+    if not events:
+        return
+    hass = coordinator.hass
+    entry_id = coordinator.config_entry.entry_id
+    # Triggers match the device, and all of an entry's entities share one.
+    device_id = next(
+        (
+            device.id
+            for device in dr.async_entries_for_config_entry(
+                dr.async_get(hass), entry_id
+            )
+        ),
+        None,
+    )
+    for event_type, event_data in events:
+        hass.bus.async_fire(
+            event_type,
+            {"config_entry_id": entry_id, "device_id": device_id, **event_data},
+        )
+
+
+def _stale_data(
+    coordinator: (
+        TheGymGroupDataUpdateCoordinator
+        | TheGymGroupHistoryCoordinator
+        | TheGymGroupScheduleCoordinator
+        | TheGymGroupClassWatchCoordinator
+    ),
+    api_client: TheGymGroupApiClient,
+    err: BaseException,
+) -> dict[str, Any] | None:
+    """Return the coordinator's last good data if it should be served stale.
+
+    While the host's circuit breaker is open, the last good data is kept
+    published (rather than every entity going unavailable) and the next
+    refresh is pushed back to when the breaker will allow a probe. Returns
+    None if the failure should be raised as usual.
+    """
+    breaker = api_client.circuit_breaker
+    if coordinator.data is None or not breaker.is_open:
+        return None
+    _LOGGER.debug(
+        "%s: serving stale data while the API is failing: %s", coordinator.name, err
+    )
+    # Data restored from a snapshot keeps the snapshot's time.
+    if coordinator.stale_since is None:
+        coordinator.stale_since = datetime.now(timezone.utc)
+    coordinator.update_interval = max(
+        timedelta(seconds=breaker.retry_in), CIRCUIT_BASE_BACKOFF / 2
+    )
+    return coordinator.data
+
 
 class TheGymGroupDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching busyness data from the API."""
@@ -29,6 +228,22 @@ class TheGymGroupDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     ) -> None:
         """Initialize."""
         self.api_client = api_client
+        self.poll_scheduler = AdaptivePollScheduler()
+        self.snapshot = TheGymGroupSnapshot(hass, config_entry.entry_id, "busyness")
+        self.series = TheGymGroupBusynessSeries(hass, config_entry.entry_id)
+        self.profile = TheGymGroupOccupancyProfile(hass, config_entry.entry_id)
+        self.statistics = TheGymGroupOccupancyStatistics(hass)
+        # Home gym from the latest payload; set by the hub on subscribing.
+        self.gym_id: str | None = None
+        # The last payload recorded, so one shared by the hub is recorded
+        # only once however many times it is handed to this coordinator.
+        self._processed_data: dict[str, Any] | None = None
+        # When the published data started being served stale, if it is.
+        self.stale_since: datetime | None = None
+        self.hub = async_get_busyness_hub(hass)
+        self.fleet = async_get_fleet_scheduler(hass)
+        self.profiler = async_get_profiler(hass, config_entry.entry_id)
+        self._notifier = _SectionNotifier(BUSYNESS_SECTIONS)
         super().__init__(
             hass,
             _LOGGER,
@@ -36,34 +251,116 @@ class TheGymGroupDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             name=DOMAIN,
             update_interval=SCAN_INTERVAL,
         )
+        self.fleet.async_register("busyness", config_entry.entry_id)
+        config_entry.async_on_unload(partial(self.hub.async_unsubscribe, self))
+        config_entry.async_on_unload(
+            partial(self.fleet.async_unregister, "busyness", config_entry.entry_id)
+        )
+
+    async def _async_setup(self) -> None:
+        """Load the local busyness history and profile before the first refresh."""
+        await self.series.async_load()
+        await self.profile.async_load()
+
+    async def async_restore_snapshot(self) -> bool:
+        """Publish the last good payload from disk, returning True if found."""
+        data = await self.snapshot.async_load(datetime.now(timezone.utc))
+        if data is None:
+            return False
+        # The first refresh is skipped, so run its setup step here.
+        await self._async_setup()
+        self.data = data
+        # Until a refresh succeeds, the data is as old as the snapshot.
+        self.stale_since = self.snapshot.fetched_at
+        self.hub.async_subscribe(self, data)
+        return True
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for updates to a section of the data (None for every update)."""
+        remove = super().async_add_listener(update_callback, context)
+        return self._notifier.async_add_listener(update_callback, context, remove)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the entities whose section of the data changed."""
+        self._notifier.async_update_listeners(self)
 
     async def _async_update_data(self) -> dict[str, Any]:
+        """Update data, under the profiler if a capture is running."""
+        return await self.profiler.async_profile_update(self._async_fetch())
+
+    async def _async_fetch(self) -> dict[str, Any]:
         """Update data via library."""
         try:
-            return await self.api_client.async_get_busyness()
+            data = await self.hub.async_fetch(self)
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed(str(err)) from err
         except CannotConnect as err:
+            if (stale := _stale_data(self, self.api_client, err)) is not None:
+                return stale
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+        await self._async_process(data)
+        return data
 
-def _parse_checkin_dt(raw: dict[str, Any] | None) -> datetime | None:
-    """Convert a raw check-in object to a timezone-aware datetime, or None."""
-    if not raw:
-        return None
-    date_str: str = raw.get("checkInDate", "")
-    tz_name: str = raw.get("timezone", "UTC")
-    if not date_str:
-        return None
-    try:
-        tz = ZoneInfo(tz_name)
-    except (ZoneInfoNotFoundError, KeyError):
-        tz = timezone.utc
-    try:
-        return datetime.fromisoformat(date_str).replace(tzinfo=tz)
-    except ValueError:
-        _LOGGER.warning("Could not parse check-in date %r", date_str)
-        return None
+    async def async_handle_shared_data(self, data: dict[str, Any]) -> None:
+        """Publish busyness fetched by another entry for the same gym."""
+        await self.profiler.async_profile_update(self._async_process(data))
+        self.async_set_updated_data(data)
+
+    async def _async_process(self, data: dict[str, Any]) -> None:
+        """Record a busyness payload and pick the next poll interval."""
+        now = datetime.now(timezone.utc)
+        entry_id = self.config_entry.entry_id
+        self.stale_since = None
+        if data is self._processed_data:
+            # The hub hands back the payload it has just pushed to this
+            # coordinator if its own timer fires shortly after. It was
+            # recorded then, so only the next poll is rescheduled.
+            interval = self.poll_scheduler.interval
+        else:
+            self._processed_data = data
+            self.snapshot.async_update(data, now)
+            await self.series.async_add_sample(
+                now, data.get("currentCapacity"), data.get("currentPercentage")
+            )
+            self.profile.async_update(data, now)
+            await self.statistics.async_add_sample(data, now)
+            # Entries sharing a gym share a phase, so their polls stay
+            # together and the hub can serve them with one fetch.
+            self.fleet.async_register("busyness", entry_id, self.gym_id)
+            interval = self.poll_scheduler.update(data, now)
+        # The coordinator reads update_interval when scheduling the next
+        # refresh, which happens after the data is published.
+        self.update_interval = self.fleet.next_interval(
+            "busyness", entry_id, interval, now
+        )
+
+
+def _describe_error(result: object) -> str | None:
+    """Return a short description of a failed fetch, or None if it succeeded."""
+    if isinstance(result, BaseException):
+        return str(result) or type(result).__name__
+    return None
+
+
+def _upcoming_classes(
+    schedule: list[dict[str, Any]], now_ms: int
+) -> list[dict[str, Any]]:
+    """Drop classes from a previously fetched schedule that have started."""
+    return [
+        item
+        for item in schedule
+        if item.get("brief", {}).get("startDateTime", 0) >= now_ms
+    ]
+
+
+def _class_start_ms(item: dict[str, Any]) -> int:
+    """Return when a schedule item starts, in epoch milliseconds."""
+    return (item.get("brief") or {}).get("startDateTime", 0)
 
 
 def _find_next_class(schedule: list[dict[str, Any]]) -> dict[str, Any] | None:
@@ -95,8 +392,39 @@ def _find_next_class(schedule: list[dict[str, Any]]) -> dict[str, Any] | None:
     return candidates[0]
 
 
-class TheGymGroupActivityCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Coordinator for activity data: check-in history and booked schedule."""
+def _build_schedule_data(schedule_raw: list[dict[str, Any]]) -> dict[str, Any]:
+    """Derive the published schedule data from the fetched schedule."""
+    # All upcoming non-cancelled booked classes for the calendar entity.
+    calendar_classes: list[dict[str, Any]] = []
+    for item in schedule_raw:
+        brief = item.get("brief", {})
+        if brief.get("cancelled", False):
+            continue
+        start_ms: int = brief.get("startDateTime", 0)
+        end_ms: int = brief.get("endDateTime", 0)
+        if not start_ms:
+            continue
+        instructor_info = brief.get("instructor") or {}
+        calendar_classes.append({
+            "start": datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc),
+            "end": datetime.fromtimestamp(end_ms / 1000, tz=timezone.utc) if end_ms else None,
+            "name": brief.get("name") or "Booked Class",
+            "instructor": instructor_info.get("fullName") or "",
+        })
+
+    return {
+        "calendar_classes": calendar_classes,
+        "next_class": _find_next_class(schedule_raw),
+    }
+
+
+class TheGymGroupHistoryCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Coordinator for the check-in history, synced into a local archive.
+
+    The history is large and changes rarely, so it is fetched incrementally
+    on its own slow cadence (sped up only while a visit is tracked), apart
+    from the booked schedule.
+    """
 
     def __init__(
         self,
@@ -106,105 +434,418 @@ class TheGymGroupActivityCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     ) -> None:
         """Initialize."""
         self.api_client = api_client
+        self.archive = TheGymGroupCheckinArchive(hass, config_entry.entry_id)
+        # Error from the most recent fetch, or None if it succeeded.
+        self.last_error: str | None = None
+        self.poll_scheduler = VisitPollScheduler()
+        self._history_synced = False
+        # Bus events for changes found by the last refresh, fired once its
+        # data has been published.
+        self._pending_events: list[Delta] = []
+        # When the published data started being served stale, if it is.
+        self.stale_since: datetime | None = None
+        self.statistics = TheGymGroupVisitStatistics(
+            hass, config_entry.unique_id or config_entry.entry_id
+        )
+        # Statistics are imported (and usual visit times learned) at the
+        # first refresh and whenever the archive changes.
+        self._statistics_stale = True
+        self.fleet = async_get_fleet_scheduler(hass)
+        self.profiler = async_get_profiler(hass, config_entry.entry_id)
+        self._notifier = _SectionNotifier(HISTORY_SECTIONS)
         super().__init__(
             hass,
             _LOGGER,
             config_entry=config_entry,
-            name=f"{DOMAIN}_activity",
-            update_interval=ACTIVITY_SCAN_INTERVAL,
+            name=f"{DOMAIN}_history",
+            update_interval=HISTORY_SCAN_INTERVAL,
         )
+        self.fleet.async_register("history", config_entry.entry_id)
+        config_entry.async_on_unload(
+            partial(self.fleet.async_unregister, "history", config_entry.entry_id)
+        )
+
+    async def _async_setup(self) -> None:
+        """Load the local check-in archive before the first refresh."""
+        await self.archive.async_load()
+
+    async def async_restore_snapshot(self) -> bool:
+        """Publish the archived history, returning True if there is any.
+
+        The archive already persists the history, so it serves as this
+        coordinator's snapshot.
+        """
+        # The first refresh is skipped if this succeeds, so run its setup step.
+        await self._async_setup()
+        if self.archive.newest_checkin_date is None:
+            return False
+        self.data = self._build_data(datetime.now(timezone.utc))
+        return True
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for updates to a section of the data (None for every update)."""
+        remove = super().async_add_listener(update_callback, context)
+        return self._notifier.async_add_listener(update_callback, context, remove)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the changed entities, then fire the refresh's bus events."""
+        self._notifier.async_update_listeners(self)
+        events, self._pending_events = self._pending_events, []
+        _async_fire_events(self, events)
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch and aggregate activity data."""
+        """Update data, under the profiler if a capture is running."""
+        return await self.profiler.async_profile_update(self._async_fetch())
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        """Sync the check-in archive and aggregate it."""
         now = datetime.now(timezone.utc)
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        history_start = now - timedelta(days=365)
-        week_end = now + timedelta(days=7)
+        # Only the window since the newest archived visit is requested; the
+        # full history window is fetched once, while the archive is empty.
+        # While a visit is being tracked, only today's check-ins are needed.
+        history_start = self.archive.sync_start(now)
+        if (visit_start := self.poll_scheduler.history_start(now)) is not None:
+            history_start = max(history_start, visit_start)
 
         try:
-            history_raw = await self.api_client.async_get_checkin_history(
-                history_start.strftime("%Y-%m-%dT%H:%M:%S"),
-                now.strftime("%Y-%m-%dT%H:%M:%S"),
+            history = await self.api_client.async_get_checkin_history(
+                history_start.strftime(CHECKIN_DATE_FORMAT),
+                now.strftime(CHECKIN_DATE_FORMAT),
+            )
+        except InvalidAuth as err:
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except TheGymGroupApiClientError as err:
+            self.last_error = _describe_error(err)
+            if (stale := _stale_data(self, self.api_client, err)) is not None:
+                return stale
+            if not (self._history_synced or self.archive.newest_checkin_date):
+                raise UpdateFailed(f"Error fetching check-in history: {err}") from err
+            # The archive still holds every visit synced so far, so it is
+            # published as usual and the fetch is retried sooner.
+            _LOGGER.warning(
+                "Check-in history fetch failed, using archived visits: %s", err
+            )
+            self.update_interval = min(
+                HISTORY_RETRY_INTERVAL, self.poll_scheduler.interval
+            )
+            return self._build_data(now)
+
+        self.last_error = None
+        self._history_synced = True
+        check_ins = history.get("checkIns", [])
+        events = checkin_deltas(self.archive, check_ins)
+        if self.archive.merge(check_ins):
+            await self.archive.async_save()
+            self._statistics_stale = True
+
+        data = self._build_data(now)
+        if self._statistics_stale:
+            await self.statistics.async_update(
+                self.archive.checkins, dt_util.as_local(now).date()
             )
-            schedule_raw = await self.api_client.async_get_schedule(
-                int(now.timestamp() * 1000),
-                int(week_end.timestamp() * 1000),
+            self.poll_scheduler.learn(data["checkins"].starts)
+            self._statistics_stale = False
+
+        self.stale_since = None
+        self._pending_events = events
+        self.update_interval = self.fleet.next_interval(
+            "history",
+            self.config_entry.entry_id,
+            self.poll_scheduler.update(data, now),
+            now,
+        )
+        return data
+
+    @callback
+    def async_handle_busyness(
+        self, busyness: TheGymGroupDataUpdateCoordinator
+    ) -> None:
+        """Refresh now if the gym filling up suggests the member just arrived."""
+        data = busyness.data or {}
+        now = datetime.now(timezone.utc)
+        if self.poll_scheduler.busyness_sample(data.get("currentCapacity"), now):
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self.async_request_refresh(),
+                f"{self.name} refresh on likely arrival",
             )
+
+    def _build_data(self, now: datetime) -> dict[str, Any]:
+        """Derive the published history data from the archive."""
+        return aggregate_checkins(self.archive.checkins, now)
+
+
+class TheGymGroupScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Coordinator for the member's booked classes over the coming week.
+
+    The schedule is small and changes often, so it is fetched on its own,
+    shorter cadence without downloading any check-in history.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api_client: TheGymGroupApiClient,
+    ) -> None:
+        """Initialize."""
+        self.api_client = api_client
+        # Error from the most recent fetch, or None if it succeeded.
+        self.last_error: str | None = None
+        self._schedule_raw: list[dict[str, Any]] | None = None
+        # End of the window _schedule_raw was fetched for, in epoch ms.
+        self._schedule_end_ms = 0
+        # Bus events for changes found by the last refresh, fired once its
+        # data has been published.
+        self._pending_events: list[Delta] = []
+        # When the published data started being served stale, if it is.
+        self.stale_since: datetime | None = None
+        self.snapshot = TheGymGroupSnapshot(hass, config_entry.entry_id, "schedule")
+        self.fleet = async_get_fleet_scheduler(hass)
+        self.profiler = async_get_profiler(hass, config_entry.entry_id)
+        self._notifier = _SectionNotifier(SCHEDULE_SECTIONS)
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN}_schedule",
+            update_interval=SCHEDULE_SCAN_INTERVAL,
+        )
+        self.fleet.async_register("schedule", config_entry.entry_id)
+        config_entry.async_on_unload(
+            partial(self.fleet.async_unregister, "schedule", config_entry.entry_id)
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Publish the last fetched schedule from disk, returning True if found."""
+        now = datetime.now(timezone.utc)
+        schedule = await self.snapshot.async_load(now)
+        if schedule is None:
+            return False
+        self._schedule_raw = schedule
+        assert self.snapshot.fetched_at is not None
+        self._schedule_end_ms = int(
+            (self.snapshot.fetched_at + SCHEDULE_WINDOW).timestamp() * 1000
+        )
+        self.data = _build_schedule_data(
+            _upcoming_classes(schedule, int(now.timestamp() * 1000))
+        )
+        self.stale_since = self.snapshot.fetched_at
+        return True
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for updates to a section of the data (None for every update)."""
+        remove = super().async_add_listener(update_callback, context)
+        return self._notifier.async_add_listener(update_callback, context, remove)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the changed entities, then fire the refresh's bus events."""
+        self._notifier.async_update_listeners(self)
+        events, self._pending_events = self._pending_events, []
+        _async_fire_events(self, events)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Update data, under the profiler if a capture is running."""
+        return await self.profiler.async_profile_update(self._async_fetch())
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        """Fetch the booked classes for the coming week."""
+        now = datetime.now(timezone.utc)
+        now_ms = int(now.timestamp() * 1000)
+        end_ms = int((now + SCHEDULE_WINDOW).timestamp() * 1000)
+        try:
+            schedule = await self.api_client.async_get_schedule(now_ms, end_ms)
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed(str(err)) from err
-        except CannotConnect as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        except TheGymGroupApiClientError as err:
+            self.last_error = _describe_error(err)
+            if (stale := _stale_data(self, self.api_client, err)) is not None:
+                return stale
+            if self._schedule_raw is None:
+                raise UpdateFailed(f"Error fetching schedule: {err}") from err
+            # Classes from the last schedule that haven't started yet are
+            # still published, and the fetch is retried sooner.
+            _LOGGER.warning(
+                "Schedule fetch failed, using the last known schedule: %s", err
+            )
+            self.update_interval = SCHEDULE_RETRY_INTERVAL
+            return _build_schedule_data(_upcoming_classes(self._schedule_raw, now_ms))
 
-        check_ins: list[dict[str, Any]] = history_raw.get("checkIns", [])
+        self.last_error = None
+        self._pending_events = class_deltas(
+            self._schedule_raw, self._schedule_end_ms, schedule, now_ms
+        )
+        self._schedule_raw = schedule
+        self._schedule_end_ms = end_ms
+        self.snapshot.async_update(schedule, now)
+        self.stale_since = None
+        self.update_interval = self.fleet.next_interval(
+            "schedule", self.config_entry.entry_id, SCHEDULE_SCAN_INTERVAL, now
+        )
+        return _build_schedule_data(schedule)
 
-        # Most recent entry across the full history window.
-        latest_raw = (
-            max(check_ins, key=lambda ci: ci.get("checkInDate", ""))
-            if check_ins
-            else None
+    @property
+    def classes(self) -> list[dict[str, Any]]:
+        """Return the last fetched schedule of booked classes."""
+        return self._schedule_raw or []
+
+    @callback
+    def async_merge_schedule(
+        self, start_ms: int, end_ms: int, schedule: list[dict[str, Any]]
+    ) -> None:
+        """Replace the classes starting in [start_ms, end_ms) with a newer fetch.
+
+        The class watch fetches part of the schedule more often than this
+        coordinator does. Its result is merged in and published, so the next
+        class and the calendar stay as fresh as the watch, and this
+        coordinator's next fetch is compared with it so each change is only
+        announced once. The refresh timer is left alone, so the rest of the
+        week is still fetched on schedule.
+        """
+        if self._schedule_raw is None:
+            return
+        kept = [
+            item
+            for item in self._schedule_raw
+            if not start_ms <= _class_start_ms(item) < end_ms
+        ]
+        self._schedule_raw = sorted([*kept, *schedule], key=_class_start_ms)
+        self.data = _build_schedule_data(_upcoming_classes(self._schedule_raw, start_ms))
+        self.async_update_listeners()
+
+
+def _watched_class(brief: dict[str, Any]) -> dict[str, Any]:
+    """Return what a class spots sensor shows about a booked class."""
+    instructor_info = brief.get("instructor") or {}
+    return {
+        "name": brief.get("name") or "Booked Class",
+        "start": datetime.fromtimestamp(
+            brief.get("startDateTime", 0) / 1000, tz=timezone.utc
+        ),
+        "instructor": instructor_info.get("fullName") or "",
+        "max_capacity": brief.get("maxCapacity", 0),
+        "available_spots": (
+            brief.get("maxCapacity", 0) - brief.get("totalBooked", 0)
+        ),
+    }
+
+
+class TheGymGroupClassWatchCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Coordinator watching the spots left in classes booked for soon.
+
+    Classes starting within ``CLASS_WATCH_HORIZON`` in the schedule
+    coordinator's data are polled through the schedule endpoint alone,
+    for a window ending at the last of them, and more often as the nearest
+    one approaches. The check-in history keeps its own slow cadence. The
+    data maps each watched class id to its details.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api_client: TheGymGroupApiClient,
+        schedule: TheGymGroupScheduleCoordinator,
+    ) -> None:
+        """Initialize."""
+        self.api_client = api_client
+        self.schedule = schedule
+        # When the published data started being served stale, if it is.
+        self.stale_since: datetime | None = None
+        self.fleet = async_get_fleet_scheduler(hass)
+        self.profiler = async_get_profiler(hass, config_entry.entry_id)
+        # Each class is its own section, keyed by its id.
+        self._notifier = _SectionNotifier()
+        self._pending_events: list[Delta] = []
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN}_class_watch",
+            update_interval=class_watch_interval(None),
+        )
+        self.fleet.async_register("class_watch", config_entry.entry_id)
+        config_entry.async_on_unload(
+            partial(self.fleet.async_unregister, "class_watch", config_entry.entry_id)
         )
 
-        # Monthly stats: filter to the current calendar month.
-        month_start_str = month_start.strftime("%Y-%m-%dT%H:%M:%S")
-        monthly = [ci for ci in check_ins if ci.get("checkInDate", "") >= month_start_str]
-        total_ms = sum(ci.get("duration", 0) for ci in monthly)
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for updates to a section of the data (None for every update)."""
+        remove = super().async_add_listener(update_callback, context)
+        return self._notifier.async_add_listener(update_callback, context, remove)
 
-        # Last 35 days of check-ins for dashboard history markers.
-        recent_cutoff = (now - timedelta(days=35)).strftime("%Y-%m-%dT%H:%M:%S")
-        recent_checkins = [
-            {
-                "datetime": ci["checkInDate"],
-                "duration_minutes": round(ci["duration"] / 60_000) if ci.get("duration") else None,
-            }
-            for ci in check_ins
-            if ci.get("checkInDate", "") >= recent_cutoff
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the changed classes' entities, then fire the change events."""
+        self._notifier.async_update_listeners(self)
+        events, self._pending_events = self._pending_events, []
+        _async_fire_events(self, events)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Update data, under the profiler if a capture is running."""
+        return await self.profiler.async_profile_update(self._async_fetch())
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        """Fetch the schedule up to the last class starting within the horizon."""
+        now = datetime.now(timezone.utc)
+        now_ms = int(now.timestamp() * 1000)
+        horizon_ms = int((now + CLASS_WATCH_HORIZON).timestamp() * 1000)
+        starts = [
+            start_ms
+            for item in self.schedule.classes
+            if not (item.get("brief") or {}).get("cancelled", False)
+            and now_ms <= (start_ms := _class_start_ms(item)) <= horizon_ms
         ]
+        if not starts:
+            self.stale_since = None
+            self.update_interval = class_watch_interval(None)
+            return {}
+
+        end_ms = max(starts) + 1
+        try:
+            schedule = await self.api_client.async_get_schedule(now_ms, end_ms)
+        except InvalidAuth as err:
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except CannotConnect as err:
+            if (stale := _stale_data(self, self.api_client, err)) is not None:
+                return stale
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-        # Full 365-day check-in history for the calendar entity.
-        calendar_checkins: list[dict[str, Any]] = []
-        for ci in check_ins:
-            start_dt = _parse_checkin_dt(ci)
-            if start_dt is None:
-                continue
-            dur_ms: int = ci.get("duration", 0)
-            calendar_checkins.append({
-                "start": start_dt,
-                "end": start_dt + timedelta(milliseconds=dur_ms) if dur_ms else None,
-                "gym_name": ci.get("gymLocationName") or "The Gym Group",
-            })
-
-        # All upcoming non-cancelled booked classes for the calendar entity.
-        calendar_classes: list[dict[str, Any]] = []
-        for item in schedule_raw:
-            brief = item.get("brief", {})
-            if brief.get("cancelled", False):
-                continue
-            start_ms: int = brief.get("startDateTime", 0)
-            end_ms: int = brief.get("endDateTime", 0)
-            if not start_ms:
-                continue
-            instructor_info = brief.get("instructor") or {}
-            calendar_classes.append({
-                "start": datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc),
-                "end": datetime.fromtimestamp(end_ms / 1000, tz=timezone.utc) if end_ms else None,
-                "name": brief.get("name") or "Booked Class",
-                "instructor": instructor_info.get("fullName") or "",
-            })
+        self.stale_since = None
+        previous = [
+            item
+            for item in self.schedule.classes
+            if now_ms <= _class_start_ms(item) < end_ms
+        ]
+        self._pending_events = class_deltas(previous, end_ms, schedule, now_ms)
+        self.schedule.async_merge_schedule(now_ms, end_ms, schedule)
 
-        return {
-            "latest_checkin": _parse_checkin_dt(latest_raw),
-            "latest_checkin_gym": (
-                latest_raw.get("gymLocationName") if latest_raw else None
-            ),
-            "latest_checkin_duration_minutes": (
-                round(latest_raw.get("duration", 0) / 60_000)
-                if latest_raw and latest_raw.get("duration")
-                else None
-            ),
-            "checkin_history": recent_checkins,
-            "calendar_checkins": calendar_checkins,
-            "calendar_classes": calendar_classes,
-            "monthly_visits": len(monthly),
-            "monthly_hours": round(total_ms / 3_600_000, 1),
-            "next_class": _find_next_class(schedule_raw),
+        watched = {
+            brief["id"]: _watched_class(brief)
+            for item in schedule
+            if (brief := item.get("brief") or {}).get("id")
+            and not brief.get("cancelled", False)
+            and _class_start_ms(item) >= now_ms
         }
+        nearest = min(
+            (watched_class["start"] for watched_class in watched.values()),
+            default=None,
+        )
+        self.update_interval = self.fleet.next_interval(
+            "class_watch",
+            self.config_entry.entry_id,
+            class_watch_interval(nearest - now if nearest else None),
+            now,
+        )
+        return watched
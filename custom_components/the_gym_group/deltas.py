@@ -0,0 +1,132 @@
+"""Changes between consecutive activity refreshes, as bus events.
+
+Each refresh is compared with what the previous one saw: check-ins by their
+``checkInDate`` and booked classes by their id. Only the fetched window is
+compared, not the whole history, so the work per refresh grows with the
+number of changes rather than with the size of the archive.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from .aggregation import parse_checkin_dt
+from .archive import TheGymGroupCheckinArchive
+from .const import (
+    EVENT_CHECKED_IN,
+    EVENT_CLASS_BOOKED,
+    EVENT_CLASS_CANCELLED,
+    EVENT_CLASS_SPOTS_CHANGED,
+    EVENT_VISIT_FINISHED,
+)
+
+# An event to fire: its type and its data.
+type Delta = tuple[str, dict[str, Any]]
+
+
+def _checkin_event_data(raw: dict[str, Any]) -> dict[str, Any]:
+    """Return the event data describing a check-in."""
+    start = parse_checkin_dt(raw)
+    duration_ms = raw.get("duration")
+    return {
+        "check_in": start.isoformat() if start else raw.get("checkInDate"),
+        "gym_name": raw.get("gymLocationName"),
+        "duration_minutes": round(duration_ms / 60_000) if duration_ms else None,
+    }
+
+
+def checkin_deltas(
+    archive: TheGymGroupCheckinArchive, check_ins: list[dict[str, Any]]
+) -> list[Delta]:
+    """Return events for fetched check-ins that are new or newly finished.
+
+    Must be called before the check-ins are merged into the archive. Nothing
+    is reported while the archive is empty, so the first sync does not
+    announce a year of visits.
+    """
+    if archive.newest_checkin_date is None:
+        return []
+    deltas: list[Delta] = []
+    for raw in check_ins:
+        key = raw.get("checkInDate")
+        if not key:
+            continue
+        archived = archive.get(raw)
+        if archived is None:
+            deltas.append((EVENT_CHECKED_IN, _checkin_event_data(raw)))
+        elif archived.duration_ms:
+            continue
+        # The server fills in the duration once the member has left.
+        if raw.get("duration"):
+            deltas.append((EVENT_VISIT_FINISHED, _checkin_event_data(raw)))
+    return deltas
+
+
+def _available_spots(brief: dict[str, Any]) -> int:
+    """Return how many spots a class has left."""
+    return brief.get("maxCapacity", 0) - brief.get("totalBooked", 0)
+
+
+def _class_event_data(brief: dict[str, Any]) -> dict[str, Any]:
+    """Return the event data describing a booked class."""
+    start = datetime.fromtimestamp(brief.get("startDateTime", 0) / 1000, timezone.utc)
+    instructor_info = brief.get("instructor") or {}
+    return {
+        "class_id": brief["id"],
+        "name": brief.get("name") or "Booked Class",
+        "start": start.isoformat(),
+        "instructor": instructor_info.get("fullName") or "",
+        "available_spots": _available_spots(brief),
+    }
+
+
+def _classes_by_id(schedule: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Return the ``brief`` of each class in a schedule, keyed by its id."""
+    briefs = (item.get("brief") or {} for item in schedule)
+    return {brief["id"]: brief for brief in briefs if brief.get("id")}
+
+
+def class_deltas(
+    previous: list[dict[str, Any]] | None,
+    previous_end_ms: int,
+    current: list[dict[str, Any]],
+    now_ms: int,
+) -> list[Delta]:
+    """Return events for classes booked, cancelled or with changed spots.
+
+    ``previous`` is the schedule the last refresh fetched (None if there was
+    none, in which case nothing is reported), covering classes starting up
+    to ``previous_end_ms``. A class the previous schedule could not have
+    held, because it starts after that, has only come into the window, so it
+    is not reported as booked. A class that disappears from the schedule
+    before it starts was cancelled or unbooked; one that has started simply
+    falls out of the fetched window.
+    """
+    if previous is None:
+        return []
+    before = _classes_by_id(previous)
+    after = _classes_by_id(current)
+    deltas: list[Delta] = []
+    for class_id, brief in after.items():
+        old = before.get(class_id)
+        cancelled = brief.get("cancelled", False)
+        if old is None and brief.get("startDateTime", 0) >= previous_end_ms:
+            continue
+        if old is None or old.get("cancelled", False):
+            if not cancelled:
+                deltas.append((EVENT_CLASS_BOOKED, _class_event_data(brief)))
+        elif cancelled:
+            deltas.append((EVENT_CLASS_CANCELLED, _class_event_data(brief)))
+        elif (previous_spots := _available_spots(old)) != _available_spots(brief):
+            data = _class_event_data(brief)
+            data["previous_available_spots"] = previous_spots
+            deltas.append((EVENT_CLASS_SPOTS_CHANGED, data))
+    for class_id, old in before.items():
+        if (
+            class_id not in after
+            and not old.get("cancelled", False)
+            and old.get("startDateTime", 0) > now_ms
+        ):
+            deltas.append((EVENT_CLASS_CANCELLED, _class_event_data(old)))
+    return deltas
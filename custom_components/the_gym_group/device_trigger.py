@@ -10,8 +10,13 @@ from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEM
 from homeassistant.components.device_automation.exceptions import (
     InvalidDeviceAutomationConfig,
 )
-from homeassistant.components.homeassistant.triggers import numeric_state, state
+from homeassistant.components.homeassistant.triggers import (
+    event as event_trigger,
+    numeric_state,
+    state,
+)
 from homeassistant.const import (
+    ATTR_CONFIG_ENTRY_ID,
     CONF_ABOVE,
     CONF_BELOW,
     CONF_DEVICE_ID,
@@ -26,21 +31,51 @@ from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
 from homeassistant.helpers.typing import ConfigType
 
-from .const import BUSYNESS_TRANSLATION_KEY, DOMAIN, STATUS_TRANSLATION_KEY
+from .const import (
+    BUSYNESS_TRANSLATION_KEY,
+    DOMAIN,
+    EVENT_CHECKED_IN,
+    EVENT_CLASS_BOOKED,
+    EVENT_CLASS_CANCELLED,
+    EVENT_CLASS_SPOTS_CHANGED,
+    EVENT_VISIT_FINISHED,
+    LAST_CHECKIN_TRANSLATION_KEY,
+    NEXT_CLASS_TRANSLATION_KEY,
+    STATUS_TRANSLATION_KEY,
+)
 
 TRIGGER_CAPACITY_ABOVE = "capacity_above"
 TRIGGER_CAPACITY_BELOW = "capacity_below"
 TRIGGER_STATUS_OPEN = "status_open"
 TRIGGER_STATUS_CLOSED = "status_closed"
+TRIGGER_CHECKED_IN = "checked_in"
+TRIGGER_VISIT_FINISHED = "visit_finished"
+TRIGGER_CLASS_BOOKED = "class_booked"
+TRIGGER_CLASS_CANCELLED = "class_cancelled"
+TRIGGER_CLASS_SPOTS_CHANGED = "class_spots_changed"
+
+# Sensors whose presence means the device has activity data to trigger on.
+ACTIVITY_TRANSLATION_KEYS = {LAST_CHECKIN_TRANSLATION_KEY, NEXT_CLASS_TRANSLATION_KEY}
 
 NUMERIC_TRIGGER_TYPES = {TRIGGER_CAPACITY_ABOVE, TRIGGER_CAPACITY_BELOW}
 STATE_TRIGGER_TYPES = {TRIGGER_STATUS_OPEN, TRIGGER_STATUS_CLOSED}
-TRIGGER_TYPES = NUMERIC_TRIGGER_TYPES | STATE_TRIGGER_TYPES
+# Device-level triggers fired by the history and schedule coordinators' events.
+EVENT_TRIGGER_TYPES = {
+    TRIGGER_CHECKED_IN: EVENT_CHECKED_IN,
+    TRIGGER_VISIT_FINISHED: EVENT_VISIT_FINISHED,
+    TRIGGER_CLASS_BOOKED: EVENT_CLASS_BOOKED,
+    TRIGGER_CLASS_CANCELLED: EVENT_CLASS_CANCELLED,
+    TRIGGER_CLASS_SPOTS_CHANGED: EVENT_CLASS_SPOTS_CHANGED,
+}
+TRIGGER_TYPES = NUMERIC_TRIGGER_TYPES | STATE_TRIGGER_TYPES | set(EVENT_TRIGGER_TYPES)
 
 TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
     {
         vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
-        vol.Required(CONF_ENTITY_ID): cv.entity_id,
+        vol.Optional(CONF_ENTITY_ID): cv.entity_id,
+        # Event triggers only: the account whose events fire them. Accounts
+        # at the same gym share its device, so the device alone can't tell.
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
         vol.Optional(CONF_ABOVE): vol.Coerce(int),
         vol.Optional(CONF_BELOW): vol.Coerce(int),
     }
@@ -52,12 +87,18 @@ async def async_validate_trigger_config(
 ) -> ConfigType:
     """Validate trigger config.
 
-    Ensures a threshold is supplied for numeric trigger types. HA calls this
-    before ``async_attach_trigger`` when the integration exposes it.
+    Ensures entity triggers name their entity and numeric trigger types have
+    a threshold. HA calls this before ``async_attach_trigger`` when the
+    integration exposes it.
     """
     config = TRIGGER_SCHEMA(config)
     trigger_type = config[CONF_TYPE]
 
+    if trigger_type not in EVENT_TRIGGER_TYPES and CONF_ENTITY_ID not in config:
+        raise InvalidDeviceAutomationConfig(
+            f"'{CONF_ENTITY_ID}' is required for trigger type '{trigger_type}'"
+        )
+
     if trigger_type == TRIGGER_CAPACITY_ABOVE and CONF_ABOVE not in config:
         raise InvalidDeviceAutomationConfig(
             f"'{CONF_ABOVE}' is required for trigger type '{trigger_type}'"
@@ -76,6 +117,8 @@ async def async_get_triggers(
     """List device triggers for The Gym Group devices."""
     registry = er.async_get(hass)
     triggers: list[dict[str, Any]] = []
+    # Config entries (accounts) with activity sensors on the device.
+    activity_entry_ids: dict[str | None, None] = {}
 
     for entry in er.async_entries_for_device(registry, device_id):
         if entry.domain != Platform.SENSOR:
@@ -94,6 +137,22 @@ async def async_get_triggers(
         elif entry.translation_key == STATUS_TRANSLATION_KEY:
             triggers.append({**base, CONF_TYPE: TRIGGER_STATUS_OPEN})
             triggers.append({**base, CONF_TYPE: TRIGGER_STATUS_CLOSED})
+        elif entry.translation_key in ACTIVITY_TRANSLATION_KEYS:
+            activity_entry_ids[entry.config_entry_id] = None
+
+    # Activity events belong to an account rather than to one of its
+    # entities, so each account on the device gets its own set of triggers.
+    for config_entry_id in activity_entry_ids:
+        base = {
+            CONF_PLATFORM: "device",
+            CONF_DEVICE_ID: device_id,
+            CONF_DOMAIN: DOMAIN,
+        }
+        if config_entry_id is not None:
+            base[ATTR_CONFIG_ENTRY_ID] = config_entry_id
+        triggers.extend(
+            {**base, CONF_TYPE: trigger_type} for trigger_type in EVENT_TRIGGER_TYPES
+        )
 
     return triggers
 
@@ -106,8 +165,23 @@ async def async_attach_trigger(
 ) -> CALLBACK_TYPE:
     """Attach a trigger by delegating to the built-in trigger platforms."""
     trigger_type = config[CONF_TYPE]
-    entity_id = config[CONF_ENTITY_ID]
 
+    if trigger_type in EVENT_TRIGGER_TYPES:
+        event_data = {CONF_DEVICE_ID: config[CONF_DEVICE_ID]}
+        if ATTR_CONFIG_ENTRY_ID in config:
+            event_data[ATTR_CONFIG_ENTRY_ID] = config[ATTR_CONFIG_ENTRY_ID]
+        event_config = event_trigger.TRIGGER_SCHEMA(
+            {
+                event_trigger.CONF_PLATFORM: "event",
+                event_trigger.CONF_EVENT_TYPE: EVENT_TRIGGER_TYPES[trigger_type],
+                event_trigger.CONF_EVENT_DATA: event_data,
+            }
+        )
+        return await event_trigger.async_attach_trigger(
+            hass, event_config, action, trigger_info, platform_type="device"
+        )
+
+    entity_id = config[CONF_ENTITY_ID]
     if trigger_type in NUMERIC_TRIGGER_TYPES:
         threshold_key = (
             CONF_ABOVE if trigger_type == TRIGGER_CAPACITY_ABOVE else CONF_BELOW
@@ -20,9 +20,50 @@ async def async_get_config_entry_diagnostics(
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     runtime_data = entry.runtime_data
+    login_gate = runtime_data.busyness.api_client.login_gate
+    history_data = runtime_data.history.data or {}
+    if (checkins := history_data.get("checkins")) is not None:
+        history_data = {**history_data, "checkins": checkins.as_dict()}
 
     return {
         "config_entry": async_redact_data(entry.as_dict(), TO_REDACT),
         "busyness_data": runtime_data.busyness.data or {},
-        "activity_data": runtime_data.activity.data or {},
+        "busyness_polling": runtime_data.busyness.poll_scheduler.as_dict(),
+        "history_data": history_data,
+        "history_polling": runtime_data.history.poll_scheduler.as_dict(),
+        "schedule_data": runtime_data.schedule.data or {},
+        "last_errors": {
+            "history": runtime_data.history.last_error,
+            "schedule": runtime_data.schedule.last_error,
+        },
+        "class_watch_data": runtime_data.class_watch.data or {},
+        "snapshots": {
+            "busyness": runtime_data.busyness.snapshot.as_dict(),
+            "schedule": runtime_data.schedule.snapshot.as_dict(),
+        },
+        "busyness_hub": runtime_data.busyness.hub.gym_info(
+            runtime_data.busyness.gym_id
+        ),
+        "fleet": {
+            **runtime_data.busyness.fleet.as_dict(),
+            "phases": {
+                group: runtime_data.busyness.fleet.phase(group, entry.entry_id)
+                for group in ("busyness", "history", "schedule", "class_watch")
+            },
+        },
+        "api_metrics": runtime_data.busyness.api_client.metrics.as_dict(),
+        "circuit_breaker": (
+            runtime_data.busyness.api_client.circuit_breaker.as_dict()
+        ),
+        "stale_since": {
+            "busyness": runtime_data.busyness.stale_since,
+            "history": runtime_data.history.stale_since,
+            "schedule": runtime_data.schedule.stale_since,
+            "class_watch": runtime_data.class_watch.stale_since,
+        },
+        "profiling": runtime_data.busyness.profiler.as_dict(),
+        "logins": {
+            "performed": login_gate.logins_performed,
+            "avoided": login_gate.logins_avoided,
+        },
     }
@@ -0,0 +1,216 @@
+"""Poll staggering and request limits shared by every entry."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import (
+    DOMAIN,
+    FLEET_BURST,
+    FLEET_MAX_IN_FLIGHT_PER_HOST,
+    FLEET_REQUESTS_PER_SECOND,
+)
+
+DATA_FLEET_SCHEDULER: HassKey[TheGymGroupFleetScheduler] = HassKey(
+    f"{DOMAIN}_fleet_scheduler"
+)
+
+
+@callback
+def async_get_fleet_scheduler(hass: HomeAssistant) -> TheGymGroupFleetScheduler:
+    """Return the hass-wide fleet scheduler, creating it on first use."""
+    if (scheduler := hass.data.get(DATA_FLEET_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_FLEET_SCHEDULER] = TheGymGroupFleetScheduler()
+    return scheduler
+
+
+class _TokenBucket:
+    """A token bucket whose waiters are served in arrival order."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Return the tokens currently available."""
+        return min(
+            self.burst, self._tokens + (time.monotonic() - self._updated) * self.rate
+        )
+
+    async def async_acquire(self) -> None:
+        """Take one token, waiting for the bucket to refill if it is empty."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class _Host:
+    """Request slots and queue statistics for one API host."""
+
+    semaphore: asyncio.Semaphore
+    queued: int = 0
+    in_flight: int = 0
+    requests: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the host's queue state for diagnostics."""
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "mean_wait_ms": (
+                round(self.total_wait / self.requests * 1000, 1)
+                if self.requests
+                else 0.0
+            ),
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+@dataclass
+class _Group:
+    """The poll phase keys of the coordinators of one kind."""
+
+    # Owner (entry ID) -> phase key. Owners with the same key share a phase.
+    keys: dict[str, str] = field(default_factory=dict)
+
+    def phase(self, key: str) -> float:
+        """Return the key's offset as a fraction of the poll interval."""
+        distinct = sorted(set(self.keys.values()))
+        if key not in distinct:
+            return 0.0
+        return distinct.index(key) / len(distinct)
+
+
+class TheGymGroupFleetScheduler:
+    """Stagger polls and throttle API requests across every entry.
+
+    Each coordinator kind (busyness, history, ...) forms a group in which every
+    distinct phase key is given an evenly spaced offset into the poll
+    interval, and polls are aligned to that offset on the wall clock. Entries
+    restarted together therefore drift apart after their first refresh rather
+    than polling in lockstep forever. Busyness coordinators use their gym as
+    the key, so entries sharing a fetch through the busyness hub stay aligned.
+
+    Separately, every HTTP request waits for one of a fixed number of slots
+    for its host and then for a token from a bucket shared by all hosts, which
+    smooths the burst of first refreshes at startup.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_flight_per_host: int = FLEET_MAX_IN_FLIGHT_PER_HOST,
+        requests_per_second: float = FLEET_REQUESTS_PER_SECOND,
+        burst: int = FLEET_BURST,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._max_in_flight = max_in_flight_per_host
+        self._bucket = _TokenBucket(requests_per_second, burst)
+        self._hosts: dict[str, _Host] = {}
+        self._groups: dict[str, _Group] = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "max_in_flight_per_host": self._max_in_flight,
+            "requests_per_second": self._bucket.rate,
+            "burst": self._bucket.burst,
+            "hosts": {host: state.as_dict() for host, state in self._hosts.items()},
+            "groups": {
+                name: len(set(group.keys.values()))
+                for name, group in self._groups.items()
+            },
+        }
+
+    def phase(self, group: str, owner: str) -> float | None:
+        """Return an owner's poll offset as a fraction of its interval."""
+        if (members := self._groups.get(group)) is None or owner not in members.keys:
+            return None
+        return members.phase(members.keys[owner])
+
+    @callback
+    def async_register(self, group: str, owner: str, key: str | None = None) -> None:
+        """Add an owner to a group, or move it to a new phase key."""
+        self._groups.setdefault(group, _Group()).keys[owner] = key or owner
+
+    @callback
+    def async_unregister(self, group: str, owner: str) -> None:
+        """Remove an owner from a group."""
+        if (members := self._groups.get(group)) is None:
+            return
+        members.keys.pop(owner, None)
+        if not members.keys:
+            del self._groups[group]
+
+    def next_interval(
+        self, group: str, owner: str, interval: timedelta, now: datetime
+    ) -> timedelta:
+        """Return the delay until the owner's next poll point.
+
+        Poll points are ``interval`` apart and offset by the owner's phase, so
+        the delay is between half and one and a half intervals; on average it
+        still equals ``interval``.
+        """
+        period = interval.total_seconds()
+        if period <= 0 or (phase := self.phase(group, owner)) is None:
+            return interval
+        delay = (phase * period - now.timestamp()) % period
+        if delay < period / 2:
+            delay += period
+        return timedelta(seconds=delay)
+
+    @asynccontextmanager
+    async def async_request_slot(self, host: str) -> AsyncIterator[None]:
+        """Hold a request slot for the host for the duration of a request."""
+        if (state := self._hosts.get(host)) is None:
+            state = self._hosts[host] = _Host(
+                asyncio.Semaphore(self._max_in_flight)
+            )
+        started = time.monotonic()
+        state.queued += 1
+        try:
+            await state.semaphore.acquire()
+            try:
+                await self._bucket.async_acquire()
+            except BaseException:
+                state.semaphore.release()
+                raise
+        finally:
+            state.queued -= 1
+
+        waited = time.monotonic() - started
+        state.requests += 1
+        state.total_wait += waited
+        state.max_wait = max(state.max_wait, waited)
+        state.in_flight += 1
+        try:
+            yield
+        finally:
+            state.in_flight -= 1
+            state.semaphore.release()
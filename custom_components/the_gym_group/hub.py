@@ -0,0 +1,164 @@
+"""Busyness fetches shared by every entry whose account uses the same gym."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .api import InvalidAuth
+from .const import BUSYNESS_HUB_MAX_AGE, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import TheGymGroupDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_BUSYNESS_HUB: HassKey[TheGymGroupBusynessHub] = HassKey(f"{DOMAIN}_busyness_hub")
+
+
+@dataclass
+class _Gym:
+    """The busyness coordinators subscribed to one gym."""
+
+    members: list[TheGymGroupDataUpdateCoordinator] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Monotonic time and payload of the last successful fetch.
+    last_fetch: tuple[float, dict[str, Any]] | None = None
+    upstream_fetches: int = 0
+    fetches_avoided: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the gym's sharing state for diagnostics."""
+        return {
+            "members": len(self.members),
+            "upstream_fetches": self.upstream_fetches,
+            "fetches_avoided": self.fetches_avoided,
+        }
+
+
+@callback
+def async_get_busyness_hub(hass: HomeAssistant) -> TheGymGroupBusynessHub:
+    """Return the hass-wide busyness hub, creating it on first use."""
+    if (hub := hass.data.get(DATA_BUSYNESS_HUB)) is None:
+        hub = hass.data[DATA_BUSYNESS_HUB] = TheGymGroupBusynessHub()
+    return hub
+
+
+class TheGymGroupBusynessHub:
+    """One busyness fetch per gym, fanned out to every subscribed entry.
+
+    The busyness endpoint is per account, but it returns the account's home
+    gym, so every account with the same ``gymLocationId`` gets the same
+    payload. Coordinators subscribe under their gym after their first fetch.
+    From then on, whichever coordinator's timer fires first fetches for the
+    gym and pushes the result to the others, which also resets their timers.
+    If its account's session is rejected, the fetch is retried with the other
+    members' accounts before giving up.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the hub."""
+        self._gyms: dict[str, _Gym] = {}
+
+    def gym_info(self, gym_id: str | None) -> dict[str, Any] | None:
+        """Return diagnostics for a gym, if anything is subscribed to it."""
+        gym = self._gyms.get(gym_id) if gym_id is not None else None
+        return gym.as_dict() if gym is not None else None
+
+    @callback
+    def async_subscribe(
+        self, coordinator: TheGymGroupDataUpdateCoordinator, data: dict[str, Any]
+    ) -> None:
+        """Subscribe a coordinator to the gym in its latest payload."""
+        gym_id = data.get("gymLocationId")
+        gym_id = str(gym_id) if gym_id is not None else None
+        if gym_id == coordinator.gym_id:
+            return
+        self.async_unsubscribe(coordinator)
+        coordinator.gym_id = gym_id
+        if gym_id is not None:
+            self._gyms.setdefault(gym_id, _Gym()).members.append(coordinator)
+
+    @callback
+    def async_unsubscribe(self, coordinator: TheGymGroupDataUpdateCoordinator) -> None:
+        """Remove a coordinator from its gym, forgetting the gym if now unused."""
+        gym_id = coordinator.gym_id
+        if gym_id is None or (gym := self._gyms.get(gym_id)) is None:
+            return
+        if coordinator in gym.members:
+            gym.members.remove(coordinator)
+        if not gym.members:
+            del self._gyms[gym_id]
+        coordinator.gym_id = None
+
+    async def async_fetch(
+        self, coordinator: TheGymGroupDataUpdateCoordinator
+    ) -> dict[str, Any]:
+        """Return current busyness for the coordinator's gym.
+
+        Raises:
+            InvalidAuth: every member account's session was rejected.
+            CannotConnect: the API could not be reached.
+        """
+        gym_id = coordinator.gym_id
+        if gym_id is None or (gym := self._gyms.get(gym_id)) is None:
+            data = await coordinator.api_client.async_get_busyness()
+            self.async_subscribe(coordinator, data)
+            if (gym := self._gyms.get(coordinator.gym_id or "")) is not None:
+                gym.upstream_fetches += 1
+            return data
+
+        async with gym.lock:
+            if (
+                gym.last_fetch is not None
+                and time.monotonic() - gym.last_fetch[0]
+                < BUSYNESS_HUB_MAX_AGE.total_seconds()
+            ):
+                # Another member fetched moments ago (or while we waited for
+                # the lock) and has already pushed the result to us.
+                gym.fetches_avoided += 1
+                return gym.last_fetch[1]
+            data = await self._async_fetch_with_failover(coordinator, gym)
+            gym.upstream_fetches += 1
+            if str(data.get("gymLocationId")) != gym_id:
+                # The account's home gym changed; nothing to share.
+                self.async_subscribe(coordinator, data)
+                return data
+            gym.last_fetch = (time.monotonic(), data)
+
+        for member in list(gym.members):
+            if member is not coordinator:
+                member.config_entry.async_create_task(
+                    member.hass,
+                    member.async_handle_shared_data(data),
+                    f"{DOMAIN} shared busyness update",
+                )
+        return data
+
+    async def _async_fetch_with_failover(
+        self, coordinator: TheGymGroupDataUpdateCoordinator, gym: _Gym
+    ) -> dict[str, Any]:
+        """Fetch with the coordinator's account, then the other members'."""
+        try:
+            return await coordinator.api_client.async_get_busyness()
+        except InvalidAuth as err:
+            for member in gym.members:
+                if member is coordinator:
+                    continue
+                try:
+                    data = await member.api_client.async_get_busyness()
+                except InvalidAuth:
+                    continue
+                _LOGGER.warning(
+                    "Busyness fetch was rejected (%s); used another account "
+                    "for the same gym instead",
+                    err,
+                )
+                return data
+            raise
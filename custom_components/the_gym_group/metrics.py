@@ -0,0 +1,220 @@
+"""Per-endpoint request metrics for the API client."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+ENDPOINT_LOGIN = "login"
+ENDPOINT_BUSYNESS = "busyness"
+ENDPOINT_HISTORY = "history"
+ENDPOINT_SCHEDULE = "schedule"
+ENDPOINTS = (ENDPOINT_LOGIN, ENDPOINT_BUSYNESS, ENDPOINT_HISTORY, ENDPOINT_SCHEDULE)
+
+# Upper bounds of the histogram buckets; each histogram also has an overflow
+# bucket for values above the last bound.
+TIME_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+SIZE_BOUNDS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class _Histogram:
+    """Counts of observed values in fixed buckets."""
+
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize an empty histogram."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    @property
+    def count(self) -> int:
+        """Return the number of observed values."""
+        return sum(self.counts)
+
+    def add(self, value: float) -> None:
+        """Record one observed value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile, interpolating linearly within its bucket.
+
+        Values in the overflow bucket are reported as the last bound.
+        """
+        if not (count := self.count):
+            return None
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if index == len(self.bounds):
+                    return float(self.bounds[-1])
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return float(self.bounds[-1])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        count = self.count
+        p50 = self.quantile(0.5)
+        p95 = self.quantile(0.95)
+        return {
+            "count": count,
+            "mean": round(self.total / count, 1) if count else None,
+            "p50": None if p50 is None else round(p50, 1),
+            "p95": None if p95 is None else round(p95, 1),
+            "buckets": list(self.counts),
+        }
+
+
+@dataclass
+class _EndpointMetrics:
+    """Everything recorded for one endpoint."""
+
+    latency_ms: _Histogram = field(default_factory=lambda: _Histogram(TIME_BOUNDS_MS))
+    dns_ms: _Histogram = field(default_factory=lambda: _Histogram(TIME_BOUNDS_MS))
+    # aiohttp reports one connection phase, covering the DNS lookup, TCP and
+    # TLS; subtract dns_ms to see the TCP and TLS setup time.
+    connect_ms: _Histogram = field(default_factory=lambda: _Histogram(TIME_BOUNDS_MS))
+    decode_ms: _Histogram = field(default_factory=lambda: _Histogram(TIME_BOUNDS_MS))
+    response_bytes: _Histogram = field(
+        default_factory=lambda: _Histogram(SIZE_BOUNDS_BYTES)
+    )
+    # HTTP status (or "error" for transport failures) -> count.
+    statuses: Counter[str] = field(default_factory=Counter)
+    relogins: int = 0
+    retries: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the endpoint's metrics for diagnostics."""
+        return {
+            "latency_ms": self.latency_ms.as_dict(),
+            "dns_ms": self.dns_ms.as_dict(),
+            "connect_ms": self.connect_ms.as_dict(),
+            "decode_ms": self.decode_ms.as_dict(),
+            "response_bytes": self.response_bytes.as_dict(),
+            "statuses": dict(sorted(self.statuses.items())),
+            "relogins": self.relogins,
+            "retries": self.retries,
+        }
+
+
+class TheGymGroupRequestMetrics:
+    """Latency, size and outcome metrics for each API endpoint.
+
+    The client records whole-request latency, response size, JSON decode
+    time and outcomes itself. DNS and connection setup times come from
+    aiohttp trace hooks, so ``trace_config`` must be passed to the client's
+    session, and requests must pass ``trace_request_ctx`` from
+    ``trace_context`` to tie those phases to an endpoint.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics and the trace hooks."""
+        self._endpoints: dict[str, _EndpointMetrics] = {}
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        self.trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        self.trace_config.on_connection_create_start.append(self._on_connect_start)
+        self.trace_config.on_connection_create_end.append(self._on_connect_end)
+
+    def endpoint(self, name: str) -> _EndpointMetrics:
+        """Return the metrics for an endpoint, creating them on first use."""
+        if (metrics := self._endpoints.get(name)) is None:
+            metrics = self._endpoints[name] = _EndpointMetrics()
+        return metrics
+
+    def latency_quantile(self, name: str, q: float) -> float | None:
+        """Return an estimated latency quantile for an endpoint in ms."""
+        if (metrics := self._endpoints.get(name)) is None:
+            return None
+        return metrics.latency_ms.quantile(q)
+
+    def response_count(self, name: str) -> int:
+        """Return how many responses an endpoint's latencies are based on."""
+        if (metrics := self._endpoints.get(name)) is None:
+            return 0
+        return metrics.latency_ms.count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every endpoint's metrics, with the bucket bounds, for diagnostics."""
+        return {
+            "time_bounds_ms": list(TIME_BOUNDS_MS),
+            "size_bounds_bytes": list(SIZE_BOUNDS_BYTES),
+            "endpoints": {
+                name: self._endpoints[name].as_dict()
+                for name in ENDPOINTS
+                if name in self._endpoints
+            },
+        }
+
+    @staticmethod
+    def trace_context(endpoint: str) -> SimpleNamespace:
+        """Return the ``trace_request_ctx`` to pass with a request."""
+        return SimpleNamespace(endpoint=endpoint)
+
+    def record_response(
+        self,
+        endpoint: str,
+        status: int,
+        latency: float,
+        size: int | None = None,
+        decode_seconds: float | None = None,
+    ) -> None:
+        """Record a response, with its latency (up to the body being read)."""
+        metrics = self.endpoint(endpoint)
+        metrics.latency_ms.add(latency * 1000)
+        metrics.statuses[str(status)] += 1
+        if size is not None:
+            metrics.response_bytes.add(size)
+        if decode_seconds is not None:
+            metrics.decode_ms.add(decode_seconds * 1000)
+
+    def record_error(self, endpoint: str) -> None:
+        """Record a request that failed without a response."""
+        self.endpoint(endpoint).statuses["error"] += 1
+
+    def _phase_endpoint(self, trace_config_ctx: SimpleNamespace) -> str | None:
+        """Return the endpoint a traced request was tagged with, if any."""
+        request_ctx = trace_config_ctx.trace_request_ctx
+        return getattr(request_ctx, "endpoint", None)
+
+    async def _on_dns_start(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Note when a DNS lookup started."""
+        ctx.dns_started = time.monotonic()
+
+    async def _on_connect_start(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Note when opening a connection started (DNS lookup included)."""
+        ctx.connect_started = time.monotonic()
+
+    async def _on_dns_end(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Record how long a DNS lookup took."""
+        if (endpoint := self._phase_endpoint(ctx)) is not None:
+            self.endpoint(endpoint).dns_ms.add(
+                (time.monotonic() - ctx.dns_started) * 1000
+            )
+
+    async def _on_connect_end(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Record how long opening a connection (DNS, TCP and TLS) took."""
+        if (endpoint := self._phase_endpoint(ctx)) is not None:
+            self.endpoint(endpoint).connect_ms.add(
+                (time.monotonic() - ctx.connect_started) * 1000
+            )
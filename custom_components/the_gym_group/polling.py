@@ -0,0 +1,246 @@
+"""Adaptive poll intervals for the busyness and history coordinators."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BUSYNESS_CHANGING_RATE,
+    BUSYNESS_MAX_INTERVAL,
+    BUSYNESS_MIN_INTERVAL,
+    BUSYNESS_OPENING_LEAD,
+    BUSYNESS_STABLE_DELTA,
+    BUSYNESS_STABLE_INTERVAL,
+    BUSYNESS_STABLE_SAMPLES,
+    CLASS_WATCH_IDLE_INTERVAL,
+    CLASS_WATCH_INTERVALS,
+    HISTORY_SCAN_INTERVAL,
+    HISTORY_VISIT_INTERVAL,
+    SCAN_INTERVAL,
+    VISIT_TRACKING_MAX,
+    VISIT_USUAL_MIN_VISITS,
+    VISIT_WATCH_PERIOD,
+)
+
+REASON_DEFAULT = "default"
+REASON_CLOSED = "closed"
+REASON_OPENING_SOON = "opening_soon"
+REASON_CHANGING = "occupancy_changing"
+REASON_STABLE = "occupancy_stable"
+REASON_VISIT_IN_PROGRESS = "visit_in_progress"
+REASON_ARRIVAL_LIKELY = "arrival_likely"
+
+
+class AdaptivePollScheduler:
+    """Pick the next busyness poll interval from the latest sample.
+
+    Polls back off to ``BUSYNESS_MAX_INTERVAL`` while the gym is closed and
+    to ``BUSYNESS_STABLE_INTERVAL`` while occupancy is flat, and speed up to
+    ``BUSYNESS_MIN_INTERVAL`` while occupancy is moving quickly or the gym is
+    about to open. The opening time is learned per weekday from observed
+    closed -> open transitions, as the API doesn't report opening hours.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler at the default interval."""
+        self.interval: timedelta = SCAN_INTERVAL
+        self.reason = REASON_DEFAULT
+        self._last_sample: tuple[datetime, int] | None = None
+        self._last_status: str | None = None
+        self._stable_samples = 0
+        # Weekday (0 = Monday) -> minutes after local midnight of the first
+        # sample seen open that day.
+        self._opening_minutes: dict[int, int] = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "interval_seconds": self.interval.total_seconds(),
+            "reason": self.reason,
+            "stable_samples": self._stable_samples,
+            "learned_opening_minutes": dict(sorted(self._opening_minutes.items())),
+        }
+
+    def update(self, data: dict[str, Any], now: datetime) -> timedelta:
+        """Record a busyness sample and return the interval until the next poll."""
+        status = data.get("status")
+        capacity = data.get("currentCapacity")
+        local_now = dt_util.as_local(now)
+
+        if status == "closed":
+            self._last_sample = None
+            self._stable_samples = 0
+            interval, reason = self._closed_interval(local_now)
+        else:
+            if self._last_status == "closed":
+                self._opening_minutes[local_now.weekday()] = (
+                    local_now.hour * 60 + local_now.minute
+                )
+            interval, reason = self._open_interval(now, capacity)
+
+        self._last_status = status
+        self.interval = max(BUSYNESS_MIN_INTERVAL, min(BUSYNESS_MAX_INTERVAL, interval))
+        self.reason = reason
+        return self.interval
+
+    def _closed_interval(self, local_now: datetime) -> tuple[timedelta, str]:
+        """Return the interval while closed: long, unless opening is near."""
+        opening_minutes = self._opening_minutes.get(local_now.weekday())
+        if opening_minutes is None:
+            return BUSYNESS_MAX_INTERVAL, REASON_CLOSED
+        opening = local_now.replace(
+            hour=opening_minutes // 60,
+            minute=opening_minutes % 60,
+            second=0,
+            microsecond=0,
+        )
+        until_lead = opening - BUSYNESS_OPENING_LEAD - local_now
+        if until_lead <= timedelta(0) and local_now <= opening + BUSYNESS_OPENING_LEAD:
+            return BUSYNESS_MIN_INTERVAL, REASON_OPENING_SOON
+        if timedelta(0) < until_lead < BUSYNESS_MAX_INTERVAL:
+            # Wake up exactly when the pre-opening window starts.
+            return until_lead, REASON_CLOSED
+        return BUSYNESS_MAX_INTERVAL, REASON_CLOSED
+
+    def _open_interval(
+        self, now: datetime, capacity: int | None
+    ) -> tuple[timedelta, str]:
+        """Return the interval while open, driven by occupancy dynamics."""
+        if capacity is None:
+            return SCAN_INTERVAL, REASON_DEFAULT
+        previous, self._last_sample = self._last_sample, (now, capacity)
+        if previous is None:
+            return SCAN_INTERVAL, REASON_DEFAULT
+
+        previous_time, previous_capacity = previous
+        delta = abs(capacity - previous_capacity)
+        minutes = max((now - previous_time).total_seconds() / 60, 1.0)
+        if delta / minutes >= BUSYNESS_CHANGING_RATE:
+            self._stable_samples = 0
+            return BUSYNESS_MIN_INTERVAL, REASON_CHANGING
+        if delta <= BUSYNESS_STABLE_DELTA:
+            self._stable_samples += 1
+        else:
+            self._stable_samples = 0
+        if self._stable_samples >= BUSYNESS_STABLE_SAMPLES:
+            return BUSYNESS_STABLE_INTERVAL, REASON_STABLE
+        return SCAN_INTERVAL, REASON_DEFAULT
+
+
+class VisitPollScheduler:
+    """Pick the next history poll interval from signs of a gym visit.
+
+    Polls speed up to ``HISTORY_VISIT_INTERVAL`` while the newest check-in
+    is still open (the server fills in its duration once the member leaves)
+    and for ``VISIT_WATCH_PERIOD`` after the gym's occupancy rises at a time
+    the member usually visits, so check-ins and visit ends show up within
+    minutes. Fast polls only request today's check-ins; everything else uses
+    ``HISTORY_SCAN_INTERVAL`` and the archive's usual sync window.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler at the default interval."""
+        self.interval: timedelta = HISTORY_SCAN_INTERVAL
+        self.reason = REASON_DEFAULT
+        # (weekday, local hour) slots the member usually checks in during.
+        self._usual_slots: frozenset[tuple[int, int]] = frozenset()
+        self._last_capacity: int | None = None
+        self._watch_until: datetime | None = None
+        self._open_visit: datetime | None = None
+        self._latest_checkin: datetime | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "interval_seconds": self.interval.total_seconds(),
+            "reason": self.reason,
+            "usual_slots": sorted(self._usual_slots),
+            "watch_until": self._watch_until,
+        }
+
+    def learn(self, starts: Iterable[float]) -> None:
+        """Learn the member's usual visit times from check-in epoch seconds."""
+        time_zone = dt_util.get_default_time_zone()
+        counts = Counter(
+            (local.weekday(), local.hour)
+            for local in (datetime.fromtimestamp(ts, time_zone) for ts in starts)
+        )
+        self._usual_slots = frozenset(
+            slot for slot, visits in counts.items() if visits >= VISIT_USUAL_MIN_VISITS
+        )
+
+    def busyness_sample(self, capacity: int | None, now: datetime) -> bool:
+        """Record the gym's occupancy, returning True if watching just started.
+
+        Occupancy rising during one of the member's usual slots suggests they
+        may have just arrived, so check-ins are watched for a while, unless
+        they have already been in recently.
+        """
+        previous, self._last_capacity = self._last_capacity, capacity
+        if capacity is None or previous is None or capacity <= previous:
+            return False
+        if (
+            self._latest_checkin is not None
+            and now - self._latest_checkin < VISIT_TRACKING_MAX
+        ):
+            return False
+        local_now = dt_util.as_local(now)
+        if (local_now.weekday(), local_now.hour) not in self._usual_slots:
+            return False
+        watching = self._watch_until is not None and now < self._watch_until
+        self._watch_until = now + VISIT_WATCH_PERIOD
+        return not watching
+
+    def update(self, data: dict[str, Any], now: datetime) -> timedelta:
+        """Record the latest history data and return the next poll interval."""
+        latest: datetime | None = data.get("latest_checkin")
+        self._latest_checkin = latest
+        self._open_visit = None
+        if (
+            latest is not None
+            and data.get("latest_checkin_duration_minutes") is None
+            and now - latest < VISIT_TRACKING_MAX
+        ):
+            # The arrival being watched for has happened.
+            self._open_visit, self._watch_until = latest, None
+            self.interval, self.reason = (
+                HISTORY_VISIT_INTERVAL,
+                REASON_VISIT_IN_PROGRESS,
+            )
+        elif self._watch_until is not None and now < self._watch_until:
+            self.interval, self.reason = HISTORY_VISIT_INTERVAL, REASON_ARRIVAL_LIKELY
+        else:
+            self._watch_until = None
+            self.interval, self.reason = HISTORY_SCAN_INTERVAL, REASON_DEFAULT
+        return self.interval
+
+    def history_start(self, now: datetime) -> datetime | None:
+        """Return the start of today's check-ins while tracking a visit.
+
+        An open visit that started before midnight is included. Returns None
+        when polling normally, so the usual sync window is used.
+        """
+        if self.reason == REASON_DEFAULT:
+            return None
+        start = dt_util.start_of_local_day(dt_util.as_local(now))
+        if self._open_visit is not None:
+            start = min(start, self._open_visit)
+        return start.astimezone(now.tzinfo)
+
+
+def class_watch_interval(until_start: timedelta | None) -> timedelta:
+    """Return the class watch poll interval for the nearest watched class.
+
+    ``until_start`` is how long until that class starts, or None if nothing
+    is being watched.
+    """
+    if until_start is not None:
+        for lead, interval in CLASS_WATCH_INTERVALS:
+            if until_start <= lead:
+                return interval
+    return CLASS_WATCH_IDLE_INTERVAL
@@ -0,0 +1,191 @@
+"""Weekly occupancy profile of a gym, used for busyness forecasts."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    PROFILE_HALF_LIFE,
+    PROFILE_MIN_WEIGHT,
+    PROFILE_SAVE_DELAY,
+    PROFILE_SLOT,
+    PROFILE_STORAGE_KEY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_SLOT_MINUTES = int(PROFILE_SLOT.total_seconds()) // 60
+_SLOTS_PER_DAY = 24 * 60 // _SLOT_MINUTES
+_SLOTS = 7 * _SLOTS_PER_DAY
+_HALF_LIFE_SECONDS = PROFILE_HALF_LIFE.total_seconds()
+
+# Each ``historical`` entry of the busyness response is one sample:
+# ``{"timestamp": <epoch milliseconds>, "currentCapacity": <people>}``.
+_HISTORICAL_TIME_KEY = "timestamp"
+_HISTORICAL_VALUE_KEY = "currentCapacity"
+
+# Whether an unparseable ``historical`` entry has been logged yet.
+_logged_unparseable = False
+
+
+def _slot_index(local: datetime) -> int:
+    """Return the profile slot for a local time."""
+    return (
+        local.weekday() * _SLOTS_PER_DAY
+        + (local.hour * 60 + local.minute) // _SLOT_MINUTES
+    )
+
+
+def _parse_historical_sample(item: Any) -> tuple[datetime, float] | None:
+    """Return (time, population) for a ``historical`` entry, if well formed."""
+    if not isinstance(item, dict):
+        return None
+    timestamp = item.get(_HISTORICAL_TIME_KEY)
+    value = item.get(_HISTORICAL_VALUE_KEY)
+    if (
+        not isinstance(timestamp, int)
+        or isinstance(timestamp, bool)
+        or not isinstance(value, (int, float))
+    ):
+        return None
+    return dt_util.utc_from_timestamp(timestamp / 1000), float(value)
+
+
+def parse_historical(historical: Any) -> list[tuple[datetime, float]]:
+    """Return the samples in a payload's ``historical`` field.
+
+    Entries that don't match the expected shape are skipped; the first time
+    that happens the offending entry is logged at debug level.
+    """
+    global _logged_unparseable
+    items = historical if isinstance(historical, list) else []
+    samples = []
+    for item in items:
+        if (sample := _parse_historical_sample(item)) is not None:
+            samples.append(sample)
+        elif not _logged_unparseable:
+            _logged_unparseable = True
+            _LOGGER.debug("Skipping unparseable historical entry: %s", item)
+    return samples
+
+
+class TheGymGroupOccupancyProfile:
+    """Decayed average population per weekday and time-of-day slot.
+
+    Each slot keeps a running mean and the decayed weight of the samples
+    behind it, so adding a sample is O(1): the slot's weight is decayed for
+    the time since its last sample, then the sample is folded into the mean.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize an empty profile for a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION,
+            PROFILE_STORAGE_KEY.format(entry_id=entry_id),
+        )
+        self.gym_id: str | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget every sample."""
+        self._means = array("d", bytes(8 * _SLOTS))
+        self._weights = array("d", bytes(8 * _SLOTS))
+        # Epoch seconds of each slot's last sample.
+        self._updated = array("d", bytes(8 * _SLOTS))
+        self._seeded = False
+
+    async def async_load(self) -> None:
+        """Load the profile from storage."""
+        stored = await self._store.async_load()
+        if not stored or len(stored.get("means", ())) != _SLOTS:
+            return
+        self.gym_id = stored.get("gym_id")
+        self._means = array("d", stored["means"])
+        self._weights = array("d", stored["weights"])
+        self._updated = array("d", stored["updated"])
+        self._seeded = stored.get("seeded", False)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to write to storage."""
+        return {
+            "gym_id": self.gym_id,
+            "seeded": self._seeded,
+            "means": self._means.tolist(),
+            "weights": self._weights.tolist(),
+            "updated": self._updated.tolist(),
+        }
+
+    async def async_remove(self) -> None:
+        """Delete the profile from storage."""
+        await self._store.async_remove()
+
+    def add(self, when: datetime, population: float) -> None:
+        """Fold one population sample into its slot."""
+        index = _slot_index(dt_util.as_local(when))
+        timestamp = when.timestamp()
+        elapsed = max(timestamp - self._updated[index], 0.0)
+        weight = self._weights[index] * 0.5 ** (elapsed / _HALF_LIFE_SECONDS) + 1.0
+        self._means[index] += (population - self._means[index]) / weight
+        self._weights[index] = weight
+        self._updated[index] = max(timestamp, self._updated[index])
+
+    @callback
+    def async_update(self, data: dict[str, Any], now: datetime) -> None:
+        """Record a busyness payload and schedule saving the profile.
+
+        The profile starts over if the payload is for a different gym, and a
+        new profile is seeded from the payload's ``historical`` samples.
+        Samples taken while the gym is closed are skipped so that closed
+        hours never show up as the quietest time to go.
+        """
+        gym_id = data.get("gymLocationId")
+        if gym_id is not None and str(gym_id) != self.gym_id:
+            if self.gym_id is not None:
+                _LOGGER.debug("Gym changed to %s, resetting occupancy profile", gym_id)
+            self._reset()
+            self.gym_id = str(gym_id)
+        if not self._seeded:
+            for sample in parse_historical(data.get("historical")):
+                self.add(*sample)
+            self._seeded = True
+        capacity = data.get("currentCapacity")
+        if data.get("status") != "closed" and isinstance(capacity, (int, float)):
+            self.add(now, capacity)
+        self._store.async_delay_save(self._data_to_save, PROFILE_SAVE_DELAY)
+
+    def expected(self, when: datetime) -> float | None:
+        """Return the expected population at a time, if the slot has data."""
+        index = _slot_index(dt_util.as_local(when))
+        if self._weights[index] < PROFILE_MIN_WEIGHT:
+            return None
+        return self._means[index]
+
+    def forecast(
+        self, now: datetime, horizon: timedelta
+    ) -> list[tuple[datetime, float]]:
+        """Return (slot start, expected population) for slots up to the horizon.
+
+        Starts with the slot after the current one and skips slots without
+        enough data (for example hours the gym is closed).
+        """
+        local_now = dt_util.as_local(now)
+        slot_start = local_now.replace(
+            minute=local_now.minute - local_now.minute % _SLOT_MINUTES,
+            second=0,
+            microsecond=0,
+        )
+        result: list[tuple[datetime, float]] = []
+        for step in range(1, int(horizon / PROFILE_SLOT) + 1):
+            start = dt_util.as_utc(slot_start + step * PROFILE_SLOT)
+            if (value := self.expected(start)) is not None:
+                result.append((start, value))
+        return result
@@ -0,0 +1,264 @@
+"""On-demand cProfile capture of coordinator updates and state writes."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine, Generator
+import cProfile
+from dataclasses import dataclass
+import logging
+import os
+import pstats
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, PROFILING_DIR, PROFILING_TOP_FUNCTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PROFILERS: HassKey[dict[str, TheGymGroupProfiler]] = HassKey(
+    f"{DOMAIN}_profilers"
+)
+
+KIND_UPDATE = "update"
+KIND_STATE_WRITE = "state_write"
+
+# Only one cProfile profiler can be enabled at a time, so work that starts
+# while another capture is running (another entry's, or a nested call) runs
+# unprofiled rather than failing.
+_enabled: cProfile.Profile | None = None
+
+# Whether a failure to enable the profiler has been logged yet.
+_logged_enable_failure = False
+
+
+@callback
+def async_get_profiler(hass: HomeAssistant, entry_id: str) -> TheGymGroupProfiler:
+    """Return the profiler shared by an entry's coordinators and entities."""
+    profilers = hass.data.setdefault(DATA_PROFILERS, {})
+    if (profiler := profilers.get(entry_id)) is None:
+        profiler = profilers[entry_id] = TheGymGroupProfiler(hass, entry_id)
+    return profiler
+
+
+@callback
+def async_remove_profiler(hass: HomeAssistant, entry_id: str) -> None:
+    """Forget an entry's profiler, dropping any capture in progress."""
+    hass.data.get(DATA_PROFILERS, {}).pop(entry_id, None)
+
+
+@dataclass
+class _Timings:
+    """Accumulated timings for one kind of profiled work."""
+
+    count: int = 0
+    # Start to finish, including time spent awaiting I/O.
+    wall: float = 0.0
+    # Time spent actually running on the event loop, between awaits.
+    busy: float = 0.0
+    cpu: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timings in milliseconds for diagnostics."""
+        return {
+            "count": self.count,
+            "wall_ms": round(self.wall * 1000, 3),
+            "outside_awaits_ms": round(self.busy * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+        }
+
+
+class _Capture:
+    """One profiling session: a profiler and the timings it collected."""
+
+    def __init__(self, updates: int) -> None:
+        """Start a capture covering the given number of coordinator updates."""
+        self.profile = cProfile.Profile()
+        self.remaining = updates
+        self.started = dt_util.utcnow()
+        self.timings: dict[str, _Timings] = {
+            KIND_UPDATE: _Timings(),
+            KIND_STATE_WRITE: _Timings(),
+        }
+
+    def run_step[_T](self, timings: _Timings, step: Callable[[], _T]) -> _T:
+        """Run a synchronous step under the profiler."""
+        global _enabled, _logged_enable_failure
+        if _enabled is not None:
+            return step()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            self.profile.enable()
+        except ValueError as err:
+            # Another profiling tool, such as HA's profiler integration, is
+            # active; the step still runs, just unprofiled.
+            if not _logged_enable_failure:
+                _logged_enable_failure = True
+                _LOGGER.debug("Running unprofiled: %s", err)
+        else:
+            _enabled = self.profile
+        try:
+            return step()
+        finally:
+            if _enabled is self.profile:
+                self.profile.disable()
+                _enabled = None
+            timings.busy += time.perf_counter() - wall
+            timings.cpu += time.thread_time() - cpu
+
+
+class _ProfiledCoroutine[_T]:
+    """Await a coroutine, profiling each step it runs between awaits.
+
+    Profiling only the steps keeps other tasks that run while the coroutine
+    is suspended out of the capture, and the summed step durations are the
+    time the coroutine held the event loop.
+    """
+
+    def __init__(
+        self, capture: _Capture, timings: _Timings, coro: Coroutine[Any, Any, _T]
+    ) -> None:
+        """Wrap the coroutine."""
+        self._capture = capture
+        self._timings = timings
+        self._coro = coro
+
+    def __await__(self) -> Generator[Any, Any, _T]:
+        """Drive the coroutine, relaying whatever it awaits to the task."""
+        coro = self._coro
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            try:
+                if error is not None:
+                    pending = self._capture.run_step(
+                        self._timings, lambda: coro.throw(error)
+                    )
+                else:
+                    pending = self._capture.run_step(
+                        self._timings, lambda: coro.send(value)
+                    )
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value, error = (yield pending), None
+            except BaseException as err:
+                value, error = None, err
+
+
+class TheGymGroupProfiler:
+    """Profile an entry's next few coordinator updates and state writes.
+
+    A capture is started by the ``start_profiling`` service and runs for the
+    requested number of coordinator updates, also covering every entity state
+    write in the meantime. The calendar's event index is rebuilt while its
+    state is written, so it shows up there. When the capture ends its stats
+    are written to a ``.prof`` file under the config directory (readable with
+    ``pstats`` or snakeviz) and summarised for diagnostics.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize an idle profiler."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._capture: _Capture | None = None
+        self.last_summary: dict[str, Any] | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return True while a capture is running."""
+        return self._capture is not None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the profiler state and last capture summary for diagnostics."""
+        return {
+            "active": self.active,
+            "remaining_updates": self._capture.remaining if self._capture else 0,
+            "last_capture": self.last_summary,
+        }
+
+    @callback
+    def async_start(self, updates: int) -> None:
+        """Start (or restart) a capture covering the next ``updates`` updates."""
+        self._capture = _Capture(updates)
+
+    async def async_profile_update[_T](self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """Await a coordinator update, profiling it if a capture is running."""
+        if (capture := self._capture) is None:
+            return await coro
+        timings = capture.timings[KIND_UPDATE]
+        started = time.perf_counter()
+        try:
+            return await _ProfiledCoroutine(capture, timings, coro)
+        finally:
+            timings.count += 1
+            timings.wall += time.perf_counter() - started
+            capture.remaining -= 1
+            if capture.remaining <= 0 and capture is self._capture:
+                self._capture = None
+                self._hass.async_create_background_task(
+                    self._async_finish(capture), f"{DOMAIN} profile capture"
+                )
+
+    @callback
+    def profile_state_write(self, write: Callable[[], None]) -> None:
+        """Run an entity state write, profiling it if a capture is running."""
+        if (capture := self._capture) is None:
+            write()
+            return
+        timings = capture.timings[KIND_STATE_WRITE]
+        started = time.perf_counter()
+        try:
+            capture.run_step(timings, write)
+        finally:
+            timings.count += 1
+            timings.wall += time.perf_counter() - started
+
+    async def _async_finish(self, capture: _Capture) -> None:
+        """Write a finished capture to disk and summarise it."""
+        path = self._hass.config.path(
+            PROFILING_DIR,
+            f"{self._entry_id}_{capture.started.strftime('%Y%m%dT%H%M%S')}.prof",
+        )
+        top = await self._hass.async_add_executor_job(
+            _dump_stats, capture.profile, path
+        )
+        self.last_summary = {
+            "started": capture.started.isoformat(),
+            "finished": dt_util.utcnow().isoformat(),
+            "file": path,
+            "timings": {
+                kind: timings.as_dict() for kind, timings in capture.timings.items()
+            },
+            "top_functions": top,
+        }
+        _LOGGER.info("Profile of %s written to %s", self._entry_id, path)
+
+
+def _dump_stats(profile: cProfile.Profile, path: str) -> list[dict[str, Any]]:
+    """Write the stats file and return the functions with the most own time."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profile.dump_stats(path)
+    if not profile.stats:  # type: ignore[attr-defined]
+        # Every step ran unprofiled, so there is nothing to summarise.
+        return []
+    stats = pstats.Stats(profile)
+    rows = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][2],
+        reverse=True,
+    )[:PROFILING_TOP_FUNCTIONS]
+    return [
+        {
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "calls": calls,
+            "own_ms": round(own * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, own, cumulative, _) in rows
+    ]
+
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -10,24 +11,43 @@ from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from . import TheGymGroupConfigEntry
+from .aggregation import CheckinColumns
 from .const import (
+    API_LATENCY_TRANSLATION_KEY,
+    BUSYNESS_FORECAST_TRANSLATION_KEY,
     BUSYNESS_TRANSLATION_KEY,
+    CLASS_SPOTS_TRANSLATION_KEY,
     DOMAIN,
+    FORECAST_HORIZON,
     HISTORICAL_ATTR_LIMIT,
     LAST_CHECKIN_TRANSLATION_KEY,
     MONTHLY_TIME_TRANSLATION_KEY,
     MONTHLY_VISITS_TRANSLATION_KEY,
     NEXT_CLASS_TRANSLATION_KEY,
+    QUIETEST_TIME_TRANSLATION_KEY,
     STATUS_TRANSLATION_KEY,
 )
-from .coordinator import TheGymGroupActivityCoordinator, TheGymGroupDataUpdateCoordinator
+from .coordinator import (
+    SECTION_CAPACITY,
+    SECTION_LATEST_CHECKIN,
+    SECTION_MONTHLY,
+    SECTION_NEXT_CLASS,
+    SECTION_STATUS,
+    TheGymGroupClassWatchCoordinator,
+    TheGymGroupDataUpdateCoordinator,
+    TheGymGroupHistoryCoordinator,
+    TheGymGroupScheduleCoordinator,
+)
+from .metrics import ENDPOINTS
 
 
 async def async_setup_entry(
@@ -38,7 +58,8 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     runtime_data = entry.runtime_data
     busyness_coordinator = runtime_data.busyness
-    activity_coordinator = runtime_data.activity
+    history_coordinator = runtime_data.history
+    schedule_coordinator = runtime_data.schedule
 
     # Resolve device identity once from the busyness coordinator (already refreshed).
     busyness_data = busyness_coordinator.data or {}
@@ -49,21 +70,55 @@ async def async_setup_entry(
         [
             TheGymGroupBusynessSensor(busyness_coordinator, entry, device_id, gym_name),
             TheGymGroupStatusSensor(busyness_coordinator, entry, device_id, gym_name),
+            TheGymGroupBusynessForecastSensor(
+                busyness_coordinator, entry, device_id, gym_name
+            ),
+            TheGymGroupQuietestTimeSensor(
+                busyness_coordinator, entry, device_id, gym_name
+            ),
             TheGymGroupLastCheckinSensor(
-                activity_coordinator, entry, device_id, gym_name
+                history_coordinator, entry, device_id, gym_name
             ),
             TheGymGroupMonthlyVisitsSensor(
-                activity_coordinator, entry, device_id, gym_name
+                history_coordinator, entry, device_id, gym_name
             ),
             TheGymGroupMonthlyTimeSensor(
-                activity_coordinator, entry, device_id, gym_name
+                history_coordinator, entry, device_id, gym_name
             ),
             TheGymGroupNextClassSensor(
-                activity_coordinator, entry, device_id, gym_name
+                schedule_coordinator, entry, device_id, gym_name
+            ),
+            *(
+                TheGymGroupApiLatencySensor(
+                    busyness_coordinator, entry, device_id, gym_name, endpoint, q
+                )
+                for endpoint in ENDPOINTS
+                for q in (0.5, 0.95)
             ),
         ]
     )
 
+    # Classes come and go, so their sensors are added as the class watch
+    # starts watching them and remove themselves once it stops.
+    class_watch = runtime_data.class_watch
+    watched: set[str] = set()
+
+    @callback
+    def _async_add_class_sensors() -> None:
+        new_sensors = []
+        for class_id in (class_watch.data or {}).keys() - watched:
+            sensor = TheGymGroupClassSpotsSensor(
+                class_watch, entry, device_id, gym_name, class_id
+            )
+            sensor.async_on_remove(partial(watched.discard, class_id))
+            watched.add(class_id)
+            new_sensors.append(sensor)
+        if new_sensors:
+            async_add_entities(new_sensors)
+
+    _async_add_class_sensors()
+    entry.async_on_unload(class_watch.async_add_listener(_async_add_class_sensors))
+
 
 class _TheGymGroupBaseSensor(
     CoordinatorEntity[DataUpdateCoordinator[dict[str, Any]]], SensorEntity
@@ -71,6 +126,12 @@ class _TheGymGroupBaseSensor(
     """Shared base for The Gym Group sensors."""
 
     _attr_has_entity_name = True
+    # Section of the coordinator data the sensor shows; None to be updated
+    # on every refresh.
+    _section: str | None = None
+    # False if the attributes depend on more than the coordinator data (the
+    # time, or metrics kept outside it), so they can't be cached per update.
+    _attributes_from_data = True
 
     def __init__(
         self,
@@ -81,11 +142,47 @@ class _TheGymGroupBaseSensor(
         gym_name: str,
     ) -> None:
         """Initialize the base sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, self._section)
         self.config_entry: TheGymGroupConfigEntry = config_entry
         self._device_id = device_id
         self._gym_name = gym_name
         self._attr_unique_id = f"{device_id}_{unique_suffix}"
+        # (data, stale_since, attributes) from the last computation.
+        self._attributes_cache: (
+            tuple[Any, datetime | None, dict[str, Any] | None] | None
+        ) = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state, under the profiler if a capture is running."""
+        self.coordinator.profiler.profile_state_write(
+            super()._handle_coordinator_update
+        )
+
+    def _extra_attributes(self) -> dict[str, Any]:
+        """Return the sensor's own extra attributes."""
+        return {}
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the sensor's attributes, flagging data served stale.
+
+        The attributes are computed once per coordinator update.
+        """
+        data = self.coordinator.data
+        stale_since = getattr(self.coordinator, "stale_since", None)
+        if (
+            self._attributes_from_data
+            and (cache := self._attributes_cache) is not None
+            and cache[0] is data
+            and cache[1] == stale_since
+        ):
+            return cache[2]
+        attributes = self._extra_attributes()
+        if stale_since is not None:
+            attributes = {**attributes, "stale_since": stale_since}
+        self._attributes_cache = (data, stale_since, attributes or None)
+        return attributes or None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -105,6 +202,9 @@ class TheGymGroupBusynessSensor(_TheGymGroupBaseSensor):
     _attr_native_unit_of_measurement = "people"
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_translation_key = BUSYNESS_TRANSLATION_KEY
+    _section = SECTION_CAPACITY
+    # Changes on every poll; the get_busyness_history action serves history.
+    _unrecorded_attributes = frozenset({"historical"})
 
     def __init__(
         self,
@@ -122,8 +222,7 @@ class TheGymGroupBusynessSensor(_TheGymGroupBaseSensor):
         data = self.coordinator.data or {}
         return data.get("currentCapacity")
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _extra_attributes(self) -> dict[str, Any]:
         """Return a bounded set of extra attributes."""
         data = self.coordinator.data
         if not data:
@@ -147,6 +246,7 @@ class TheGymGroupStatusSensor(_TheGymGroupBaseSensor):
 
     _attr_icon = "mdi:door"
     _attr_translation_key = STATUS_TRANSLATION_KEY
+    _section = SECTION_STATUS
 
     def __init__(
         self,
@@ -165,16 +265,106 @@ class TheGymGroupStatusSensor(_TheGymGroupBaseSensor):
         return data.get("status")
 
 
+class TheGymGroupBusynessForecastSensor(_TheGymGroupBaseSensor):
+    """Expected population an hour from now, from the occupancy profile."""
+
+    _attr_icon = "mdi:crystal-ball"
+    _attr_native_unit_of_measurement = "people"
+    _attr_suggested_display_precision = 0
+    _attr_translation_key = BUSYNESS_FORECAST_TRANSLATION_KEY
+    _attributes_from_data = False
+    _unrecorded_attributes = frozenset({"forecast"})
+
+    coordinator: TheGymGroupDataUpdateCoordinator
+
+    def __init__(
+        self,
+        coordinator: TheGymGroupDataUpdateCoordinator,
+        config_entry: TheGymGroupConfigEntry,
+        device_id: str,
+        gym_name: str,
+    ) -> None:
+        """Initialize the busyness forecast sensor."""
+        super().__init__(
+            coordinator, config_entry, "busyness_forecast", device_id, gym_name
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the expected population one hour from now."""
+        now = datetime.now(timezone.utc)
+        expected = self.coordinator.profile.expected(now + timedelta(hours=1))
+        return None if expected is None else round(expected, 1)
+
+    def _extra_attributes(self) -> dict[str, Any]:
+        """Return the expected population for each slot up to the horizon."""
+        forecast = self.coordinator.profile.forecast(
+            datetime.now(timezone.utc), FORECAST_HORIZON
+        )
+        return {
+            "forecast": [
+                {"start": start.isoformat(), "population": round(value, 1)}
+                for start, value in forecast
+            ]
+        }
+
+
+class TheGymGroupQuietestTimeSensor(_TheGymGroupBaseSensor):
+    """Start of the quietest upcoming slot, from the occupancy profile."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:clock-check-outline"
+    _attr_translation_key = QUIETEST_TIME_TRANSLATION_KEY
+    _attributes_from_data = False
+
+    coordinator: TheGymGroupDataUpdateCoordinator
+
+    def __init__(
+        self,
+        coordinator: TheGymGroupDataUpdateCoordinator,
+        config_entry: TheGymGroupConfigEntry,
+        device_id: str,
+        gym_name: str,
+    ) -> None:
+        """Initialize the quietest time sensor."""
+        super().__init__(
+            coordinator, config_entry, "quietest_time", device_id, gym_name
+        )
+
+    def _quietest(self) -> tuple[datetime, float] | None:
+        """Return the earliest upcoming slot with the lowest expected population."""
+        forecast = self.coordinator.profile.forecast(
+            datetime.now(timezone.utc), FORECAST_HORIZON
+        )
+        return min(forecast, key=lambda slot: slot[1], default=None)
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when the quietest upcoming slot starts."""
+        quietest = self._quietest()
+        return None if quietest is None else quietest[0]
+
+    def _extra_attributes(self) -> dict[str, Any]:
+        """Return the expected population during the quietest slot."""
+        quietest = self._quietest()
+        if quietest is None:
+            return {}
+        return {"expected_population": round(quietest[1], 1)}
+
+
 class TheGymGroupLastCheckinSensor(_TheGymGroupBaseSensor):
     """Timestamp of the user's most recent gym check-in."""
 
     _attr_device_class = SensorDeviceClass.TIMESTAMP
     _attr_icon = "mdi:login"
     _attr_translation_key = LAST_CHECKIN_TRANSLATION_KEY
+    _section = SECTION_LATEST_CHECKIN
+    # The get_checkin_history action serves any range of visits on demand.
+    _unrecorded_attributes = frozenset({"checkin_history"})
 
     def __init__(
         self,
-        coordinator: TheGymGroupActivityCoordinator,
+        coordinator: TheGymGroupHistoryCoordinator,
         config_entry: TheGymGroupConfigEntry,
         device_id: str,
         gym_name: str,
@@ -188,14 +378,16 @@ class TheGymGroupLastCheckinSensor(_TheGymGroupBaseSensor):
         data = self.coordinator.data or {}
         return data.get("latest_checkin")
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _extra_attributes(self) -> dict[str, Any]:
         """Return gym name, visit duration, and recent check-in history."""
         data = self.coordinator.data or {}
+        checkins: CheckinColumns | None = data.get("checkins")
         raw = {
             "gym_location_name": data.get("latest_checkin_gym"),
             "duration_minutes": data.get("latest_checkin_duration_minutes"),
-            "checkin_history": data.get("checkin_history"),
+            "checkin_history": (
+                checkins.history(data["recent_checkins_from"]) if checkins else None
+            ),
         }
         return {k: v for k, v in raw.items() if v is not None}
 
@@ -207,10 +399,11 @@ class TheGymGroupMonthlyVisitsSensor(_TheGymGroupBaseSensor):
     _attr_native_unit_of_measurement = "visits"
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_translation_key = MONTHLY_VISITS_TRANSLATION_KEY
+    _section = SECTION_MONTHLY
 
     def __init__(
         self,
-        coordinator: TheGymGroupActivityCoordinator,
+        coordinator: TheGymGroupHistoryCoordinator,
         config_entry: TheGymGroupConfigEntry,
         device_id: str,
         gym_name: str,
@@ -236,10 +429,11 @@ class TheGymGroupMonthlyTimeSensor(_TheGymGroupBaseSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_suggested_display_precision = 1
     _attr_translation_key = MONTHLY_TIME_TRANSLATION_KEY
+    _section = SECTION_MONTHLY
 
     def __init__(
         self,
-        coordinator: TheGymGroupActivityCoordinator,
+        coordinator: TheGymGroupHistoryCoordinator,
         config_entry: TheGymGroupConfigEntry,
         device_id: str,
         gym_name: str,
@@ -262,10 +456,11 @@ class TheGymGroupNextClassSensor(_TheGymGroupBaseSensor):
     _attr_device_class = SensorDeviceClass.TIMESTAMP
     _attr_icon = "mdi:calendar-clock"
     _attr_translation_key = NEXT_CLASS_TRANSLATION_KEY
+    _section = SECTION_NEXT_CLASS
 
     def __init__(
         self,
-        coordinator: TheGymGroupActivityCoordinator,
+        coordinator: TheGymGroupScheduleCoordinator,
         config_entry: TheGymGroupConfigEntry,
         device_id: str,
         gym_name: str,
@@ -282,8 +477,7 @@ class TheGymGroupNextClassSensor(_TheGymGroupBaseSensor):
             return None
         return next_class.get("start_dt")
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _extra_attributes(self) -> dict[str, Any]:
         """Return class name, instructor, available spots, and duration."""
         data = self.coordinator.data or {}
         next_class = data.get("next_class")
@@ -296,3 +490,124 @@ class TheGymGroupNextClassSensor(_TheGymGroupBaseSensor):
             "duration_minutes": next_class.get("duration_minutes"),
         }
         return {k: v for k, v in raw.items() if v is not None}
+
+
+class TheGymGroupApiLatencySensor(_TheGymGroupBaseSensor):
+    """A latency percentile for one API endpoint, for troubleshooting.
+
+    The metrics are kept by the API client rather than the coordinator, so
+    the sensor simply re-reads them whenever busyness is polled.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+    _attr_translation_key = API_LATENCY_TRANSLATION_KEY
+    _attributes_from_data = False
+
+    coordinator: TheGymGroupDataUpdateCoordinator
+
+    def __init__(
+        self,
+        coordinator: TheGymGroupDataUpdateCoordinator,
+        config_entry: TheGymGroupConfigEntry,
+        device_id: str,
+        gym_name: str,
+        endpoint: str,
+        quantile: float,
+    ) -> None:
+        """Initialize the latency sensor for an endpoint and percentile."""
+        percentile = f"p{round(quantile * 100)}"
+        super().__init__(
+            coordinator,
+            config_entry,
+            f"{endpoint}_latency_{percentile}",
+            device_id,
+            gym_name,
+        )
+        self._endpoint = endpoint
+        self._quantile = quantile
+        self._attr_translation_placeholders = {
+            "endpoint": endpoint.capitalize(),
+            "quantile": percentile,
+        }
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the estimated latency percentile in milliseconds."""
+        return self.coordinator.api_client.metrics.latency_quantile(
+            self._endpoint, self._quantile
+        )
+
+    def _extra_attributes(self) -> dict[str, Any]:
+        """Return how many responses the estimate is based on."""
+        metrics = self.coordinator.api_client.metrics
+        return {"responses": metrics.response_count(self._endpoint)}
+
+
+class TheGymGroupClassSpotsSensor(_TheGymGroupBaseSensor):
+    """Spots left in one booked class that starts soon.
+
+    The class watch polls these more often as the class approaches. The
+    sensor removes itself once the class starts or is cancelled.
+    """
+
+    _attr_icon = "mdi:account-multiple-check"
+    _attr_native_unit_of_measurement = "spots"
+    _attr_translation_key = CLASS_SPOTS_TRANSLATION_KEY
+
+    coordinator: TheGymGroupClassWatchCoordinator
+
+    def __init__(
+        self,
+        coordinator: TheGymGroupClassWatchCoordinator,
+        config_entry: TheGymGroupConfigEntry,
+        device_id: str,
+        gym_name: str,
+        class_id: str,
+    ) -> None:
+        """Initialize the sensor for a watched class."""
+        # Each class is its own section of the class watch's data.
+        self._section = class_id
+        super().__init__(
+            coordinator, config_entry, f"class_{class_id}", device_id, gym_name
+        )
+        self._class_id = class_id
+        watched_class = coordinator.data[class_id]
+        self._attr_translation_placeholders = {
+            "class_name": watched_class["name"],
+            "start": f"{dt_util.as_local(watched_class['start']):%a %H:%M}",
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state, or remove the sensor if the class has gone."""
+        if self._class_id in (self.coordinator.data or {}):
+            super()._handle_coordinator_update()
+            return
+        if self.registry_entry is not None:
+            er.async_get(self.hass).async_remove(self.entity_id)
+        else:
+            self.hass.async_create_task(self.async_remove(force_remove=True))
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the spots left in the class."""
+        watched_class = (self.coordinator.data or {}).get(self._class_id)
+        return watched_class["available_spots"] if watched_class else None
+
+    def _extra_attributes(self) -> dict[str, Any]:
+        """Return the class's name, start, instructor and capacity."""
+        watched_class = (self.coordinator.data or {}).get(self._class_id)
+        if not watched_class:
+            return {}
+        raw = {
+            "class_name": watched_class["name"],
+            "start": watched_class["start"],
+            "instructor": watched_class["instructor"] or None,
+            "max_capacity": watched_class["max_capacity"],
+        }
+        return {k: v for k, v in raw.items() if v is not None}
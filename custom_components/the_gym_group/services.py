@@ -0,0 +1,165 @@
+"""Services for The Gym Group integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .aggregation import RECENT_CHECKINS_WINDOW, CheckinColumns
+from .const import (
+    BUSYNESS_SERIES_TIERS,
+    DOMAIN,
+    PROFILING_DEFAULT_UPDATES,
+    PROFILING_MAX_UPDATES,
+)
+
+if TYPE_CHECKING:
+    from . import TheGymGroupConfigEntry
+
+SERVICE_GET_BUSYNESS_HISTORY = "get_busyness_history"
+SERVICE_GET_CHECKIN_HISTORY = "get_checkin_history"
+SERVICE_START_PROFILING = "start_profiling"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_RESOLUTION = "resolution"
+ATTR_UPDATES = "updates"
+
+GET_BUSYNESS_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RESOLUTION): vol.In(list(BUSYNESS_SERIES_TIERS)),
+    }
+)
+
+GET_CHECKIN_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+START_PROFILING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_UPDATES, default=PROFILING_DEFAULT_UPDATES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILING_MAX_UPDATES)
+        ),
+    }
+)
+
+
+def _get_entry(hass: HomeAssistant, call: ServiceCall) -> TheGymGroupConfigEntry:
+    """Return the loaded entry a service call targets.
+
+    The entry may be omitted when only one account is set up, which keeps
+    dashboard card configurations short.
+    """
+    entries = hass.config_entries.async_loaded_entries(DOMAIN)
+    if entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID):
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is None or entry.domain != DOMAIN:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="entry_not_found",
+                translation_placeholders={"entry_id": entry_id},
+            )
+        if entry.state is not ConfigEntryState.LOADED:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="entry_not_loaded",
+                translation_placeholders={"entry_id": entry_id},
+            )
+        return entry
+    if len(entries) != 1:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_required",
+        )
+    return entries[0]
+
+
+async def _async_get_busyness_history(call: ServiceCall) -> ServiceResponse:
+    """Return the locally stored busyness history for a time range."""
+    entry = _get_entry(call.hass, call)
+    start = dt_util.as_utc(call.data[ATTR_START])
+    end = dt_util.as_utc(call.data.get(ATTR_END) or dt_util.utcnow())
+    if end <= start:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_range",
+        )
+    resolution, points = entry.runtime_data.busyness.series.query(
+        start, end, call.data.get(ATTR_RESOLUTION)
+    )
+    return {"resolution": resolution, "points": points}
+
+
+async def _async_get_checkin_history(call: ServiceCall) -> ServiceResponse:
+    """Return the archived check-ins that started in a time range."""
+    entry = _get_entry(call.hass, call)
+    end = dt_util.as_utc(call.data.get(ATTR_END) or dt_util.utcnow())
+    start = (
+        dt_util.as_utc(call.data[ATTR_START])
+        if ATTR_START in call.data
+        else end - RECENT_CHECKINS_WINDOW
+    )
+    if end <= start:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_range",
+        )
+    checkins: CheckinColumns | None = (entry.runtime_data.history.data or {}).get(
+        "checkins"
+    )
+    if checkins is None:
+        return {"checkins": []}
+    return {"checkins": checkins.history(*checkins.span(start, end))}
+
+
+async def _async_start_profiling(call: ServiceCall) -> None:
+    """Profile an entry's next few coordinator updates and state writes."""
+    entry = _get_entry(call.hass, call)
+    entry.runtime_data.busyness.profiler.async_start(call.data[ATTR_UPDATES])
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_BUSYNESS_HISTORY,
+        _async_get_busyness_history,
+        schema=GET_BUSYNESS_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CHECKIN_HISTORY,
+        _async_get_checkin_history,
+        schema=GET_CHECKIN_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILING,
+        _async_start_profiling,
+        schema=START_PROFILING_SCHEMA,
+    )
@@ -0,0 +1,79 @@
+"""Last good coordinator payloads, kept on disk for fast startup."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TheGymGroupSnapshot:
+    """The last successfully fetched payload of one coordinator.
+
+    The payload must be JSON-serialisable, so coordinators store the raw API
+    data they derive their state from rather than the derived state itself.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, name: str) -> None:
+        """Initialize the snapshot for a config entry's coordinator."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION,
+            SNAPSHOT_STORAGE_KEY.format(entry_id=entry_id, name=name),
+        )
+        self._payload: Any = None
+        # When the payload was fetched from the API, and whether it was
+        # restored from disk rather than fetched since startup.
+        self.fetched_at: datetime | None = None
+        self.restored = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot state for diagnostics."""
+        return {
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+            "restored": self.restored,
+        }
+
+    async def async_load(self, now: datetime) -> Any | None:
+        """Return the stored payload, or None if missing or too old."""
+        stored = await self._store.async_load()
+        if not stored:
+            return None
+        fetched_at = dt_util.parse_datetime(stored.get("fetched_at") or "")
+        if fetched_at is None or now - fetched_at > SNAPSHOT_MAX_AGE:
+            _LOGGER.debug("Ignoring stale snapshot fetched at %s", fetched_at)
+            return None
+        self._payload = stored.get("payload")
+        self.fetched_at = fetched_at
+        self.restored = True
+        return self._payload
+
+    @callback
+    def async_update(self, payload: Any, now: datetime) -> None:
+        """Record a freshly fetched payload and schedule writing it to disk."""
+        self._payload = payload
+        self.fetched_at = now
+        self.restored = False
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to write to storage."""
+        assert self.fetched_at is not None
+        return {"fetched_at": self.fetched_at.isoformat(), "payload": self._payload}
+
+    async def async_remove(self) -> None:
+        """Delete the snapshot from storage."""
+        await self._store.async_remove()
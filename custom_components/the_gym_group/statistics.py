@@ -0,0 +1,257 @@
+"""Busyness and visit metrics written to HA long-term statistics."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+from homeassistant.util.unit_conversion import DurationConverter
+
+from .aggregation import CheckinColumns
+from .const import DOMAIN, VISIT_STATISTICS_RESYNC_DAYS
+from .profile import parse_historical
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _recorder_loaded(hass: HomeAssistant) -> bool:
+    """Return True if the recorder is set up, so statistics can be written."""
+    return "recorder" in hass.config.components
+
+
+async def _async_last_statistics(
+    hass: HomeAssistant, count: int, statistic_id: str
+) -> list[dict[str, Any]]:
+    """Return up to the last ``count`` rows of a statistic, newest first."""
+    rows = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, count, statistic_id, False, {"state", "sum"}
+    )
+    return list(rows.get(statistic_id, []))
+
+
+class _Hour:
+    """Running min/max/mean of the samples in one hour."""
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize an empty hour."""
+        self.start = start
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def row(self) -> StatisticData:
+        """Return the hour as a statistics row."""
+        return StatisticData(
+            start=self.start,
+            mean=self.total / self.count,
+            min=self.min,
+            max=self.max,
+        )
+
+
+class TheGymGroupOccupancyStatistics:
+    """Hourly mean/min/max gym population, imported as external statistics.
+
+    Each busyness sample is added to the current hour, which is imported once
+    a sample from a later hour arrives. On the first sample after startup,
+    hours missed while HA was down are backfilled from the payload's
+    ``historical`` samples.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the occupancy statistics."""
+        self.hass = hass
+        self.statistic_id: str | None = None
+        self._hour: _Hour | None = None
+        self._backfilled = False
+
+    async def async_add_sample(self, data: dict[str, Any], now: datetime) -> None:
+        """Record a busyness payload, importing any hours it completes."""
+        gym_id = data.get("gymLocationId")
+        if gym_id is None or not _recorder_loaded(self.hass):
+            return
+        statistic_id = f"{DOMAIN}:{slugify(str(gym_id))}_occupancy"
+        if statistic_id != self.statistic_id:
+            self.statistic_id = statistic_id
+            self._hour = None
+            self._backfilled = False
+
+        hour_start = dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0)
+        rows: list[StatisticData] = []
+        if not self._backfilled:
+            self._backfilled = True
+            rows = await self._async_backfill(data.get("historical"), hour_start, now)
+
+        capacity = data.get("currentCapacity")
+        if isinstance(capacity, (int, float)):
+            if self._hour is not None and self._hour.start != hour_start:
+                rows.append(self._hour.row())
+                self._hour = None
+            if self._hour is None:
+                self._hour = _Hour(hour_start)
+            self._hour.add(capacity)
+
+        if rows:
+            async_add_external_statistics(
+                self.hass,
+                StatisticMetaData(
+                    mean_type=StatisticMeanType.ARITHMETIC,
+                    has_sum=False,
+                    name=f"{data.get('gymLocationName') or 'Gym'} occupancy",
+                    source=DOMAIN,
+                    statistic_id=statistic_id,
+                    unit_class=None,
+                    unit_of_measurement="people",
+                ),
+                rows,
+            )
+
+    async def _async_backfill(
+        self, historical: Any, hour_start: datetime, now: datetime
+    ) -> list[StatisticData]:
+        """Return rows for hours missed since the last import.
+
+        Samples from the current hour seed its running values instead.
+        """
+        assert self.statistic_id is not None
+        samples = parse_historical(historical)
+        if not samples:
+            return []
+        last = await _async_last_statistics(self.hass, 1, self.statistic_id)
+        since = (
+            dt_util.utc_from_timestamp(last[0]["start"]) + timedelta(hours=1)
+            if last
+            else datetime.min.replace(tzinfo=dt_util.UTC)
+        )
+        hours: dict[datetime, _Hour] = {}
+        for when, value in sorted(samples):
+            if not since <= when <= now:
+                continue
+            start = when.replace(minute=0, second=0, microsecond=0)
+            if start == hour_start:
+                if self._hour is None:
+                    self._hour = _Hour(hour_start)
+                self._hour.add(value)
+            else:
+                hours.setdefault(start, _Hour(start)).add(value)
+        if hours:
+            _LOGGER.debug(
+                "Backfilling %d hours of occupancy statistics", len(hours)
+            )
+        return [hour.row() for hour in hours.values()]
+
+
+class TheGymGroupVisitStatistics:
+    """Daily visit count and gym time, imported as external statistics.
+
+    One row is written for every local day from the first archived visit, so
+    the cumulative sums can be continued from the row before any day that is
+    recomputed.
+    """
+
+    def __init__(self, hass: HomeAssistant, account_id: str) -> None:
+        """Initialize the visit statistics for an account."""
+        self.hass = hass
+        prefix = f"{DOMAIN}:{slugify(account_id)}"
+        self.visits_id = f"{prefix}_visits"
+        self.duration_id = f"{prefix}_visit_duration"
+
+    async def async_update(
+        self, checkins: CheckinColumns, today: date
+    ) -> None:
+        """Import the daily rows that are new or may have changed."""
+        if not _recorder_loaded(self.hass):
+            return
+        days: defaultdict[date, list[float]] = defaultdict(lambda: [0, 0.0])
+        for ts, duration_s in zip(checkins.starts, checkins.durations):
+            day = days[dt_util.as_local(dt_util.utc_from_timestamp(ts)).date()]
+            day[0] += 1
+            day[1] += duration_s / 3600
+        if not days:
+            return
+
+        # Continue from the row VISIT_STATISTICS_RESYNC_DAYS before the last
+        # one, or start from scratch if there aren't that many yet.
+        first_day = min(days)
+        visits_sum = duration_sum = 0.0
+        visits_last = await _async_last_statistics(
+            self.hass, VISIT_STATISTICS_RESYNC_DAYS + 1, self.visits_id
+        )
+        duration_last = await _async_last_statistics(
+            self.hass, VISIT_STATISTICS_RESYNC_DAYS + 1, self.duration_id
+        )
+        if (
+            len(visits_last) > VISIT_STATISTICS_RESYNC_DAYS
+            and len(duration_last) > VISIT_STATISTICS_RESYNC_DAYS
+            and visits_last[-1]["start"] == duration_last[-1]["start"]
+        ):
+            base_start = dt_util.utc_from_timestamp(visits_last[-1]["start"])
+            first_day = dt_util.as_local(base_start).date() + timedelta(days=1)
+            visits_sum = visits_last[-1]["sum"] or 0.0
+            duration_sum = duration_last[-1]["sum"] or 0.0
+
+        visit_rows: list[StatisticData] = []
+        duration_rows: list[StatisticData] = []
+        day = first_day
+        while day <= today:
+            count, hours = days.get(day, (0, 0.0))
+            visits_sum += count
+            duration_sum += hours
+            start = dt_util.start_of_local_day(day)
+            visit_rows.append(StatisticData(start=start, state=count, sum=visits_sum))
+            duration_rows.append(
+                StatisticData(start=start, state=hours, sum=duration_sum)
+            )
+            day += timedelta(days=1)
+        if not visit_rows:
+            return
+
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name="Gym visits",
+                source=DOMAIN,
+                statistic_id=self.visits_id,
+                unit_class=None,
+                unit_of_measurement="visits",
+            ),
+            visit_rows,
+        )
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name="Gym time",
+                source=DOMAIN,
+                statistic_id=self.duration_id,
+                unit_class=DurationConverter.UNIT_CLASS,
+                unit_of_measurement=UnitOfTime.HOURS,
+            ),
+            duration_rows,
+        )
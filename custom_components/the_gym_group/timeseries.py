@@ -0,0 +1,382 @@
+"""Local, downsampled time series of busyness samples."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+import logging
+import math
+from pathlib import Path
+import struct
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import BUSYNESS_SERIES_FILE, BUSYNESS_SERIES_TIERS
+
+_LOGGER = logging.getLogger(__name__)
+
+# One closed bucket on disk: start (epoch seconds), sample count, mean and max
+# capacity, mean percentage (NaN if the API never reported one). Files are a
+# plain sequence of these records, so closing a bucket is a single append.
+_RECORD = struct.Struct("<qIfHf")
+
+_NAN = float("nan")
+
+# (start, samples, capacity mean, capacity max, percentage mean)
+type _Row = tuple[int, int, float, int, float]
+
+_DAY = int(timedelta(days=1).total_seconds())
+
+
+class _Tier:
+    """Closed buckets of one resolution, held column-wise in arrays.
+
+    The bucket being filled is kept separately as running sums and is only
+    added to the arrays (and the file) once a later sample closes it. Daily
+    buckets run from local midnight to local midnight, so they are 23 or 25
+    hours long across a DST change; other buckets are aligned to the epoch.
+    """
+
+    def __init__(self, name: str, width: int, retention: int, path: Path) -> None:
+        """Initialize an empty tier."""
+        self.name = name
+        self.width = width
+        self.retention = retention
+        self.path = path
+        self.local_days = width == _DAY
+        self.starts = array("q")
+        self.samples = array("I")
+        self.capacity_mean = array("f")
+        self.capacity_max = array("H")
+        self.percentage_mean = array("f")
+        # [start, samples, capacity sum, capacity max, percentage sum,
+        #  samples with a percentage] of the bucket being filled.
+        self._open: list[Any] | None = None
+
+    @property
+    def covered_until(self) -> int | None:
+        """Return the end of the newest bucket, closed or open."""
+        if self._open is not None:
+            return self._bucket_end(self._open[0])
+        if self.starts:
+            return self._bucket_end(self.starts[-1])
+        return None
+
+    def _bucket_start(self, timestamp: int) -> int:
+        """Return the start of the bucket holding a time, in epoch seconds."""
+        if not self.local_days:
+            return timestamp - timestamp % self.width
+        local = dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+        return int(dt_util.start_of_local_day(local).timestamp())
+
+    def _bucket_end(self, start: int) -> int:
+        """Return the end of the bucket starting at ``start``."""
+        if not self.local_days:
+            return start + self.width
+        local = dt_util.as_local(dt_util.utc_from_timestamp(start))
+        return int(
+            dt_util.start_of_local_day(local.date() + timedelta(days=1)).timestamp()
+        )
+
+    def load(self, data: bytes) -> bool:
+        """Append closed buckets read from disk.
+
+        Returns False if the data ended in a partial record (for example
+        after a crash mid-append), in which case the file must be rewritten
+        before anything else is appended to it.
+        """
+        usable = len(data) - len(data) % _RECORD.size
+        for start, samples, mean, peak, percentage in _RECORD.iter_unpack(
+            data[:usable]
+        ):
+            self._append(start, samples, mean, peak, percentage)
+        if usable == len(data):
+            return True
+        _LOGGER.warning(
+            "Ignoring %d trailing bytes in %s", len(data) - usable, self.path.name
+        )
+        return False
+
+    def dump(self) -> bytes:
+        """Return every closed bucket as records."""
+        return b"".join(
+            _RECORD.pack(*row)
+            for row in zip(
+                self.starts,
+                self.samples,
+                self.capacity_mean,
+                self.capacity_max,
+                self.percentage_mean,
+            )
+        )
+
+    def _append(
+        self, start: int, samples: int, mean: float, peak: int, percentage: float
+    ) -> None:
+        """Append a closed bucket to the arrays."""
+        self.starts.append(start)
+        self.samples.append(samples)
+        self.capacity_mean.append(mean)
+        self.capacity_max.append(peak)
+        self.percentage_mean.append(percentage)
+
+    def add(
+        self,
+        timestamp: int,
+        samples: int,
+        capacity_mean: float,
+        capacity_max: int,
+        percentage_mean: float,
+    ) -> _Row | None:
+        """Add samples to the open bucket, returning the bucket this closed.
+
+        A single sample is added with ``samples=1``; a closed bucket of a
+        finer tier is rolled up by passing its count and means.
+        """
+        start = self._bucket_start(timestamp)
+        closed = None
+        current = self._open
+        if current is not None and start != current[0]:
+            if start < current[0]:
+                # Out-of-order sample (e.g. the clock moved back); drop it.
+                return None
+            closed = self._close()
+            current = None
+        if current is None:
+            current = self._open = [start, 0, 0.0, 0, 0.0, 0]
+        current[1] += samples
+        current[2] += capacity_mean * samples
+        current[3] = max(current[3], capacity_max)
+        if not math.isnan(percentage_mean):
+            current[4] += percentage_mean * samples
+            current[5] += samples
+        return closed
+
+    def _close(self) -> _Row:
+        """Move the open bucket into the arrays and return it as a row."""
+        assert self._open is not None
+        start, samples, capacity_sum, peak, percentage_sum, with_percentage = (
+            self._open
+        )
+        row = (
+            start,
+            samples,
+            capacity_sum / samples,
+            peak,
+            percentage_sum / with_percentage if with_percentage else _NAN,
+        )
+        self._append(*row)
+        self._open = None
+        return row
+
+    def prune(self, now: int) -> bool:
+        """Drop buckets past retention, returning True if any were dropped.
+
+        Buckets are only dropped once a tenth of the retention has expired,
+        so the file is rewritten occasionally rather than on every append.
+        """
+        if not self.starts or self.starts[0] >= now - self.retention * 11 // 10:
+            return False
+        cut = bisect_left(self.starts, now - self.retention)
+        for column in (
+            self.starts,
+            self.samples,
+            self.capacity_mean,
+            self.capacity_max,
+            self.percentage_mean,
+        ):
+            del column[:cut]
+        return True
+
+    def query(self, start: int, end: int) -> list[dict[str, Any]]:
+        """Return the buckets overlapping [start, end), oldest first."""
+        first = self._bucket_start(start)
+        lo = bisect_left(self.starts, first)
+        hi = bisect_left(self.starts, end)
+        rows = [
+            (
+                self.starts[i],
+                self.samples[i],
+                self.capacity_mean[i],
+                self.capacity_max[i],
+                self.percentage_mean[i],
+            )
+            for i in range(lo, hi)
+        ]
+        current = self._open
+        if current is not None and first <= current[0] < end:
+            rows.append(
+                (
+                    current[0],
+                    current[1],
+                    current[2] / current[1],
+                    current[3],
+                    current[4] / current[5] if current[5] else _NAN,
+                )
+            )
+        return [
+            {
+                "start": datetime.fromtimestamp(
+                    bucket_start, tz=timezone.utc
+                ).isoformat(),
+                "samples": samples,
+                "capacity_mean": round(mean, 1),
+                "capacity_max": peak,
+                "percentage_mean": (
+                    None if math.isnan(percentage) else round(percentage, 1)
+                ),
+            }
+            for bucket_start, samples, mean, peak, percentage in rows
+        ]
+
+
+def _read_files(paths: list[Path]) -> list[bytes]:
+    """Return the contents of each file (empty if missing)."""
+    contents = []
+    for path in paths:
+        try:
+            contents.append(path.read_bytes())
+        except FileNotFoundError:
+            contents.append(b"")
+    return contents
+
+
+def _write_files(writes: list[tuple[Path, bytes, bool]]) -> None:
+    """Append to or overwrite each file in (path, data, append) order."""
+    for path, data, append in writes:
+        with path.open("ab" if append else "wb") as file:
+            file.write(data)
+
+
+class TheGymGroupBusynessSeries:
+    """Busyness samples downsampled into 5-minute, hourly and daily tiers.
+
+    Only the 5-minute tier receives raw samples. Each bucket it closes is
+    rolled up into the hourly tier, and each closed hourly bucket into the
+    daily tier, so a restart loses at most the 5-minute bucket in progress:
+    the coarser open buckets are rebuilt from the finer tiers on load.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the series for a config entry."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self.tiers = self._new_tiers()
+
+    def _new_tiers(self) -> list[_Tier]:
+        """Return empty tiers, finest first."""
+        storage_dir = Path(self.hass.config.path(".storage"))
+        return [
+            _Tier(
+                name,
+                int(width.total_seconds()),
+                int(retention.total_seconds()),
+                storage_dir
+                / BUSYNESS_SERIES_FILE.format(entry_id=self._entry_id, tier=name),
+            )
+            for name, (width, retention) in BUSYNESS_SERIES_TIERS.items()
+        ]
+
+    async def async_load(self) -> None:
+        """Load every tier from disk and rebuild the coarser open buckets."""
+        tiers = self._new_tiers()
+        contents = await self.hass.async_add_executor_job(
+            _read_files, [tier.path for tier in tiers]
+        )
+        now = int(datetime.now(timezone.utc).timestamp())
+        appended: dict[_Tier, list[_Row]] = {}
+        rewrite: set[_Tier] = set()
+        for tier, data in zip(tiers, contents):
+            if not tier.load(data) or tier.prune(now):
+                appended[tier] = []
+                rewrite.add(tier)
+        for finer, coarser in zip(tiers, tiers[1:]):
+            since = coarser.covered_until or 0
+            first = bisect_left(finer.starts, since)
+            for i in range(first, len(finer.starts)):
+                closed = coarser.add(
+                    finer.starts[i],
+                    finer.samples[i],
+                    finer.capacity_mean[i],
+                    finer.capacity_max[i],
+                    finer.percentage_mean[i],
+                )
+                if closed is not None:
+                    appended.setdefault(coarser, []).append(closed)
+        self.tiers = tiers
+        if appended:
+            await self._async_write(appended, rewrite)
+
+    async def async_add_sample(
+        self, now: datetime, capacity: int | None, percentage: float | None
+    ) -> None:
+        """Record one busyness sample, appending any buckets it closes."""
+        if capacity is None:
+            return
+        timestamp = int(now.timestamp())
+        closed = self.tiers[0].add(
+            timestamp, 1, capacity, capacity, _NAN if percentage is None else percentage
+        )
+        appended: dict[_Tier, list[_Row]] = {}
+        for finer, coarser in zip(self.tiers, self.tiers[1:]):
+            if closed is None:
+                break
+            appended[finer] = [closed]
+            closed = coarser.add(*closed)
+        else:
+            if closed is not None:
+                appended[self.tiers[-1]] = [closed]
+        if not appended:
+            return
+        rewrite = {tier for tier in appended if tier.prune(timestamp)}
+        await self._async_write(appended, rewrite)
+
+    async def _async_write(
+        self, appended: dict[_Tier, list[_Row]], rewrite: set[_Tier]
+    ) -> None:
+        """Append newly closed buckets, or rewrite the files of pruned tiers.
+
+        Records are packed here so the executor job never reads the arrays.
+        """
+        writes = [
+            (tier.path, tier.dump(), False)
+            if tier in rewrite
+            else (tier.path, b"".join(_RECORD.pack(*row) for row in rows), True)
+            for tier, rows in appended.items()
+        ]
+        try:
+            await self.hass.async_add_executor_job(_write_files, writes)
+        except OSError as err:
+            _LOGGER.warning("Could not write busyness history: %s", err)
+
+    def query(
+        self, start: datetime, end: datetime, resolution: str | None = None
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Return (tier name, buckets) for the range at the given resolution.
+
+        Without a resolution, the finest tier still retaining ``start`` is
+        used, falling back to the coarsest.
+        """
+        start_ts = int(start.timestamp())
+        end_ts = int(end.timestamp())
+        if resolution is None:
+            now = int(datetime.now(timezone.utc).timestamp())
+            tier = next(
+                (t for t in self.tiers if start_ts >= now - t.retention),
+                self.tiers[-1],
+            )
+        else:
+            tier = next(t for t in self.tiers if t.name == resolution)
+        return tier.name, tier.query(start_ts, end_ts)
+
+    async def async_remove(self) -> None:
+        """Delete the tier files."""
+
+        def _remove() -> None:
+            for tier in self.tiers:
+                tier.path.unlink(missing_ok=True)
+
+        await self.hass.async_add_executor_job(_remove)
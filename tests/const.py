@@ -21,6 +21,15 @@ MOCK_API_DATA = {
     "status": "open",
 }
 
+# The ``historical`` samples of a busyness response, on 2025-04-05 between
+# 10:20 and 12:10 UTC.
+MOCK_HISTORICAL_DATA = [
+    {"timestamp": 1743848400000, "currentCapacity": 10},
+    {"timestamp": 1743849000000, "currentCapacity": 20},
+    {"timestamp": 1743852600000, "currentCapacity": 5},
+    {"timestamp": 1743855000000, "currentCapacity": 30},
+]
+
 MOCK_CHECKIN_HISTORY_DATA = {
     "checkIns": [
         {
@@ -0,0 +1,79 @@
+"""Test The Gym Group check-in aggregation."""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from custom_components.the_gym_group.aggregation import (
+    CheckinColumns,
+    CheckinRecord,
+    aggregate_checkins,
+)
+
+NOW = datetime(2025, 4, 10, 12, 0, tzinfo=timezone.utc)
+LONDON = ZoneInfo("Europe/London")
+
+
+def test_aggregate_checkins_builds_all_views() -> None:
+    """Test one pass yields the latest, monthly, recent and calendar views."""
+    check_ins = [
+        {
+            "checkInDate": "2025-02-20T07:00:00",
+            "timezone": "Europe/London",
+            "gymLocationName": "Old Gym",
+            "duration": 3_600_000,
+        },
+        {
+            "checkInDate": "2025-04-09T18:00:00",
+            "timezone": "Europe/London",
+            "gymLocationName": "Test Gym",
+        },
+        {
+            "checkInDate": "2025-04-03T08:00:00",
+            "timezone": "Europe/London",
+            "gymLocationName": "Test Gym",
+            "duration": 5_400_000,
+        },
+    ]
+
+    result = aggregate_checkins(CheckinColumns.from_check_ins(check_ins), NOW)
+
+    assert result["latest_checkin"] == datetime(2025, 4, 9, 18, 0, tzinfo=LONDON)
+    assert result["latest_checkin_gym"] == "Test Gym"
+    assert result["latest_checkin_duration_minutes"] is None
+    assert result["monthly_visits"] == 2
+    assert result["monthly_hours"] == 1.5
+    checkins = result["checkins"]
+    # The columns are in chronological order, whatever order the input was.
+    assert checkins.history(result["recent_checkins_from"]) == [
+        {"datetime": "2025-04-03T08:00:00", "duration_minutes": 90},
+        {"datetime": "2025-04-09T18:00:00", "duration_minutes": None},
+    ]
+    first = checkins[0]
+    assert first == CheckinRecord(
+        datetime(2025, 2, 20, 7, 0, tzinfo=LONDON), 3_600_000, "Old Gym"
+    )
+    assert first.end == first.start + timedelta(hours=1)
+    assert checkins[2].end is None
+    assert checkins.as_dict() == {
+        "count": 3,
+        "gyms": ["Old Gym", "Test Gym"],
+        "timezones": ["Europe/London"],
+        "column_bytes": 3 * (8 + 4 + 2 + 1),
+    }
+
+
+def test_aggregate_checkins_tolerates_bad_records() -> None:
+    """Test unknown timezones fall back to UTC and bad dates are skipped."""
+    check_ins = [
+        {"checkInDate": "2025-04-05T10:00:00", "timezone": "Mars/Olympus_Mons"},
+        {"checkInDate": "not-a-date"},
+        {"duration": 60_000},
+    ]
+
+    result = aggregate_checkins(CheckinColumns.from_check_ins(check_ins), NOW)
+
+    checkins = result["checkins"]
+    assert len(checkins) == 1
+    assert checkins.start(0) == datetime(2025, 4, 5, 10, 0, tzinfo=timezone.utc)
+    assert checkins[0].gym_name == "The Gym Group"
+    assert result["latest_checkin"] == datetime(2025, 4, 5, 10, 0, tzinfo=timezone.utc)
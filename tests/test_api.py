@@ -0,0 +1,219 @@
+"""Test The Gym Group API client."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+from custom_components.the_gym_group.api import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CannotConnect,
+    CircuitOpen,
+    InvalidAuth,
+    TheGymGroupApiClient,
+    TheGymGroupCircuitBreaker,
+    TheGymGroupLoginGate,
+)
+from custom_components.the_gym_group.const import (
+    CIRCUIT_BASE_BACKOFF,
+    CIRCUIT_FAILURE_THRESHOLD,
+)
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from .const import MOCK_API_DATA, MOCK_USER_ID
+
+
+def _make_client(gate: TheGymGroupLoginGate, login: AsyncMock) -> TheGymGroupApiClient:
+    """Return a client whose first GET hits an expired session."""
+    client = TheGymGroupApiClient(
+        "test@email.com",
+        "test_password",
+        MagicMock(),
+        user_id=MOCK_USER_ID,
+        login_gate=gate,
+    )
+    client._do_get = AsyncMock(side_effect=[None, MOCK_API_DATA])  # type: ignore[method-assign]
+    client.async_login = login  # type: ignore[method-assign]
+    return client
+
+
+MOCK_SESSION = {"user_id": MOCK_USER_ID, "cookies": {"JSESSIONID": "abc123"}}
+
+
+async def _slow_login() -> str:
+    """Simulate a login round-trip."""
+    await asyncio.sleep(0)
+    return MOCK_USER_ID
+
+
+async def _slow_session_login() -> dict[str, Any]:
+    """Simulate a login round-trip through the gate."""
+    await asyncio.sleep(0)
+    return MOCK_SESSION
+
+
+async def test_concurrent_auth_failures_share_one_login() -> None:
+    """Test clients hitting an expired session together log in only once."""
+    gate = TheGymGroupLoginGate()
+    first_login = AsyncMock(side_effect=_slow_login)
+    second_login = AsyncMock(side_effect=_slow_login)
+    first = _make_client(gate, first_login)
+    second = _make_client(gate, second_login)
+
+    results = await asyncio.gather(
+        first.async_get_busyness(), second.async_get_busyness()
+    )
+
+    assert results == [MOCK_API_DATA, MOCK_API_DATA]
+    assert first_login.await_count + second_login.await_count == 1
+    assert gate.logins_performed == 1
+    assert gate.logins_avoided == 1
+
+
+async def test_failed_login_is_shared_with_waiters() -> None:
+    """Test callers queued behind a rejected login don't retry it."""
+    gate = TheGymGroupLoginGate()
+
+    async def _rejected_login() -> str:
+        await asyncio.sleep(0)
+        raise InvalidAuth("rejected")
+
+    first_login = AsyncMock(side_effect=_rejected_login)
+    second_login = AsyncMock(side_effect=_rejected_login)
+    first = _make_client(gate, first_login)
+    second = _make_client(gate, second_login)
+
+    results = await asyncio.gather(
+        first.async_get_busyness(),
+        second.async_get_busyness(),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, InvalidAuth) for result in results)
+    assert first_login.await_count + second_login.await_count == 1
+    assert gate.logins_performed == 0
+    assert gate.logins_avoided == 1
+
+
+async def test_stale_auth_failure_skips_login() -> None:
+    """Test a request sent before a completed login doesn't log in again."""
+    gate = TheGymGroupLoginGate()
+    login = AsyncMock(side_effect=_slow_login)
+
+    seen_generation = gate.generation
+    await gate.async_login(_slow_session_login, seen_generation)
+    assert await gate.async_login(login, seen_generation) == MOCK_SESSION
+
+    login.assert_not_awaited()
+    assert gate.logins_performed == 1
+    assert gate.logins_avoided == 1
+
+
+@pytest.mark.parametrize("user_id", ["", MOCK_USER_ID])
+async def test_ensure_logged_in_reuses_gate_user_id(user_id: str) -> None:
+    """Test a client without a user ID adopts the one from the shared gate."""
+    gate = TheGymGroupLoginGate()
+    gate.session = MOCK_SESSION
+    login = AsyncMock(side_effect=_slow_login)
+    client = TheGymGroupApiClient(
+        "test@email.com", "test_password", MagicMock(), user_id, login_gate=gate
+    )
+    client.async_login = login  # type: ignore[method-assign]
+
+    await client._ensure_logged_in()
+
+    login.assert_not_awaited()
+    assert client.user_id == MOCK_USER_ID
+
+
+async def test_session_export_and_restore() -> None:
+    """Test the user ID and host cookies survive an export/restore cycle."""
+    async with (
+        aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar()) as source,
+        aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar()) as target,
+    ):
+        client = TheGymGroupApiClient("test@email.com", "test_password", source)
+        client.restore_session(MOCK_SESSION)
+        exported = client.export_session()
+        assert exported == MOCK_SESSION
+
+        restored = TheGymGroupApiClient("test@email.com", "test_password", target)
+        restored.restore_session(exported)
+        assert restored.user_id == MOCK_USER_ID
+        assert restored.export_session() == MOCK_SESSION
+
+
+async def test_relogin_notifies_session_update() -> None:
+    """Test adopting a new session calls the persistence callback."""
+    gate = TheGymGroupLoginGate()
+    on_session_update = MagicMock()
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar()) as session:
+        client = TheGymGroupApiClient(
+            "test@email.com",
+            "test_password",
+            session,
+            user_id=MOCK_USER_ID,
+            login_gate=gate,
+            on_session_update=on_session_update,
+        )
+        client._do_get = AsyncMock(side_effect=[None, MOCK_API_DATA])  # type: ignore[method-assign]
+        client._async_login_and_export = AsyncMock(  # type: ignore[method-assign]
+            side_effect=_slow_session_login
+        )
+
+        assert await client.async_get_busyness() == MOCK_API_DATA
+
+        on_session_update.assert_called_once()
+        assert client.export_session()["cookies"] == MOCK_SESSION["cookies"]
+
+
+async def test_circuit_opens_after_repeated_failures() -> None:
+    """Test transport failures open the circuit and later requests fail fast."""
+    session = MagicMock()
+    session.get.side_effect = aiohttp.ClientConnectionError("refused")
+    client = TheGymGroupApiClient(
+        "test@email.com", "test_password", session, user_id=MOCK_USER_ID
+    )
+
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        with pytest.raises(CannotConnect):
+            await client.async_get_busyness()
+    assert client.circuit_breaker.state == CIRCUIT_OPEN
+
+    with pytest.raises(CircuitOpen):
+        await client.async_get_busyness()
+    assert session.get.call_count == CIRCUIT_FAILURE_THRESHOLD
+    assert client.circuit_breaker.requests_rejected == 1
+
+
+def test_circuit_probes_with_backoff(freezer: FrozenDateTimeFactory) -> None:
+    """Test one probe is let through per backoff, which doubles on failure."""
+    breaker = TheGymGroupCircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        breaker.record_failure()
+    assert 0 < breaker.retry_in <= CIRCUIT_BASE_BACKOFF.total_seconds()
+
+    freezer.tick(CIRCUIT_BASE_BACKOFF)
+    breaker.before_request()
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    # Only the probe goes through; everything else waits for its outcome.
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()
+
+    breaker.record_response(503)
+    assert breaker.state == CIRCUIT_OPEN
+    assert breaker.retry_in >= CIRCUIT_BASE_BACKOFF.total_seconds()
+
+    freezer.tick(CIRCUIT_BASE_BACKOFF * 2)
+    breaker.before_request()
+    breaker.record_response(200)
+    assert breaker.state == CIRCUIT_CLOSED
+    assert breaker.as_dict() == {
+        "state": CIRCUIT_CLOSED,
+        "consecutive_failures": 0,
+        "requests_rejected": 1,
+        "retry_in_seconds": 0,
+    }
@@ -0,0 +1,26 @@
+"""Smoke-test the benchmark suite at a small scale."""
+
+from benchmarks.suite import BASELINE_PATH, Result, run_suite
+
+
+def test_every_benchmark_runs() -> None:
+    """Test each benchmark runs and reports a time and peak allocation."""
+    results = run_suite(years=0.5, classes=10, runs=1)
+    assert [result.name for result in results] == [
+        "activity_aggregation",
+        "find_next_class",
+        "parse_checkin_dt",
+        "archive_load_columns",
+        "calendar_index_rebuild",
+        "calendar_month_queries",
+        "sensor_attributes",
+    ]
+    assert all(result.ms > 0 and result.kib > 0 for result in results)
+    assert BASELINE_PATH.is_file()
+
+
+def test_budgets_are_enforced() -> None:
+    """Test a benchmark over either budget is flagged."""
+    assert not Result("x", ms=1, kib=1, budget_ms=2, budget_kib=2).over_budget
+    assert Result("x", ms=3, kib=1, budget_ms=2, budget_kib=2).over_budget
+    assert Result("x", ms=1, kib=3, budget_ms=2, budget_kib=2).over_budget
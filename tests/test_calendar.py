@@ -0,0 +1,93 @@
+"""Test The Gym Group calendar."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.the_gym_group.aggregation import CheckinColumns
+from custom_components.the_gym_group.calendar import _EventIndex, _VisitIndex
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.core import HomeAssistant
+
+START = datetime(2025, 4, 10, 9, 0, tzinfo=timezone.utc)
+
+
+def _event(offset_hours: float, length_hours: float, summary: str) -> CalendarEvent:
+    """Return an event starting ``offset_hours`` after START."""
+    start = START + timedelta(hours=offset_hours)
+    return CalendarEvent(
+        start=start, end=start + timedelta(hours=length_hours), summary=summary
+    )
+
+
+def test_event_index_queries() -> None:
+    """Test point and range lookups against a deliberately unsorted list."""
+    index = _EventIndex(
+        [
+            _event(5, 1, "later"),
+            _event(0, 3, "long"),
+            _event(2, 0.5, "short"),
+            _event(-48, 1, "old"),
+        ]
+    )
+
+    assert [ev.summary for ev in index.events] == ["old", "long", "short", "later"]
+    assert index.current_or_next(START + timedelta(hours=2.75)).summary == "long"
+    assert index.current_or_next(START + timedelta(hours=3.5)).summary == "later"
+    assert index.current_or_next(START + timedelta(hours=7)) is None
+
+    overlapping = index.overlapping(
+        START + timedelta(hours=2.5), START + timedelta(hours=5)
+    )
+    assert [ev.summary for ev in overlapping] == ["long"]
+    assert _EventIndex([]).overlapping(START, START + timedelta(days=1)) == []
+
+
+async def test_calendar_events(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the calendar serves visits from its index via the service call."""
+    freezer.move_to("2025-04-10T12:00:00+00:00")
+    response = await hass.services.async_call(
+        "calendar",
+        "get_events",
+        {
+            "entity_id": "calendar.test_gym_gym_calendar",
+            "start_date_time": "2025-03-31T00:00:00+00:00",
+            "end_date_time": "2025-04-05T00:00:00+00:00",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    events = response["calendar.test_gym_gym_calendar"]["events"]
+    assert [ev["summary"] for ev in events] == ["Gym Visit", "Gym Visit"]
+    assert events[0]["start"] < events[1]["start"]
+
+
+def test_visit_index_builds_events_lazily() -> None:
+    """Test visit lookups over check-in columns match the event index."""
+    checkins = CheckinColumns()
+    for offset_hours, length_hours in ((-48, 1), (0, 3), (2, 0), (5, 1)):
+        checkins.append(
+            START + timedelta(hours=offset_hours),
+            int(length_hours * 3_600_000),
+            "Test Gym",
+        )
+    index = _VisitIndex(checkins)
+
+    current = index.current_or_next(START + timedelta(hours=2.75))
+    assert (current.start, current.end) == (START, START + timedelta(hours=3))
+    upcoming = index.current_or_next(START + timedelta(hours=3.5))
+    assert upcoming.start == START + timedelta(hours=5)
+    assert index.current_or_next(START + timedelta(hours=7)) is None
+
+    # The visit without a duration is shown as lasting an hour.
+    overlapping = index.overlapping(
+        START + timedelta(hours=2.5), START + timedelta(hours=5)
+    )
+    assert [ev.start for ev in overlapping] == [START, START + timedelta(hours=2)]
+    assert all(ev.location == "Test Gym" for ev in overlapping)
+    # Events built for one lookup are reused by the next.
+    assert index.overlapping(START, START + timedelta(hours=1))[0] is current
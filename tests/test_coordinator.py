@@ -0,0 +1,611 @@
+"""Test The Gym Group coordinators."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from custom_components.the_gym_group.api import CannotConnect, CircuitOpen
+from custom_components.the_gym_group.const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    DOMAIN,
+    EVENT_CHECKED_IN,
+    EVENT_CLASS_BOOKED,
+    EVENT_CLASS_CANCELLED,
+    EVENT_CLASS_SPOTS_CHANGED,
+    EVENT_VISIT_FINISHED,
+    HISTORY_RETRY_INTERVAL,
+    SCHEDULE_RETRY_INTERVAL,
+)
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    MOCK_API_DATA,
+    MOCK_CHECKIN_HISTORY_DATA,
+    MOCK_CONFIG,
+    MOCK_GYM_ID,
+    MOCK_SCHEDULE_DATA,
+)
+
+# "now" in the tests, and a day, in epoch milliseconds.
+NOW_MS = 1_744_286_400_000
+DAY_MS = 86_400_000
+
+NEW_CHECKIN = {
+    "checkInDate": "2025-04-09T18:00:00",
+    "timezone": "Europe/London",
+    "gymLocationName": "Test Gym",
+    "duration": 2700000,
+}
+
+
+@pytest.fixture(autouse=True)
+def _freeze_time(freezer: FrozenDateTimeFactory) -> None:
+    """Pin "now" shortly after the mock check-ins."""
+    freezer.move_to("2025-04-10T12:00:00+00:00")
+
+
+async def _setup_entry(
+    hass: HomeAssistant, history: AsyncMock
+) -> MockConfigEntry:
+    """Set up an entry with the given check-in history mock."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, version=2)
+    entry.add_to_hass(hass)
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            return_value=MOCK_API_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            history,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=MOCK_SCHEDULE_DATA,
+        ),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
+
+
+async def test_first_sync_fetches_full_window(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test an empty archive is filled from the full one-year window."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+
+    history.assert_awaited_once_with("2024-04-10T12:00:00", "2025-04-10T12:00:00")
+    stored = hass_storage[f"{DOMAIN}.{entry.entry_id}.checkins"]["data"]
+    # The archive keeps columns only and writes them back in the API's shape.
+    assert stored["check_ins"] == MOCK_CHECKIN_HISTORY_DATA["checkIns"]
+
+
+async def test_incremental_sync_merges_new_checkins(hass: HomeAssistant) -> None:
+    """Test later syncs only request the window since the newest visit."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+    coordinator = entry.runtime_data.history
+
+    history.reset_mock()
+    history.return_value = {"checkIns": [NEW_CHECKIN]}
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+        history,
+    ):
+        await coordinator.async_refresh()
+
+    # Newest archived visit (2025-04-03T08:00) minus the two-day overlap.
+    history.assert_awaited_once_with("2025-04-01T08:00:00", "2025-04-10T12:00:00")
+    assert coordinator.data["monthly_visits"] == 3
+    assert coordinator.data["latest_checkin_duration_minutes"] == 45
+
+
+async def test_archive_restored_from_storage(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test a stored archive is used and only the recent window is fetched."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, version=2)
+    hass_storage[f"{DOMAIN}.{entry.entry_id}.checkins"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}.checkins",
+        "data": {"check_ins": MOCK_CHECKIN_HISTORY_DATA["checkIns"]},
+    }
+    history = AsyncMock(return_value={"checkIns": []})
+    entry.add_to_hass(hass)
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            return_value=MOCK_API_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            history,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=MOCK_SCHEDULE_DATA,
+        ),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    history.assert_awaited_once_with("2025-04-01T08:00:00", "2025-04-10T12:00:00")
+    assert entry.runtime_data.history.data["monthly_visits"] == 2
+
+
+async def test_archive_removed_with_entry(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test removing the entry deletes its archive."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+    assert f"{DOMAIN}.{entry.entry_id}.checkins" in hass_storage
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert f"{DOMAIN}.{entry.entry_id}.checkins" not in hass_storage
+
+
+async def test_history_failure_serves_archive(hass: HomeAssistant) -> None:
+    """Test a history timeout publishes the archived visits and retries sooner."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+    coordinator = entry.runtime_data.history
+
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+        side_effect=CannotConnect("Transport error: timeout"),
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data["monthly_visits"] == 2
+    assert coordinator.last_error == "Transport error: timeout"
+    assert coordinator.update_interval <= HISTORY_RETRY_INTERVAL
+
+
+async def test_history_failure_before_first_sync_fails_setup(
+    hass: HomeAssistant,
+) -> None:
+    """Test setup is retried when there is no history to fall back on."""
+    entry = await _setup_entry(
+        hass, AsyncMock(side_effect=CannotConnect("HTTP 502"))
+    )
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_schedule_failure_keeps_last_schedule(hass: HomeAssistant) -> None:
+    """Test a schedule failure republishes the last schedule and retries sooner."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+    coordinator = entry.runtime_data.schedule
+
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+        side_effect=CannotConnect("HTTP 503"),
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data["next_class"]["available_spots"] == 6
+    assert coordinator.last_error == "HTTP 503"
+    assert coordinator.update_interval == SCHEDULE_RETRY_INTERVAL
+
+
+async def test_schedule_refreshes_without_history(hass: HomeAssistant) -> None:
+    """Test the schedule is refreshed on its own, without fetching history."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+    coordinator = entry.runtime_data.schedule
+    assert coordinator.update_interval < entry.runtime_data.history.update_interval
+
+    history.reset_mock()
+    new_schedule = [
+        {"brief": {**MOCK_SCHEDULE_DATA[0]["brief"], "totalBooked": 15}},
+    ]
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            history,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=new_schedule,
+        ),
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    history.assert_not_awaited()
+    assert coordinator.data["next_class"]["available_spots"] == 1
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{MOCK_GYM_ID}_next_class"
+    )
+    assert hass.states.get(entity_id).attributes["available_spots"] == 1
+
+
+async def test_open_circuit_serves_stale_data(hass: HomeAssistant) -> None:
+    """Test the coordinators keep their data, marked stale, during an outage."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+    busyness = entry.runtime_data.busyness
+    history_coordinator = entry.runtime_data.history
+    schedule_coordinator = entry.runtime_data.schedule
+    breaker = busyness.api_client.circuit_breaker
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            side_effect=CircuitOpen("paused"),
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            side_effect=CircuitOpen("paused"),
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            side_effect=CircuitOpen("paused"),
+        ),
+    ):
+        await busyness.async_refresh()
+        await history_coordinator.async_refresh()
+        await schedule_coordinator.async_refresh()
+
+    assert busyness.last_update_success
+    assert history_coordinator.last_update_success
+    assert history_coordinator.data["monthly_visits"] == 2
+    assert schedule_coordinator.last_update_success
+    assert schedule_coordinator.stale_since is not None
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{MOCK_GYM_ID}_busyness"
+    )
+    state = hass.states.get(entity_id)
+    assert state.state == str(MOCK_API_DATA["currentCapacity"])
+    assert state.attributes["stale_since"] == busyness.stale_since
+    assert busyness.update_interval.total_seconds() <= breaker.retry_in + 1
+
+    breaker.record_success()
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+        return_value=MOCK_API_DATA,
+    ):
+        await busyness.async_refresh()
+    assert busyness.stale_since is None
+    assert "stale_since" not in hass.states.get(entity_id).attributes
+
+
+async def test_only_changed_sections_are_written(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test an update only writes the entities whose data changed."""
+    entry = await _setup_entry(
+        hass, AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    )
+    coordinator = entry.runtime_data.busyness
+    entities = {
+        suffix: hass.data["entity_components"]["sensor"].get_entity(
+            entity_registry.async_get_entity_id(
+                "sensor", DOMAIN, f"{MOCK_GYM_ID}_{suffix}"
+            )
+        )
+        for suffix in ("busyness", "status", "busyness_forecast")
+    }
+    writes = {suffix: 0 for suffix in entities}
+    for suffix, entity in entities.items():
+
+        def _count(suffix: str = suffix) -> None:
+            writes[suffix] += 1
+
+        entity.async_write_ha_state = _count
+
+    # An identical payload only reaches the sensor that depends on the time.
+    coordinator.async_set_updated_data(dict(MOCK_API_DATA))
+    assert writes == {"busyness": 0, "status": 0, "busyness_forecast": 1}
+
+    coordinator.async_set_updated_data({**MOCK_API_DATA, "status": "closed"})
+    assert writes == {"busyness": 0, "status": 1, "busyness_forecast": 2}
+
+    # Availability shows on every entity, whatever changed.
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+    assert writes == {"busyness": 1, "status": 2, "busyness_forecast": 3}
+
+
+async def test_attributes_are_computed_once_per_update(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test a sensor's attributes are cached until the data changes."""
+    entry = await _setup_entry(
+        hass, AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    )
+    entity = hass.data["entity_components"]["sensor"].get_entity(
+        entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{MOCK_GYM_ID}_last_checkin"
+        )
+    )
+    attributes = entity.extra_state_attributes
+    assert entity.extra_state_attributes is attributes
+
+    entry.runtime_data.history.async_set_updated_data(
+        dict(entry.runtime_data.history.data)
+    )
+    assert entity.extra_state_attributes is not attributes
+    assert entity.extra_state_attributes == attributes
+
+
+async def test_refresh_fires_events_for_changes(hass: HomeAssistant) -> None:
+    """Test a refresh fires one bus event per check-in and class change."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+    event_types = (
+        EVENT_CHECKED_IN,
+        EVENT_VISIT_FINISHED,
+        EVENT_CLASS_BOOKED,
+        EVENT_CLASS_CANCELLED,
+        EVENT_CLASS_SPOTS_CHANGED,
+    )
+    events = {
+        event_type: async_capture_events(hass, event_type)
+        for event_type in event_types
+    }
+    # The first sync announced nothing.
+    assert not any(events.values())
+
+    in_progress = {**NEW_CHECKIN, "duration": None}
+    booked = MOCK_SCHEDULE_DATA[0]["brief"]
+    new_class = {
+        **booked,
+        "id": "class-uuid-002",
+        "name": "Spin",
+        # Two days after "now", inside the window the first sync fetched.
+        "startDateTime": NOW_MS + 2 * DAY_MS,
+        "endDateTime": NOW_MS + 2 * DAY_MS + 3_600_000,
+    }
+    schedule = [
+        {"brief": {**booked, "totalBooked": 12}},
+        {"brief": new_class},
+    ]
+
+    async def _refresh(check_ins: list[dict[str, Any]], schedule: list) -> None:
+        with (
+            patch(
+                "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+                return_value={"checkIns": check_ins},
+            ),
+            patch(
+                "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+                return_value=schedule,
+            ),
+        ):
+            await entry.runtime_data.history.async_refresh()
+            await entry.runtime_data.schedule.async_refresh()
+        await hass.async_block_till_done()
+
+    await _refresh([in_progress], schedule)
+    assert {t: len(e) for t, e in events.items()} == {
+        EVENT_CHECKED_IN: 1,
+        EVENT_VISIT_FINISHED: 0,
+        EVENT_CLASS_BOOKED: 1,
+        EVENT_CLASS_CANCELLED: 0,
+        EVENT_CLASS_SPOTS_CHANGED: 1,
+    }
+    checked_in = events[EVENT_CHECKED_IN][0].data
+    assert checked_in["config_entry_id"] == entry.entry_id
+    assert checked_in["device_id"] is not None
+    assert checked_in["check_in"] == "2025-04-09T18:00:00+01:00"
+    assert checked_in["duration_minutes"] is None
+    spots = events[EVENT_CLASS_SPOTS_CHANGED][0].data
+    assert (spots["available_spots"], spots["previous_available_spots"]) == (4, 6)
+    assert events[EVENT_CLASS_BOOKED][0].data["name"] == "Spin"
+
+    # Unchanged data fires nothing; the visit finishing and a class being
+    # dropped from the schedule before it starts each fire once.
+    await _refresh([in_progress], schedule)
+    await _refresh([NEW_CHECKIN], schedule[:1])
+    assert {t: len(e) for t, e in events.items()} == {
+        EVENT_CHECKED_IN: 1,
+        EVENT_VISIT_FINISHED: 1,
+        EVENT_CLASS_BOOKED: 1,
+        EVENT_CLASS_CANCELLED: 1,
+        EVENT_CLASS_SPOTS_CHANGED: 1,
+    }
+    assert events[EVENT_VISIT_FINISHED][0].data["duration_minutes"] == 45
+    assert events[EVENT_CLASS_CANCELLED][0].data["class_id"] == "class-uuid-002"
+
+
+def _class(class_id: str, start_ms: int) -> dict[str, Any]:
+    """Return a booked class starting at the given time."""
+    brief = MOCK_SCHEDULE_DATA[0]["brief"]
+    return {
+        "brief": {
+            **brief,
+            "id": class_id,
+            "startDateTime": start_ms,
+            "endDateTime": start_ms + 3_600_000,
+        }
+    }
+
+
+async def test_classes_entering_window_are_not_booked(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test classes only fetched because the window moved aren't announced."""
+    entry = await _setup_entry(
+        hass, AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    )
+    booked_events = async_capture_events(hass, EVENT_CLASS_BOOKED)
+
+    # A day later the window reaches a day further, picking up a class that
+    # was booked long ago, next to one booked since the last refresh.
+    freezer.tick(timedelta(days=1))
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+        return_value=[
+            _class("new", NOW_MS + 3 * DAY_MS),
+            _class("entered", NOW_MS + 7 * DAY_MS + 3_600_000),
+        ],
+    ):
+        await entry.runtime_data.schedule.async_refresh()
+        await hass.async_block_till_done()
+
+    assert [event.data["class_id"] for event in booked_events] == ["new"]
+
+
+async def test_restored_schedule_only_announces_its_window(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test a schedule restored from an old snapshot only covers its window."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, version=2)
+    entry.add_to_hass(hass)
+    key = f"{DOMAIN}.{entry.entry_id}.schedule_snapshot"
+    hass_storage[key] = {
+        "version": 1,
+        "key": key,
+        # Fetched three days ago, so its window ended four days from now.
+        "data": {
+            "fetched_at": "2025-04-07T12:00:00+00:00",
+            "payload": [_class("known", NOW_MS + DAY_MS)],
+        },
+    }
+    booked_events = async_capture_events(hass, EVENT_CLASS_BOOKED)
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            return_value=MOCK_API_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            return_value=MOCK_CHECKIN_HISTORY_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=[
+                _class("known", NOW_MS + DAY_MS),
+                _class("new", NOW_MS + 2 * DAY_MS),
+                _class("entered", NOW_MS + 5 * DAY_MS),
+            ],
+        ),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert [event.data["class_id"] for event in booked_events] == ["new"]
+
+
+async def test_open_visit_polls_today_quickly(hass: HomeAssistant) -> None:
+    """Test an open check-in switches to fast polls of today's window."""
+    history = AsyncMock(return_value=MOCK_CHECKIN_HISTORY_DATA)
+    entry = await _setup_entry(hass, history)
+    coordinator = entry.runtime_data.history
+    assert coordinator.update_interval > timedelta(minutes=10)
+
+    in_progress = {**NEW_CHECKIN, "checkInDate": "2025-04-10T12:50:00"}
+    del in_progress["duration"]
+    history.reset_mock()
+    history.return_value = {"checkIns": [in_progress]}
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+        history,
+    ):
+        await coordinator.async_refresh()
+        assert coordinator.poll_scheduler.reason == "visit_in_progress"
+        assert coordinator.update_interval <= timedelta(minutes=7, seconds=30)
+        await coordinator.async_refresh()
+
+    # The follow-up poll only asks for today (local midnight, in UTC).
+    assert history.await_args_list[-1].args == (
+        "2025-04-10T07:00:00",
+        "2025-04-10T12:00:00",
+    )
+
+
+async def test_class_watch_tracks_spots_of_classes_starting_soon(
+    hass: HomeAssistant,
+) -> None:
+    """Test a class starting soon gets a spots sensor polled on its own."""
+    soon = {
+        "brief": {
+            **MOCK_SCHEDULE_DATA[0]["brief"],
+            "id": "class-soon",
+            "name": "Spin",
+            # 2025-04-10T12:30:00Z, half an hour after "now".
+            "startDateTime": 1_744_288_200_000,
+            "endDateTime": 1_744_290_000_000,
+        }
+    }
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, version=2)
+    entry.add_to_hass(hass)
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            return_value=MOCK_API_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            return_value=MOCK_CHECKIN_HISTORY_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=[*MOCK_SCHEDULE_DATA, soon],
+        ) as schedule,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    class_watch = entry.runtime_data.class_watch
+
+    # Only the window up to the watched class was requested, and the poll
+    # interval is short with the class half an hour away.
+    assert schedule.await_args_list[-1].args == (1_744_286_400_000, 1_744_288_200_001)
+    assert class_watch.update_interval <= timedelta(minutes=3)
+    entity_id = "sensor.test_gym_spin_thu_05_30_spots"
+    assert hass.states.get(entity_id).state == "6"
+
+    spots_events = async_capture_events(hass, EVENT_CLASS_SPOTS_CHANGED)
+    cancelled_events = async_capture_events(hass, EVENT_CLASS_CANCELLED)
+    history = AsyncMock(return_value={"checkIns": []})
+    fuller = {"brief": {**soon["brief"], "totalBooked": 15}}
+    cancelled = {"brief": {**soon["brief"], "totalBooked": 15, "cancelled": True}}
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            history,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=[fuller],
+        ) as schedule,
+    ):
+        await class_watch.async_refresh()
+        await hass.async_block_till_done()
+        assert hass.states.get(entity_id).state == "1"
+        assert len(spots_events) == 1
+
+        schedule.return_value = [cancelled]
+        await class_watch.async_refresh()
+        await hass.async_block_till_done()
+        assert len(cancelled_events) == 1
+        assert hass.states.get(entity_id) is None
+
+        # The schedule refresh sees the same schedule and announces nothing
+        # the class watch already has.
+        schedule.return_value = [*MOCK_SCHEDULE_DATA, cancelled]
+        await entry.runtime_data.schedule.async_refresh()
+        await hass.async_block_till_done()
+
+    history.assert_not_awaited()
+    assert (len(spots_events), len(cancelled_events)) == (1, 1)
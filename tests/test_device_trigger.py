@@ -1,6 +1,6 @@
 """Test The Gym Group device triggers."""
 
-from custom_components.the_gym_group.const import DOMAIN
+from custom_components.the_gym_group.const import DOMAIN, EVENT_CLASS_CANCELLED
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -77,6 +77,43 @@ async def test_get_triggers(
     assert [{k: t[k] for k in trigger_keys} for t in triggers] == expected_triggers
 
 
+async def test_get_activity_triggers(
+    hass: HomeAssistant, device_id: str, entity_registry: er.EntityRegistry
+) -> None:
+    """Test each account on a device gets its own activity event triggers."""
+    entry_ids = []
+    for index in range(2):
+        config_entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+        config_entry.add_to_hass(hass)
+        entry_ids.append(config_entry.entry_id)
+        entity_registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            f"{MOCK_GYM_ID}_last_checkin_{index}",
+            config_entry=config_entry,
+            device_id=device_id,
+            translation_key="last_checkin",
+        )
+    all_triggers = await _ha_get_device_automations(
+        hass, DeviceAutomationType.TRIGGER, [device_id]
+    )
+    trigger_types = [
+        "checked_in",
+        "visit_finished",
+        "class_booked",
+        "class_cancelled",
+        "class_spots_changed",
+    ]
+    assert [
+        (t["config_entry_id"], t["type"]) for t in all_triggers[device_id]
+    ] == [
+        (entry_id, trigger_type)
+        for entry_id in entry_ids
+        for trigger_type in trigger_types
+    ]
+    assert all("entity_id" not in t for t in all_triggers[device_id])
+
+
 async def test_if_fires_on_capacity_above(
     hass: HomeAssistant,
     busyness_entity_id: str,
@@ -154,3 +191,49 @@ async def test_if_fires_on_status_change(
     hass.states.async_set(status_entity_id, "open")
     await hass.async_block_till_done()
     assert len(service_calls) == 1
+
+
+async def test_if_fires_on_class_cancelled(
+    hass: HomeAssistant, device_id: str, service_calls: list[ServiceCall]
+) -> None:
+    """Test the class_cancelled trigger fires only for its own account."""
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: [
+                {
+                    "trigger": {
+                        "platform": "device",
+                        "domain": DOMAIN,
+                        "device_id": device_id,
+                        "config_entry_id": "mine",
+                        "type": "class_cancelled",
+                    },
+                    "action": {
+                        "service": "test.automation",
+                        "data_template": {"name": "{{ trigger.event.data.name }}"},
+                    },
+                }
+            ]
+        },
+    )
+
+    hass.bus.async_fire(
+        EVENT_CLASS_CANCELLED,
+        {"config_entry_id": "mine", "device_id": "other", "name": "Yoga"},
+    )
+    # Another account at the same gym shares the device.
+    hass.bus.async_fire(
+        EVENT_CLASS_CANCELLED,
+        {"config_entry_id": "theirs", "device_id": device_id, "name": "HIIT"},
+    )
+    await hass.async_block_till_done()
+    assert len(service_calls) == 0
+
+    hass.bus.async_fire(
+        EVENT_CLASS_CANCELLED,
+        {"config_entry_id": "mine", "device_id": device_id, "name": "Spin"},
+    )
+    await hass.async_block_till_done()
+    assert [call.data["name"] for call in service_calls] == ["Spin"]
@@ -5,6 +5,7 @@ from custom_components.the_gym_group.diagnostics import (
 )
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from syrupy import SnapshotAssertion
+from syrupy.filters import props
 
 from homeassistant.core import HomeAssistant
 
@@ -18,4 +19,5 @@ async def test_diagnostics(
     entry = loaded_entry
 
     diagnostics_data = await async_get_config_entry_diagnostics(hass, entry)
-    assert diagnostics_data == snapshot
+    # Snapshot fetch times depend on the wall clock.
+    assert diagnostics_data == snapshot(exclude=props("fetched_at"))
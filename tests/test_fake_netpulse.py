@@ -0,0 +1,82 @@
+"""Test the API client end to end against the local Netpulse stand-in."""
+
+from aiohttp import ClientSession, CookieJar
+from benchmarks.fake_netpulse import FakeNetpulse, FakeNetpulseConfig
+from custom_components.the_gym_group.api import (
+    CircuitOpen,
+    InvalidAuth,
+    TheGymGroupCircuitBreaker,
+)
+from custom_components.the_gym_group.metrics import ENDPOINT_HISTORY
+import pytest
+
+
+async def test_real_http_login_cookies_and_gzip(socket_enabled: None) -> None:
+    """Test a client logs in and fetches gzipped payloads over real HTTP."""
+    async with (
+        FakeNetpulse(FakeNetpulseConfig(years=2)) as server,
+        ClientSession(cookie_jar=CookieJar(unsafe=True)) as session,
+    ):
+        client = server.create_client(session, "member@example.com")
+        busyness = await client.async_get_busyness()
+        history = await client.async_get_checkin_history(
+            "2000-01-01T00:00:00", "2100-01-01T00:00:00"
+        )
+
+    assert client.user_id
+    assert len(busyness["historical"]) == 96
+    assert len(history["checkIns"]) == server.check_in_count > 300
+    # The client logged in once and both fetches reused the session cookie.
+    assert server.statuses == {200: 3}
+    sizes = client.metrics.as_dict()["endpoints"][ENDPOINT_HISTORY]["response_bytes"]
+    # The body the client saw is the decompressed JSON.
+    assert sizes["mean"] > 30_000
+
+
+async def test_expired_session_logs_in_again(socket_enabled: None) -> None:
+    """Test a 401 after the session expires triggers exactly one re-login."""
+    async with (
+        FakeNetpulse(FakeNetpulseConfig(years=0.1, session_ttl=2)) as server,
+        ClientSession(cookie_jar=CookieJar(unsafe=True)) as session,
+    ):
+        client = server.create_client(session, "member@example.com")
+        for _ in range(3):
+            await client.async_get_busyness()
+
+    assert server.faults["session_expired"] == 1
+    assert server.requests["/np/exerciser/login"] == 2
+    assert client.metrics.as_dict()["endpoints"]["busyness"]["relogins"] == 1
+
+
+async def test_wrong_password_is_rejected(socket_enabled: None) -> None:
+    """Test the stand-in rejects logins with the wrong password."""
+    async with (
+        FakeNetpulse(FakeNetpulseConfig(password="secret")) as server,
+        ClientSession(cookie_jar=CookieJar(unsafe=True)) as session,
+    ):
+        with pytest.raises(InvalidAuth):
+            await server.create_client(session, "member@example.com").async_login()
+
+
+async def test_error_burst_opens_the_circuit(socket_enabled: None) -> None:
+    """Test a burst of 503s opens the breaker shared by the clients."""
+    config = FakeNetpulseConfig(years=0.1, error_rate=1.0, error_burst=10)
+    breaker = TheGymGroupCircuitBreaker(failure_threshold=3)
+    async with (
+        FakeNetpulse(config) as server,
+        ClientSession(cookie_jar=CookieJar(unsafe=True)) as session,
+    ):
+        clients = [
+            server.create_client(
+                session, f"member{i}@example.com", circuit_breaker=breaker
+            )
+            for i in range(4)
+        ]
+        for client in clients:
+            with pytest.raises(Exception):  # noqa: B017
+                await client.async_login()
+        with pytest.raises(CircuitOpen):
+            await clients[0].async_get_busyness()
+
+    assert server.statuses == {503: 3}
+    assert breaker.as_dict()["requests_rejected"] >= 2
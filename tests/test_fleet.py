@@ -0,0 +1,135 @@
+"""Test the fleet scheduler shared by every entry."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from custom_components.the_gym_group.const import (
+    DOMAIN,
+    HISTORY_SCAN_INTERVAL,
+    SCAN_INTERVAL,
+)
+from custom_components.the_gym_group.fleet import TheGymGroupFleetScheduler
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    MOCK_API_DATA,
+    MOCK_CHECKIN_HISTORY_DATA,
+    MOCK_CONFIG,
+    MOCK_SCHEDULE_DATA,
+)
+
+# A wall-clock time that is a whole number of hours since the epoch.
+ALIGNED = datetime(2025, 4, 10, 12, 0, tzinfo=timezone.utc)
+HOST = "thegymgroup.netpulse.com"
+
+
+def test_polls_are_spread_across_the_interval() -> None:
+    """Test distinct keys get evenly spaced phases and shared keys align."""
+    scheduler = TheGymGroupFleetScheduler()
+    scheduler.async_register("busyness", "one", "gym-a")
+    scheduler.async_register("busyness", "two", "gym-b")
+    scheduler.async_register("busyness", "three", "gym-a")
+    interval = timedelta(minutes=30)
+
+    assert scheduler.phase("busyness", "one") == 0.0
+    assert scheduler.phase("busyness", "two") == 0.5
+    assert scheduler.next_interval("busyness", "one", interval, ALIGNED) == interval
+    assert scheduler.next_interval(
+        "busyness", "two", interval, ALIGNED
+    ) == timedelta(minutes=15)
+    assert scheduler.next_interval("busyness", "three", interval, ALIGNED) == interval
+    # Just past its poll point, an owner waits a whole interval less that bit.
+    assert scheduler.next_interval(
+        "busyness", "one", interval, ALIGNED + timedelta(minutes=1)
+    ) == timedelta(minutes=29)
+
+    scheduler.async_unregister("busyness", "two")
+    assert scheduler.phase("busyness", "two") is None
+    assert scheduler.as_dict()["groups"] == {"busyness": 1}
+    assert scheduler.next_interval("busyness", "two", interval, ALIGNED) == interval
+
+
+async def test_request_slots_cap_in_flight_requests() -> None:
+    """Test requests beyond the per-host limit queue until a slot frees up."""
+    scheduler = TheGymGroupFleetScheduler(
+        max_in_flight_per_host=2, requests_per_second=1000, burst=100
+    )
+    release = asyncio.Event()
+
+    async def _request() -> None:
+        async with scheduler.async_request_slot(HOST):
+            await release.wait()
+
+    tasks = [asyncio.create_task(_request()) for _ in range(5)]
+    await asyncio.sleep(0)
+    host = scheduler.as_dict()["hosts"][HOST]
+    assert (host["in_flight"], host["queued"]) == (2, 3)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    host = scheduler.as_dict()["hosts"][HOST]
+    assert (host["in_flight"], host["queued"], host["requests"]) == (0, 0, 5)
+    assert host["max_wait_ms"] >= host["mean_wait_ms"]
+
+
+async def test_token_bucket_limits_request_rate() -> None:
+    """Test requests past the burst wait for the bucket to refill."""
+    scheduler = TheGymGroupFleetScheduler(requests_per_second=50, burst=1)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(3):
+        async with scheduler.async_request_slot(HOST):
+            pass
+
+    # The first request uses the burst token; the other two wait ~20 ms each.
+    assert loop.time() - started >= 0.035
+    assert scheduler.as_dict()["hosts"][HOST]["max_wait_ms"] > 0
+
+
+async def test_coordinators_poll_at_their_phase(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test entries share a busyness phase per gym but stagger history polls."""
+    freezer.move_to(ALIGNED)
+    entries = []
+    for username in ("one@email.com", "two@email.com"):
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={**MOCK_CONFIG, CONF_USERNAME: username}, version=2
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            return_value=MOCK_API_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            return_value=MOCK_CHECKIN_HISTORY_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=MOCK_SCHEDULE_DATA,
+        ),
+    ):
+        await hass.config_entries.async_setup(entries[0].entry_id)
+        await hass.async_block_till_done()
+        for entry in entries:
+            await entry.runtime_data.busyness.async_refresh()
+            await entry.runtime_data.history.async_refresh()
+        await hass.async_block_till_done()
+
+    # Both accounts use the mock gym, so their busyness polls coincide.
+    assert [entry.runtime_data.busyness.update_interval for entry in entries] == [
+        SCAN_INTERVAL,
+        SCAN_INTERVAL,
+    ]
+    assert sorted(
+        entry.runtime_data.history.update_interval for entry in entries
+    ) == [HISTORY_SCAN_INTERVAL / 2, HISTORY_SCAN_INTERVAL]
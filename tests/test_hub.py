@@ -0,0 +1,105 @@
+"""Test busyness sharing between entries for the same gym."""
+
+from typing import Any
+from unittest.mock import patch
+
+from custom_components.the_gym_group.api import InvalidAuth, TheGymGroupApiClient
+from custom_components.the_gym_group.const import DOMAIN
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    MOCK_API_DATA,
+    MOCK_CHECKIN_HISTORY_DATA,
+    MOCK_CONFIG,
+    MOCK_SCHEDULE_DATA,
+)
+
+
+async def _setup_entries(hass: HomeAssistant) -> list[MockConfigEntry]:
+    """Set up two entries whose accounts share the mock gym."""
+    entries = []
+    for username in ("one@email.com", "two@email.com"):
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={**MOCK_CONFIG, CONF_USERNAME: username}, version=2
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            return_value=MOCK_API_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            return_value=MOCK_CHECKIN_HISTORY_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=MOCK_SCHEDULE_DATA,
+        ),
+    ):
+        # Setting up the integration sets up both entries.
+        await hass.config_entries.async_setup(entries[0].entry_id)
+        await hass.async_block_till_done()
+    return entries
+
+
+async def test_one_fetch_per_gym_is_shared(hass: HomeAssistant) -> None:
+    """Test a fetch by one entry is pushed to the other and reused."""
+    first, second = await _setup_entries(hass)
+    busy = {**MOCK_API_DATA, "currentCapacity": 77}
+    series = second.runtime_data.busyness.series
+
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            return_value=busy,
+        ) as mock_busyness,
+        patch.object(
+            series, "async_add_sample", wraps=series.async_add_sample
+        ) as add_sample,
+    ):
+        await first.runtime_data.busyness.async_refresh()
+        await hass.async_block_till_done()
+        await second.runtime_data.busyness.async_refresh()
+
+    assert mock_busyness.call_count == 1
+    # The pushed payload handed back by the hub is only recorded once.
+    assert add_sample.call_count == 1
+    assert second.runtime_data.busyness.data["currentCapacity"] == 77
+    assert first.runtime_data.busyness.hub.gym_info(
+        first.runtime_data.busyness.gym_id
+    ) == {"members": 2, "upstream_fetches": 3, "fetches_avoided": 1}
+
+    # Unloading one entry leaves the other subscribed on its own.
+    await hass.config_entries.async_unload(second.entry_id)
+    assert first.runtime_data.busyness.hub.gym_info(
+        first.runtime_data.busyness.gym_id
+    )["members"] == 1
+
+
+async def test_fetch_fails_over_to_another_account(hass: HomeAssistant) -> None:
+    """Test a rejected session is covered by the other member's account."""
+    first, second = await _setup_entries(hass)
+    broken_client = first.runtime_data.busyness.api_client
+
+    async def _get_busyness(client: TheGymGroupApiClient) -> dict[str, Any]:
+        if client is broken_client:
+            raise InvalidAuth("session rejected")
+        return {**MOCK_API_DATA, "currentCapacity": 12}
+
+    with patch.object(
+        TheGymGroupApiClient,
+        "async_get_busyness",
+        autospec=True,
+        side_effect=_get_busyness,
+    ):
+        await first.runtime_data.busyness.async_refresh()
+        await hass.async_block_till_done()
+
+    assert first.runtime_data.busyness.last_update_success
+    assert first.runtime_data.busyness.data["currentCapacity"] == 12
+    assert second.runtime_data.busyness.data["currentCapacity"] == 12
@@ -1,15 +1,32 @@
 """Test The Gym Group setup process."""
 
+import asyncio
+from datetime import timedelta
+from typing import Any
 from unittest.mock import patch
 
-from custom_components.the_gym_group.api import InvalidAuth
+from custom_components.the_gym_group.api import CannotConnect, InvalidAuth
 from custom_components.the_gym_group.const import DOMAIN
+from custom_components.the_gym_group.metrics import (
+    ENDPOINT_BUSYNESS,
+    ENDPOINT_HISTORY,
+    ENDPOINT_SCHEDULE,
+)
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 
-from .const import MOCK_CONFIG
+from .const import (
+    MOCK_API_DATA,
+    MOCK_CHECKIN_HISTORY_DATA,
+    MOCK_CONFIG,
+    MOCK_GYM_ID,
+    MOCK_SCHEDULE_DATA,
+    MOCK_USER_ID,
+)
 
 
 async def test_setup_unload_and_reload_entry(
@@ -21,7 +38,8 @@ async def test_setup_unload_and_reload_entry(
     assert entry.state is ConfigEntryState.LOADED
     assert entry.runtime_data
     assert entry.runtime_data.busyness
-    assert entry.runtime_data.activity
+    assert entry.runtime_data.history
+    assert entry.runtime_data.schedule
 
     # Unload - runtime_data should be cleared by the config entry machinery.
     assert await hass.config_entries.async_unload(entry.entry_id)
@@ -59,3 +77,174 @@ async def test_setup_auth_error(hass: HomeAssistant) -> None:
         await hass.async_block_till_done()
 
     assert entry.state is ConfigEntryState.SETUP_ERROR
+
+
+async def test_setup_restores_stored_session(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the stored user ID and cookies are adopted before the first fetch."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, version=2)
+    entry.add_to_hass(hass)
+    stored_session = {"user_id": MOCK_USER_ID, "cookies": {"JSESSIONID": "abc123"}}
+    hass_storage[f"{DOMAIN}.{entry.entry_id}.session"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}.session",
+        "data": stored_session,
+    }
+
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_login",
+        ) as mock_login,
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient._do_get",
+            side_effect=lambda url, endpoint, description="data": {
+                ENDPOINT_BUSYNESS: MOCK_API_DATA,
+                ENDPOINT_HISTORY: MOCK_CHECKIN_HISTORY_DATA,
+                ENDPOINT_SCHEDULE: MOCK_SCHEDULE_DATA,
+            }[endpoint],
+        ),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    mock_login.assert_not_called()
+    assert entry.runtime_data.busyness.api_client.export_session() == stored_session
+
+
+def _store_snapshots(
+    hass_storage: dict[str, Any], entry: MockConfigEntry, fetched_at: str
+) -> None:
+    """Write the entry's snapshots and check-in archive to storage."""
+    for name, payload in (
+        ("busyness", {**MOCK_API_DATA, "currentCapacity": 12}),
+        ("schedule", MOCK_SCHEDULE_DATA),
+    ):
+        key = f"{DOMAIN}.{entry.entry_id}.{name}_snapshot"
+        hass_storage[key] = {
+            "version": 1,
+            "key": key,
+            "data": {"fetched_at": fetched_at, "payload": payload},
+        }
+    key = f"{DOMAIN}.{entry.entry_id}.checkins"
+    hass_storage[key] = {
+        "version": 1,
+        "key": key,
+        "data": {"check_ins": MOCK_CHECKIN_HISTORY_DATA["checkIns"]},
+    }
+
+
+async def test_setup_serves_snapshot_while_refreshing(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test setup completes from the snapshots and refreshes in the background."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, version=2)
+    entry.add_to_hass(hass)
+    _store_snapshots(
+        hass_storage, entry, (dt_util.utcnow() - timedelta(hours=1)).isoformat()
+    )
+
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            side_effect=CannotConnect,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            side_effect=CannotConnect,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            side_effect=CannotConnect,
+        ),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The API is down, but the entry still loads with the last good data.
+    assert entry.state is ConfigEntryState.LOADED
+    busyness = entry.runtime_data.busyness
+    assert busyness.data["currentCapacity"] == 12
+    assert busyness.snapshot.restored
+    assert not busyness.last_update_success
+    assert entry.runtime_data.schedule.data["next_class"]["instructor"] == "Jane Smith"
+    assert entry.runtime_data.history.data["latest_checkin"] is not None
+
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+        return_value=MOCK_API_DATA,
+    ):
+        await busyness.async_refresh()
+
+    assert busyness.data["currentCapacity"] == 50
+    assert not busyness.snapshot.restored
+
+
+async def test_restored_snapshot_is_marked_stale(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test restored data carries the snapshot's age until a refresh succeeds."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, version=2)
+    entry.add_to_hass(hass)
+    fetched_at = dt_util.utcnow() - timedelta(hours=1)
+    _store_snapshots(hass_storage, entry, fetched_at.isoformat())
+    release = asyncio.Event()
+
+    async def _get_busyness(*args: Any) -> dict[str, Any]:
+        await release.wait()
+        return MOCK_API_DATA
+
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            side_effect=_get_busyness,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            return_value=MOCK_CHECKIN_HISTORY_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=MOCK_SCHEDULE_DATA,
+        ),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        busyness = entry.runtime_data.busyness
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{MOCK_GYM_ID}_busyness"
+        )
+        state = hass.states.get(entity_id)
+        assert state.state == "12"
+        assert state.attributes["stale_since"] == fetched_at
+        assert busyness.stale_since == fetched_at
+
+        release.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get(entity_id)
+    assert state.state == str(MOCK_API_DATA["currentCapacity"])
+    assert "stale_since" not in state.attributes
+    assert entry.runtime_data.schedule.stale_since is None
+
+
+async def test_setup_ignores_stale_snapshot(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test a snapshot older than the max age doesn't bypass the first refresh."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, version=2)
+    entry.add_to_hass(hass)
+    _store_snapshots(
+        hass_storage, entry, (dt_util.utcnow() - timedelta(days=30)).isoformat()
+    )
+
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+        side_effect=CannotConnect,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
@@ -0,0 +1,103 @@
+"""Test the API client's per-endpoint request metrics."""
+
+from contextlib import asynccontextmanager
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+from custom_components.the_gym_group.api import TheGymGroupApiClient
+from custom_components.the_gym_group.metrics import (
+    ENDPOINT_BUSYNESS,
+    TheGymGroupRequestMetrics,
+)
+import pytest
+
+from .const import MOCK_API_DATA, MOCK_USER_ID
+
+
+class _FakeResponse:
+    """Just enough of an aiohttp response for the client."""
+
+    def __init__(self, status: int, body: bytes = b"") -> None:
+        self.status = status
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+def _fake_session(*responses: _FakeResponse) -> MagicMock:
+    """Return a session whose GETs return the given responses in turn."""
+    queue = list(responses)
+
+    @asynccontextmanager
+    async def _get(*args: Any, **kwargs: Any):
+        yield queue.pop(0)
+
+    session = MagicMock()
+    session.get.side_effect = _get
+    return session
+
+
+def test_latency_percentiles_interpolate_within_buckets() -> None:
+    """Test percentiles are estimated from the latency histogram."""
+    metrics = TheGymGroupRequestMetrics()
+    assert metrics.latency_quantile(ENDPOINT_BUSYNESS, 0.5) is None
+
+    for latency in (0.120, 0.130, 0.140, 0.150, 2.0):
+        metrics.record_response(ENDPOINT_BUSYNESS, 200, latency)
+
+    # Four of the five responses fall in the 100-250 ms bucket.
+    assert metrics.latency_quantile(ENDPOINT_BUSYNESS, 0.5) == pytest.approx(193.75)
+    assert metrics.latency_quantile(ENDPOINT_BUSYNESS, 0.95) == pytest.approx(2125)
+    assert metrics.response_count(ENDPOINT_BUSYNESS) == 5
+
+
+async def test_client_records_outcomes_and_relogins() -> None:
+    """Test statuses, sizes, decode times and re-logins are recorded."""
+    body = json.dumps(MOCK_API_DATA).encode()
+    client = TheGymGroupApiClient(
+        "test@email.com",
+        "test_password",
+        _fake_session(_FakeResponse(401), _FakeResponse(200, body)),
+        user_id=MOCK_USER_ID,
+    )
+    client._async_login_and_export = AsyncMock(  # type: ignore[method-assign]
+        return_value={"user_id": MOCK_USER_ID}
+    )
+
+    assert await client.async_get_busyness() == MOCK_API_DATA
+
+    busyness = client.metrics.as_dict()["endpoints"][ENDPOINT_BUSYNESS]
+    assert busyness["statuses"] == {"200": 1, "401": 1}
+    assert (busyness["relogins"], busyness["retries"]) == (1, 1)
+    assert busyness["latency_ms"]["count"] == 2
+    assert busyness["decode_ms"]["count"] == 1
+    assert busyness["response_bytes"]["count"] == 1
+    assert busyness["response_bytes"]["mean"] == len(body)
+
+
+async def test_trace_hooks_time_connection_phases(socket_enabled: None) -> None:
+    """Test DNS and connection setup are attributed to the tagged endpoint."""
+
+    async def _handler(request: web.Request) -> web.Response:
+        return web.json_response(MOCK_API_DATA)
+
+    app = web.Application()
+    app.router.add_get("/", _handler)
+    metrics = TheGymGroupRequestMetrics()
+    async with (
+        TestServer(app, host="127.0.0.1") as server,
+        ClientSession(trace_configs=[metrics.trace_config]) as session,
+        session.get(
+            f"http://localhost:{server.port}/",
+            trace_request_ctx=metrics.trace_context(ENDPOINT_BUSYNESS),
+        ) as response,
+    ):
+        assert response.status == 200
+
+    busyness = metrics.as_dict()["endpoints"][ENDPOINT_BUSYNESS]
+    assert busyness["dns_ms"]["count"] == 1
+    assert busyness["connect_ms"]["count"] == 1
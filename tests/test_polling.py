@@ -0,0 +1,143 @@
+"""Test the adaptive poll schedulers."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.the_gym_group.const import (
+    BUSYNESS_MAX_INTERVAL,
+    BUSYNESS_MIN_INTERVAL,
+    BUSYNESS_STABLE_INTERVAL,
+    HISTORY_SCAN_INTERVAL,
+    HISTORY_VISIT_INTERVAL,
+    SCAN_INTERVAL,
+    VISIT_WATCH_PERIOD,
+)
+from custom_components.the_gym_group.polling import (
+    REASON_ARRIVAL_LIKELY,
+    REASON_CHANGING,
+    REASON_CLOSED,
+    REASON_DEFAULT,
+    REASON_OPENING_SOON,
+    REASON_STABLE,
+    REASON_VISIT_IN_PROGRESS,
+    AdaptivePollScheduler,
+    VisitPollScheduler,
+)
+from homeassistant.util import dt as dt_util
+
+START = datetime(2025, 6, 9, 12, 0, tzinfo=timezone.utc)
+
+
+def _sample(capacity: int, status: str = "open") -> dict[str, object]:
+    """Return a minimal busyness payload."""
+    return {"currentCapacity": capacity, "status": status}
+
+
+def test_stable_occupancy_backs_off() -> None:
+    """Test flat occupancy moves to the stable interval."""
+    scheduler = AdaptivePollScheduler()
+    now = START
+    assert scheduler.update(_sample(40), now) == SCAN_INTERVAL
+
+    for _ in range(3):
+        now += scheduler.interval
+        scheduler.update(_sample(41), now)
+
+    assert scheduler.interval == BUSYNESS_STABLE_INTERVAL
+    assert scheduler.reason == REASON_STABLE
+
+
+def test_fast_change_speeds_up() -> None:
+    """Test a rapid occupancy change switches to the minimum interval."""
+    scheduler = AdaptivePollScheduler()
+    scheduler.update(_sample(40), START)
+
+    interval = scheduler.update(_sample(55), START + timedelta(minutes=5))
+
+    assert interval == BUSYNESS_MIN_INTERVAL
+    assert scheduler.reason == REASON_CHANGING
+
+    scheduler.update(_sample(56), START + timedelta(minutes=7))
+    assert scheduler.reason == REASON_DEFAULT
+
+
+def test_closed_backs_off_until_learned_opening() -> None:
+    """Test closed polls are long but resume quickly around opening time."""
+    scheduler = AdaptivePollScheduler()
+    assert scheduler.update(_sample(0, "closed"), START) == BUSYNESS_MAX_INTERVAL
+    assert scheduler.reason == REASON_CLOSED
+
+    # Learn today's opening time from the closed -> open transition.
+    opened = START + timedelta(minutes=30)
+    scheduler.update(_sample(3), opened)
+
+    # A week later, while still closed, polls stop just short of the
+    # pre-opening window and then run at the minimum interval.
+    next_week = opened + timedelta(days=7)
+    interval = scheduler.update(_sample(0, "closed"), next_week - timedelta(minutes=40))
+    assert interval == timedelta(minutes=10)
+    assert scheduler.reason == REASON_CLOSED
+
+    interval = scheduler.update(_sample(0, "closed"), next_week - timedelta(minutes=20))
+    assert interval == BUSYNESS_MIN_INTERVAL
+    assert scheduler.reason == REASON_OPENING_SOON
+
+    interval = scheduler.update(_sample(0, "closed"), next_week + timedelta(hours=2))
+    assert interval == BUSYNESS_MAX_INTERVAL
+    assert scheduler.reason == REASON_CLOSED
+
+
+def _history(latest: datetime | None, duration: int | None) -> dict[str, object]:
+    """Return the history data fields the visit scheduler reads."""
+    return {"latest_checkin": latest, "latest_checkin_duration_minutes": duration}
+
+
+def test_open_visit_polls_fast_until_finished() -> None:
+    """Test an open check-in speeds up polls over today's window only."""
+    scheduler = VisitPollScheduler()
+    assert scheduler.update(_history(None, None), START) == HISTORY_SCAN_INTERVAL
+    assert scheduler.history_start(START) is None
+
+    checked_in = START - timedelta(minutes=10)
+    assert scheduler.update(_history(checked_in, None), START) == (
+        HISTORY_VISIT_INTERVAL
+    )
+    assert scheduler.reason == REASON_VISIT_IN_PROGRESS
+    assert scheduler.history_start(START) == dt_util.start_of_local_day(
+        dt_util.as_local(START)
+    )
+
+    later = START + timedelta(hours=1)
+    assert scheduler.update(_history(checked_in, 70), later) == HISTORY_SCAN_INTERVAL
+    assert scheduler.reason == REASON_DEFAULT
+
+    # A visit that was never given a duration stops being tracked eventually.
+    assert scheduler.update(_history(checked_in, None), START + timedelta(hours=5)) == (
+        HISTORY_SCAN_INTERVAL
+    )
+
+
+def test_rising_occupancy_at_usual_time_watches_for_arrival() -> None:
+    """Test occupancy rising in a usual slot watches for a check-in."""
+    scheduler = VisitPollScheduler()
+    # Three Monday visits around noon, one on a Tuesday.
+    scheduler.learn(
+        (START - timedelta(weeks=weeks, minutes=minutes)).timestamp()
+        for weeks, minutes in ((1, -5), (2, -20), (3, -40), (1, -1500))
+    )
+
+    assert not scheduler.busyness_sample(40, START)
+    assert not scheduler.busyness_sample(38, START + timedelta(minutes=5))
+    assert scheduler.busyness_sample(41, START + timedelta(minutes=10))
+    # Already watching: a further rise doesn't trigger another refresh.
+    assert not scheduler.busyness_sample(45, START + timedelta(minutes=15))
+
+    assert scheduler.update(_history(None, None), START + timedelta(minutes=16)) == (
+        HISTORY_VISIT_INTERVAL
+    )
+    assert scheduler.reason == REASON_ARRIVAL_LIKELY
+
+    expired = START + timedelta(minutes=15) + VISIT_WATCH_PERIOD
+    assert scheduler.update(_history(None, None), expired) == HISTORY_SCAN_INTERVAL
+
+    # Outside the usual slots a rise is ignored.
+    assert not scheduler.busyness_sample(60, START + timedelta(hours=3))
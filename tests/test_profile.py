@@ -0,0 +1,125 @@
+"""Test the occupancy profile and forecast sensors."""
+
+from datetime import datetime, timedelta, timezone
+import logging
+
+from custom_components.the_gym_group import profile as profile_module
+from custom_components.the_gym_group.const import DOMAIN
+from custom_components.the_gym_group.profile import TheGymGroupOccupancyProfile
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import MOCK_API_DATA, MOCK_GYM_ID
+
+# A Thursday, in UTC (and in London, which is the configured time zone).
+NOW = datetime(2025, 1, 9, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+async def _time_zone(hass: HomeAssistant) -> None:
+    """Use a time zone whose offset from UTC is zero in January."""
+    await hass.config.async_set_time_zone("Europe/London")
+
+
+def _ms(when: datetime) -> int:
+    """Return a time in epoch milliseconds, as the API sends it."""
+    return int(when.timestamp() * 1000)
+
+
+def _payload(capacity: int, status: str = "open", **extra: object) -> dict:
+    """Return a busyness payload for the mock gym."""
+    return {**MOCK_API_DATA, "currentCapacity": capacity, "status": status, **extra}
+
+
+async def test_recent_weeks_count_more(hass: HomeAssistant) -> None:
+    """Test a slot's average decays towards newer samples."""
+    profile = TheGymGroupOccupancyProfile(hass, "entry")
+    profile.async_update(_payload(10), NOW - timedelta(weeks=1))
+    profile.async_update(_payload(30), NOW)
+
+    # Weight of last week's sample: 0.5 ** (1 week / 4 week half-life).
+    old_weight = 0.5**0.25
+    assert profile.expected(NOW) == pytest.approx(
+        (10 * old_weight + 30) / (old_weight + 1)
+    )
+    assert profile.expected(NOW + timedelta(minutes=15)) is None
+
+
+async def test_closed_samples_and_gym_change(hass: HomeAssistant) -> None:
+    """Test closed samples are skipped and a new gym starts a new profile."""
+    profile = TheGymGroupOccupancyProfile(hass, "entry")
+    profile.async_update(_payload(0, "closed"), NOW)
+    assert profile.expected(NOW) is None
+
+    profile.async_update(_payload(12), NOW)
+    profile.async_update({**_payload(40), "gymLocationId": "other"}, NOW)
+    assert profile.expected(NOW) == 40
+
+
+async def test_seeded_from_historical(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a new profile is seeded once from the payload's history."""
+    monkeypatch.setattr(profile_module, "_logged_unparseable", False)
+    profile = TheGymGroupOccupancyProfile(hass, "entry")
+    hour_ago = NOW - timedelta(hours=1)
+    historical = [
+        {"timestamp": _ms(hour_ago), "currentCapacity": 22},
+        {"timestamp": _ms(NOW - timedelta(minutes=30)), "currentCapacity": 8},
+        {"dateTime": hour_ago.isoformat(), "currentCapacity": 90},
+        {"timestamp": hour_ago.isoformat(), "currentCapacity": 90},
+    ]
+    with caplog.at_level(logging.DEBUG, "custom_components.the_gym_group.profile"):
+        profile.async_update(_payload(5, historical=historical), NOW)
+    later_historical = [{"timestamp": _ms(hour_ago), "currentCapacity": 90}]
+    profile.async_update(_payload(5, historical=later_historical), NOW)
+
+    forecast = profile.forecast(NOW - timedelta(hours=2), timedelta(hours=2))
+    assert [(start - NOW, value) for start, value in forecast] == [
+        (timedelta(hours=-1), 22),
+        (timedelta(minutes=-30), 8),
+        (timedelta(0), 5),
+    ]
+    # Only the first unparseable entry is logged.
+    assert caplog.text.count("Skipping unparseable historical entry") == 1
+    assert "dateTime" in caplog.text
+
+
+async def test_forecast_sensors(
+    hass: HomeAssistant,
+    loaded_entry: MockConfigEntry,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the forecast sensors read the next hours from the profile."""
+    coordinator = loaded_entry.runtime_data.busyness
+    for hours, capacity in ((1, 30), (2, 12), (3, 20)):
+        coordinator.profile.add(NOW + timedelta(hours=hours), capacity)
+    freezer.move_to(NOW)
+    coordinator.async_update_listeners()
+
+    forecast_state = hass.states.get(
+        entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{MOCK_GYM_ID}_busyness_forecast"
+        )
+    )
+    assert forecast_state.state == "30.0"
+    assert forecast_state.attributes["forecast"] == [
+        {"start": "2025-01-09T13:00:00+00:00", "population": 30.0},
+        {"start": "2025-01-09T14:00:00+00:00", "population": 12.0},
+        {"start": "2025-01-09T15:00:00+00:00", "population": 20.0},
+    ]
+
+    quietest_state = hass.states.get(
+        entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{MOCK_GYM_ID}_quietest_time"
+        )
+    )
+    assert quietest_state.state == "2025-01-09T14:00:00+00:00"
+    assert quietest_state.attributes["expected_population"] == 12.0
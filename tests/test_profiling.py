@@ -0,0 +1,126 @@
+"""Test on-demand profiling of coordinator updates."""
+
+import cProfile
+from pathlib import Path
+from unittest.mock import patch
+
+from custom_components.the_gym_group.const import DOMAIN
+from custom_components.the_gym_group.services import SERVICE_START_PROFILING
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+
+from .const import MOCK_API_DATA
+
+
+@pytest.fixture(autouse=True)
+def _config_dir(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Write the profiles to a temporary config directory."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / ".storage").mkdir()
+
+
+async def test_capture_covers_requested_updates(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Test a capture profiles N updates and the state writes in between."""
+    profiler = loaded_entry.runtime_data.busyness.profiler
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_PROFILING, {"updates": 2}, blocking=True
+    )
+    assert profiler.as_dict()["remaining_updates"] == 2
+
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+            return_value=MOCK_API_DATA,
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=[],
+        ),
+    ):
+        await loaded_entry.runtime_data.schedule.async_refresh()
+        await loaded_entry.runtime_data.busyness.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    summary = profiler.as_dict()
+    assert not summary["active"]
+    capture = summary["last_capture"]
+    assert capture["timings"]["update"]["count"] == 2
+    # The class was cancelled, so the calendar and next class sensor write
+    # their state after the first update completes, still inside the capture.
+    assert capture["timings"]["state_write"]["count"] >= 1
+    timings = capture["timings"]["update"]
+    assert timings["outside_awaits_ms"] <= timings["wall_ms"]
+    assert set(capture["top_functions"][0]) == {
+        "function",
+        "calls",
+        "own_ms",
+        "cumulative_ms",
+    }
+    assert Path(capture["file"]).parent == tmp_path / f"{DOMAIN}_profiles"
+    assert Path(capture["file"]).is_file()
+
+
+async def test_update_count_is_bounded(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Test a capture must cover at least one update."""
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_PROFILING, {"updates": 0}, blocking=True
+        )
+    assert not loaded_entry.runtime_data.busyness.profiler.active
+
+
+async def test_capture_with_another_profiler_active(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Test updates and state writes still run while cProfile is taken."""
+    profiler = loaded_entry.runtime_data.busyness.profiler
+    schedule = loaded_entry.runtime_data.schedule
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_PROFILING, {"updates": 2}, blocking=True
+    )
+
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        with (
+            patch(
+                "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_busyness",
+                return_value=MOCK_API_DATA,
+            ),
+            patch(
+                "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+                return_value=[],
+            ),
+        ):
+            await schedule.async_refresh()
+            await loaded_entry.runtime_data.busyness.async_refresh()
+    finally:
+        other.disable()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert schedule.last_update_success
+    assert schedule.data["next_class"] is None
+    capture = profiler.as_dict()["last_capture"]
+    assert capture["timings"]["update"]["count"] == 2
+    # The cancelled class still reaches the calendar and next class sensor.
+    assert capture["timings"]["state_write"]["count"] >= 1
+    assert capture["top_functions"] == []
+
+    # The failure doesn't stop later captures from profiling.
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_PROFILING, {"updates": 1}, blocking=True
+    )
+    with patch(
+        "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+        return_value=[],
+    ):
+        await schedule.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert profiler.as_dict()["last_capture"]["top_functions"]
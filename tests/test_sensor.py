@@ -1,9 +1,11 @@
 """Test The Gym Group sensors."""
 
 from custom_components.the_gym_group.const import DOMAIN
+import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import entity_registry as er
 
 from .const import MOCK_API_DATA, MOCK_GYM_ID
@@ -38,3 +40,46 @@ async def test_sensor_entities(
     status_state = hass.states.get(status_entry)
     assert status_state is not None
     assert status_state.state == MOCK_API_DATA["status"]
+
+
+async def test_heavy_attributes_are_not_recorded(
+    hass: HomeAssistant,
+    loaded_entry: MockConfigEntry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test list attributes stay on the state but are excluded from the recorder."""
+    for suffix, attribute in (
+        ("busyness", "historical"),
+        ("busyness_forecast", "forecast"),
+        ("last_checkin", "checkin_history"),
+    ):
+        entity_id = entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{MOCK_GYM_ID}_{suffix}"
+        )
+        entity = hass.data["entity_components"]["sensor"].get_entity(entity_id)
+        assert attribute in entity._unrecorded_attributes
+
+
+async def test_get_checkin_history_service(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Test the action returns archived visits for a range from memory."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_checkin_history",
+        {"start": "2025-04-02T00:00:00+00:00", "end": "2025-05-01T00:00:00+00:00"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {
+        "checkins": [{"datetime": "2025-04-03T08:00:00", "duration_minutes": 90}]
+    }
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "get_checkin_history",
+            {"start": "2025-04-02T00:00:00+00:00", "end": "2025-04-01T00:00:00+00:00"},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,124 @@
+"""Test The Gym Group long-term statistics."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from custom_components.the_gym_group.const import DOMAIN
+from custom_components.the_gym_group.statistics import TheGymGroupOccupancyStatistics
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    MOCK_API_DATA,
+    MOCK_GYM_ID,
+    MOCK_HISTORICAL_DATA,
+    MOCK_SCHEDULE_DATA,
+)
+
+NOW = datetime(2025, 4, 5, 12, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def mock_recorder_before_hass(async_test_recorder: None) -> None:
+    """Set up the recorder's test database before the hass fixture."""
+
+
+@pytest.fixture(autouse=True)
+async def _setup(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Run with the recorder, in London, shortly after the mock check-ins."""
+    await hass.config.async_set_time_zone("Europe/London")
+    freezer.move_to(NOW)
+
+
+async def _statistics(
+    hass: HomeAssistant, statistic_id: str, types: set[str]
+) -> list[dict]:
+    """Return the hourly rows of a statistic since the start of April."""
+    await async_wait_recording_done(hass)
+    rows = await hass.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        datetime(2025, 3, 31, tzinfo=timezone.utc),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        types,
+    )
+    return rows.get(statistic_id, [])
+
+
+async def test_daily_visit_statistics(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Test one row per day since the first visit, with cumulative sums."""
+    history_statistics = loaded_entry.runtime_data.history.statistics
+
+    visits = await _statistics(hass, history_statistics.visits_id, {"state", "sum"})
+    assert [(row["state"], row["sum"]) for row in visits] == [
+        (1, 1),
+        (0, 1),
+        (1, 2),
+        (0, 2),
+        (0, 2),
+    ]
+    # Local midnight during British Summer Time.
+    assert visits[0]["start"] == datetime(2025, 3, 31, 23, tzinfo=timezone.utc).timestamp()
+
+    duration = await _statistics(
+        hass, history_statistics.duration_id, {"state", "sum"}
+    )
+    assert [row["sum"] for row in duration] == [1.0, 1.0, 2.5, 2.5, 2.5]
+
+    # A new visit only recomputes the last few days, continuing the sums.
+    new_checkin = {
+        "checkInDate": "2025-04-05T09:00:00",
+        "timezone": "Europe/London",
+        "gymLocationName": "Test Gym",
+        "duration": 1_800_000,
+    }
+    with (
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_checkin_history",
+            return_value={"checkIns": [new_checkin]},
+        ),
+        patch(
+            "custom_components.the_gym_group.api.TheGymGroupApiClient.async_get_schedule",
+            return_value=MOCK_SCHEDULE_DATA,
+        ),
+    ):
+        await loaded_entry.runtime_data.history.async_refresh()
+
+    visits = await _statistics(hass, history_statistics.visits_id, {"sum"})
+    assert [row["sum"] for row in visits] == [1, 1, 2, 2, 3]
+
+
+async def test_occupancy_statistics_backfill(hass: HomeAssistant) -> None:
+    """Test historical samples are backfilled and live hours imported."""
+    statistics = TheGymGroupOccupancyStatistics(hass)
+    await statistics.async_add_sample(
+        {**MOCK_API_DATA, "currentCapacity": 40, "historical": MOCK_HISTORICAL_DATA},
+        NOW,
+    )
+    await statistics.async_add_sample(
+        {**MOCK_API_DATA, "currentCapacity": 8}, NOW + timedelta(hours=1)
+    )
+
+    assert statistics.statistic_id == f"{DOMAIN}:{MOCK_GYM_ID.replace('-', '_')}_occupancy"
+    rows = await _statistics(hass, statistics.statistic_id, {"mean", "min", "max"})
+    assert [(row["mean"], row["min"], row["max"]) for row in rows] == [
+        (15, 10, 20),
+        (5, 5, 5),
+        # The hour of the first live sample also holds its historical sample.
+        (35, 30, 40),
+    ]
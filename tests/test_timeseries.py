@@ -0,0 +1,153 @@
+"""Test the local busyness time series."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from custom_components.the_gym_group.timeseries import TheGymGroupBusynessSeries
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+START = datetime(2025, 4, 10, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _config_dir(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Write the series files to a temporary config directory."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / ".storage").mkdir()
+
+
+async def _fill(
+    series: TheGymGroupBusynessSeries, minutes: int, start: datetime = START
+) -> None:
+    """Add one sample a minute from start; capacity is the minute number."""
+    for minute in range(minutes):
+        await series.async_add_sample(
+            start + timedelta(minutes=minute), minute, None if minute % 2 else 50.0
+        )
+
+
+async def test_samples_roll_up_and_reload(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test samples are bucketed, rolled up, persisted and reloaded."""
+    freezer.move_to(START + timedelta(hours=2))
+    series = TheGymGroupBusynessSeries(hass, "entry")
+    await series.async_load()
+    await _fill(series, 70)
+
+    resolution, points = series.query(START, START + timedelta(minutes=10))
+    assert resolution == "5min"
+    assert points == [
+        {
+            "start": "2025-04-10T09:00:00+00:00",
+            "samples": 5,
+            "capacity_mean": 2.0,
+            "capacity_max": 4,
+            "percentage_mean": 50.0,
+        },
+        {
+            "start": "2025-04-10T09:05:00+00:00",
+            "samples": 5,
+            "capacity_mean": 7.0,
+            "capacity_max": 9,
+            "percentage_mean": 50.0,
+        },
+    ]
+
+    _, hourly = series.query(START, START + timedelta(hours=2), "hourly")
+    assert [(p["samples"], p["capacity_mean"], p["capacity_max"]) for p in hourly] == [
+        (60, 29.5, 59),
+        # The open hour holds the 5-minute bucket closed at 10:05.
+        (5, 62.0, 64),
+    ]
+
+    reloaded = TheGymGroupBusynessSeries(hass, "entry")
+    await reloaded.async_load()
+    # Only the 5-minute bucket in progress (10:05-10:10) is lost.
+    assert reloaded.query(START, START + timedelta(hours=2), "hourly")[1] == hourly
+    _, fine = reloaded.query(START, START + timedelta(hours=2))
+    assert len(fine) == 13
+
+
+async def test_daily_buckets_follow_local_days(hass: HomeAssistant) -> None:
+    """Test daily buckets start at local midnight, even across a DST change."""
+    series = TheGymGroupBusynessSeries(hass, "entry")
+    await series.async_load()
+    await _fill(series, 70)
+
+    # 09:00 UTC is 02:00 in the test time zone (US/Pacific, UTC-7 in April).
+    _, daily = series.query(START, START + timedelta(hours=2), "daily")
+    assert [p["start"] for p in daily] == ["2025-04-10T07:00:00+00:00"]
+
+    # Clocks went forward on 2025-03-09, so that day lasted 23 hours.
+    tier = TheGymGroupBusynessSeries(hass, "other").tiers[-1]
+    dst_day = datetime(2025, 3, 9, 12, 0, tzinfo=timezone.utc)
+    tier.add(int(dst_day.timestamp()), 1, 10.0, 10, 50.0)
+    tier.add(int((dst_day + timedelta(days=1)).timestamp()), 1, 20.0, 20, 50.0)
+    points = tier.query(
+        int(dst_day.timestamp()), int((dst_day + timedelta(days=2)).timestamp())
+    )
+    assert [p["start"] for p in points] == [
+        "2025-03-09T08:00:00+00:00",
+        "2025-03-10T07:00:00+00:00",
+    ]
+    assert tier.covered_until == int(
+        datetime(2025, 3, 11, 7, 0, tzinfo=timezone.utc).timestamp()
+    )
+
+
+async def test_partial_record_is_discarded(hass: HomeAssistant) -> None:
+    """Test a torn append is dropped and the file rewritten on load."""
+    series = TheGymGroupBusynessSeries(hass, "entry")
+    await series.async_load()
+    await _fill(series, 11)
+    path = series.tiers[0].path
+    path.write_bytes(path.read_bytes() + b"\x01\x02")
+
+    reloaded = TheGymGroupBusynessSeries(hass, "entry")
+    await reloaded.async_load()
+
+    assert len(reloaded.tiers[0].starts) == 2
+    assert path.stat().st_size % 22 == 0
+
+
+async def test_get_busyness_history_service(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Test the service returns the stored buckets for a range."""
+    # Setup recorded a sample at the current time, so continue after it.
+    now = dt_util.utcnow()
+    start = now.replace(second=0, microsecond=0) + timedelta(
+        minutes=10 - now.minute % 5
+    )
+    await _fill(loaded_entry.runtime_data.busyness.series, 6, start)
+
+    response = await hass.services.async_call(
+        "the_gym_group",
+        "get_busyness_history",
+        {
+            "start": start.isoformat(),
+            "end": (start + timedelta(hours=1)).isoformat(),
+            "resolution": "5min",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["resolution"] == "5min"
+    assert [p["samples"] for p in response["points"]] == [5, 1]
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            "the_gym_group",
+            "get_busyness_history",
+            {"config_entry_id": "missing", "start": START.isoformat()},
+            blocking=True,
+            return_response=True,
+        )